@@ -111,6 +111,13 @@ export default function KitRunPage() {
                 }]);
             });
 
+            evtSource.addEventListener('step-token', (e) => {
+                const d = JSON.parse(e.data);
+                setSteps((prev) => prev.map((s) =>
+                    s.step === d.step ? { ...s, result: (s.result || '') + d.delta } : s
+                ));
+            });
+
             evtSource.addEventListener('step-complete', (e) => {
                 const d = JSON.parse(e.data);
                 setSteps((prev) => prev.map((s) =>
@@ -855,9 +855,7 @@ def _write_run_files(kit, outputs: dict[str, str], prompts: dict[str, str], run_
     import json
 
     step_meta = []
-    for step_key in sorted(kit.workflow.keys(), key=int):
-        step = kit.workflow[step_key]
-        step_num = int(step_key)
+    for step_num, step in kit.ordered_steps:
         base = f"step_{step_num}_{step.output_id}"
 
         output_file = f"{base}.md"
@@ -1251,6 +1249,7 @@ async def _sync_push(kit_name: str, base_path: str, message: str | None) -> None
         storage = StorageService(use_service_key=True)
         print("Uploading resources...")
 
+        resource_rows = []
         for num, resource in local_kit.resources.items():
             resource_file = kit_path / resource.file
             if resource_file.exists():
@@ -1267,41 +1266,53 @@ async def _sync_push(kit_name: str, base_path: str, message: str | None) -> None
                     file_path=resource_file,
                 )
 
-                # Add to database
-                await version_repo.add_resource(
-                    version_id=version.id,
-                    resource_number=int(num),
-                    filename=resource.file,
-                    storage_path=storage_path,
-                    mime_type=mime_type,
-                    extracted_text=extracted_text,
-                    file_size_bytes=file_size,
+                resource_rows.append(
+                    {
+                        "version_id": version.id,
+                        "resource_number": int(num),
+                        "filename": resource.file,
+                        "storage_path": storage_path,
+                        "mime_type": mime_type,
+                        "extracted_text": extracted_text,
+                        "file_size_bytes": file_size,
+                    }
                 )
                 print(f"  - Uploaded {resource.file}")
 
+        # Add to database in one batched INSERT per table
+        await version_repo.add_resources(resource_rows)
+
         # Add workflow steps
         print("Adding workflow steps...")
+        step_rows = []
         for num, step in local_kit.workflow.items():
-            await version_repo.add_workflow_step(
-                version_id=version.id,
-                step_number=int(num),
-                prompt_template=step.prompt,
+            step_rows.append(
+                {
+                    "version_id": version.id,
+                    "step_number": int(num),
+                    "prompt_template": step.prompt,
+                }
             )
             print(f"  - Added step {num}")
+        await version_repo.add_workflow_steps(step_rows)
 
         # Add tools
         if local_kit.tools:
             print("Adding tools...")
+            tool_rows = []
             for num, tool in local_kit.tools.items():
-                await version_repo.add_tool(
-                    version_id=version.id,
-                    tool_number=int(num),
-                    tool_name=tool.tool_name,
-                    display_name=tool.display_name,
-                    configuration=tool.configuration,
+                tool_rows.append(
+                    {
+                        "version_id": version.id,
+                        "tool_number": int(num),
+                        "tool_name": tool.tool_name,
+                        "display_name": tool.display_name,
+                        "configuration": tool.configuration,
+                    }
                 )
                 display = f" ({tool.display_name})" if tool.display_name else ""
                 print(f"  - Added tool {num}: {tool.tool_name}{display}")
+            await version_repo.add_tools(tool_rows)
 
     print(f"\nSuccessfully pushed '{local_kit.name}' as version {version.version_number}")
 
@@ -1326,6 +1337,16 @@ async def _sync_pull(slug: str, base_path: str) -> None:
 
         version = db_kit.current_version
 
+        # Uploads from the web UI finish after the request, so a file may not
+        # be in storage yet
+        for resource in version.resources:
+            if resource.status == "pending":
+                print(f"Error: {resource.filename} is still uploading, try again shortly")
+                sys.exit(1)
+            if resource.status == "failed":
+                print(f"Error: upload of {resource.filename} failed, re-upload it and try again")
+                sys.exit(1)
+
         # Create local directory
         kit_dir = Path(base_path) / slug
         kit_dir.mkdir(parents=True, exist_ok=True)
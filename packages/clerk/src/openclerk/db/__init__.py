@@ -32,6 +32,7 @@ from .text_extraction import (
     detect_mime_type_from_filename,
     extract_text,
     extract_text_from_bytes,
+    extract_text_from_file,
 )
 
 __all__ = [
@@ -62,4 +63,5 @@ __all__ = [
     "detect_mime_type_from_filename",
     "extract_text",
     "extract_text_from_bytes",
+    "extract_text_from_file",
 ]
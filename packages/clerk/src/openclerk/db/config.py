@@ -1,9 +1,11 @@
 """Supabase database and storage configuration."""
 
+import asyncio
+import logging
 import os
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
-from functools import lru_cache
+from functools import cache, cached_property
 from typing import cast
 
 from sqlalchemy.ext.asyncio import (
@@ -14,9 +16,15 @@ from sqlalchemy.ext.asyncio import (
 )
 from supabase import Client, create_client
 
+logger = logging.getLogger(__name__)
+
 
 class DatabaseConfig:
-    """Database configuration from environment variables."""
+    """Database configuration from environment variables.
+
+    Values are read once when the config is created; ``get_config`` shares a
+    single instance per process.
+    """
 
     def __init__(self) -> None:
         self.supabase_url = os.getenv("SUPABASE_URL")
@@ -24,6 +32,10 @@ class DatabaseConfig:
         self.supabase_service_key = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
         self.database_url = os.getenv("DATABASE_URL")
         self.database_url_direct = os.getenv("DATABASE_URL_DIRECT")
+        # Connection pool sizing for the pooler engine; raise these for
+        # deployments serving more concurrent requests per process
+        self.database_pool_size = int(os.getenv("DATABASE_POOL_SIZE", "20"))
+        self.database_max_overflow = int(os.getenv("DATABASE_MAX_OVERFLOW", "30"))
         self.session_secret_key = os.getenv(
             "CLERK_SESSION_SECRET", "clerk-session-secret-change-in-production"
         )
@@ -44,18 +56,18 @@ class DatabaseConfig:
                 "Get the connection string from Supabase Dashboard > Settings > Database."
             )
 
-    @property
+    @cached_property
     def is_configured(self) -> bool:
         """Check if Supabase is configured."""
         return bool(self.supabase_url and self.supabase_anon_key)
 
-    @property
+    @cached_property
     def is_database_configured(self) -> bool:
         """Check if direct database connection is configured."""
         return bool(self.database_url)
 
 
-@lru_cache
+@cache
 def get_config() -> DatabaseConfig:
     """Get cached database configuration."""
     return DatabaseConfig()
@@ -64,6 +76,10 @@ def get_config() -> DatabaseConfig:
 def get_supabase_client(use_service_key: bool = False) -> Client:
     """Get Supabase client for storage and auth operations.
 
+    The service-role client carries no per-user state, so one instance is shared
+    per process. Anon clients are created per call because auth operations
+    (sign in, sign up) store the resulting user session on the client.
+
     Args:
         use_service_key: If True, use service role key for admin operations.
                          If False, use anon key for public operations.
@@ -71,20 +87,30 @@ def get_supabase_client(use_service_key: bool = False) -> Client:
     Returns:
         Supabase client instance
     """
+    if use_service_key:
+        return _get_service_client()
+
     config = get_config()
     config.validate()
 
-    if use_service_key:
-        if not config.supabase_service_key:
-            raise ValueError("SUPABASE_SERVICE_ROLE_KEY required for admin operations")
-        key = config.supabase_service_key
-    else:
-        key = cast(str, config.supabase_anon_key)
-
     # validate() ensures these are not None
     return create_client(
         cast(str, config.supabase_url),
-        key,
+        cast(str, config.supabase_anon_key),
+    )
+
+
+@cache
+def _get_service_client() -> Client:
+    """Create the shared service-role Supabase client."""
+    config = get_config()
+    config.validate()
+    if not config.supabase_service_key:
+        raise ValueError("SUPABASE_SERVICE_ROLE_KEY required for admin operations")
+
+    return create_client(
+        cast(str, config.supabase_url),
+        config.supabase_service_key,
     )
 
 
@@ -93,6 +119,8 @@ _engine: AsyncEngine | None = None
 _engine_loop = None
 _engine_direct: AsyncEngine | None = None
 _engine_direct_loop = None
+# Session factories keyed by `direct`, rebuilt whenever their engine is replaced
+_session_factories: dict[bool, async_sessionmaker[AsyncSession]] = {}
 
 
 def get_async_engine(direct: bool = False) -> AsyncEngine:
@@ -106,8 +134,6 @@ def get_async_engine(direct: bool = False) -> AsyncEngine:
         Async SQLAlchemy engine
     """
     global _engine, _engine_loop, _engine_direct, _engine_direct_loop
-    import asyncio
-
     try:
         current_loop = asyncio.get_running_loop()
     except RuntimeError:
@@ -139,6 +165,7 @@ def get_async_engine(direct: bool = False) -> AsyncEngine:
                 url,
                 echo=False,
                 pool_recycle=300,
+                pool_pre_ping=True,
                 connect_args=connect_args,
             )
             _engine_direct_loop = current_loop
@@ -152,8 +179,8 @@ def get_async_engine(direct: bool = False) -> AsyncEngine:
                 cast(str, config.database_url),
                 echo=False,
                 pool_recycle=300,
-                pool_size=20,
-                max_overflow=30,
+                pool_size=config.database_pool_size,
+                max_overflow=config.database_max_overflow,
                 pool_pre_ping=True,
                 connect_args=connect_args,
             )
@@ -171,11 +198,15 @@ def get_async_session_factory(direct: bool = False) -> async_sessionmaker[AsyncS
         Async session factory
     """
     engine = get_async_engine(direct=direct)
-    return async_sessionmaker(
-        engine,
-        class_=AsyncSession,
-        expire_on_commit=False,
-    )
+    factory = _session_factories.get(direct)
+    if factory is None or factory.kw.get("bind") is not engine:
+        factory = async_sessionmaker(
+            engine,
+            class_=AsyncSession,
+            expire_on_commit=False,
+        )
+        _session_factories[direct] = factory
+    return factory
 
 
 @asynccontextmanager
@@ -209,18 +240,25 @@ async def get_async_session(
 async def init_engines() -> None:
     """Initialize database engines. Call on application startup.
 
-    This ensures engines are created and connections can be established.
-    Engines are created lazily, so this is mainly for explicit initialization.
+    Creates the pooled engine and opens one connection, so the first request
+    does not pay for the connection handshake. Does nothing when no database
+    is configured; a failed connection is logged and retried by the pool later.
     """
-    # Engines are created lazily by get_async_engine()
-    # This function exists for explicit lifecycle management
-    pass
+    if not get_config().is_database_configured:
+        return
+    try:
+        async with get_async_engine().connect():
+            pass
+    except Exception:
+        logger.warning("Could not open an initial database connection", exc_info=True)
 
 
 async def close_engines() -> None:
     """Close all database engines. Call on application shutdown."""
     global _engine, _engine_direct
 
+    _session_factories.clear()
+
     if _engine is not None:
         await _engine.dispose()
         _engine = None
@@ -0,0 +1,43 @@
+"""Add trigram indexes for kit search.
+
+Revision ID: 009_add_kit_search_indexes
+Revises: 008_add_kit_indexes
+Create Date: 2026-03-21
+"""
+
+from alembic import op
+
+revision = "009_add_kit_search_indexes"
+down_revision = "008_add_kit_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add GIN trigram indexes backing the ILIKE kit search."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+
+    # Kit search matches '%query%' against name and description, which a
+    # b-tree index cannot serve; trigram indexes can.
+    op.create_index(
+        "ix_reasoning_kits_name_trgm",
+        "reasoning_kits",
+        ["name"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_reasoning_kits_description_trgm",
+        "reasoning_kits",
+        ["description"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"description": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    """Remove trigram indexes."""
+    op.drop_index("ix_reasoning_kits_description_trgm", table_name="reasoning_kits")
+    op.drop_index("ix_reasoning_kits_name_trgm", table_name="reasoning_kits")
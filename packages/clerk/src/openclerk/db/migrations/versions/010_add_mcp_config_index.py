@@ -0,0 +1,30 @@
+"""Add covering index for active MCP server lookups.
+
+Revision ID: 010_add_mcp_config_index
+Revises: 009_add_kit_search_indexes
+Create Date: 2026-03-22
+"""
+
+from alembic import op
+
+revision = "010_add_mcp_config_index"
+down_revision = "009_add_kit_search_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add an index covering the active MCP server lookup."""
+    # The tools listing selects server_name by user_id and is_active; with all
+    # three columns in the index Postgres can answer it with an index-only scan.
+    op.create_index(
+        "ix_mcp_server_configs_user_active_name",
+        "mcp_server_configs",
+        ["user_id", "is_active", "server_name"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Remove the active MCP server index."""
+    op.drop_index("ix_mcp_server_configs_user_active_name", table_name="mcp_server_configs")
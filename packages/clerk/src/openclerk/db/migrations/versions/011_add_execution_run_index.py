@@ -0,0 +1,30 @@
+"""Add index for per-user execution history lookups.
+
+Revision ID: 011_add_execution_run_index
+Revises: 010_add_mcp_config_index
+Create Date: 2026-03-23
+"""
+
+from alembic import op
+
+revision = "011_add_execution_run_index"
+down_revision = "010_add_mcp_config_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add an index covering the execution history listing."""
+    # The history page filters runs by user and the kit's versions and pages
+    # through them by start time; the step counts use uq_step_execution.
+    op.create_index(
+        "ix_execution_runs_user_version_started",
+        "execution_runs",
+        ["user_id", "version_id", "started_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Remove the execution history index."""
+    op.drop_index("ix_execution_runs_user_version_started", table_name="execution_runs")
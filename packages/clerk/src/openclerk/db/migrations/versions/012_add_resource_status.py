@@ -0,0 +1,34 @@
+"""Add upload status column to resources table.
+
+Revision ID: 012_add_resource_status
+Revises: 011_add_execution_run_index
+Create Date: 2026-03-24
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "012_add_resource_status"
+down_revision = "011_add_execution_run_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Add status column tracking whether a resource's file is in storage."""
+    # Existing rows were uploaded synchronously, so they are all ready
+    op.add_column(
+        "resources",
+        sa.Column("status", sa.String(20), nullable=False, server_default="ready"),
+    )
+    op.create_check_constraint(
+        "ck_resource_status",
+        "resources",
+        sa.text("status IN ('pending', 'ready', 'failed')"),
+    )
+
+
+def downgrade() -> None:
+    """Remove the resource status column."""
+    op.drop_constraint("ck_resource_status", "resources", type_="check")
+    op.drop_column("resources", "status")
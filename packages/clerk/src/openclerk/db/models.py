@@ -13,6 +13,7 @@ from sqlalchemy import (
     String,
     Text,
     UniqueConstraint,
+    text,
 )
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
@@ -159,7 +160,10 @@ class Resource(Base):
     """
 
     __tablename__ = "resources"
-    __table_args__ = (UniqueConstraint("version_id", "resource_number", name="uq_resource_number"),)
+    __table_args__ = (
+        UniqueConstraint("version_id", "resource_number", name="uq_resource_number"),
+        CheckConstraint("status IN ('pending', 'ready', 'failed')", name="ck_resource_status"),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     version_id: Mapped[uuid.UUID] = mapped_column(
@@ -173,8 +177,14 @@ class Resource(Base):
     storage_path: Mapped[str] = mapped_column(String(512), nullable=False)
     extracted_text: Mapped[str | None] = mapped_column(Text)
     file_size_bytes: Mapped[int | None] = mapped_column(Integer)
-    is_dynamic: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    is_dynamic: Mapped[bool] = mapped_column(
+        Boolean, default=False, server_default=text("false"), nullable=False
+    )
     display_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    # Whether the file has reached storage: uploads finish after the response
+    status: Mapped[str] = mapped_column(
+        String(20), nullable=False, default="ready", server_default="ready"
+    )
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
 
     # Relationships
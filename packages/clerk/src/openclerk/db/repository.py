@@ -5,11 +5,12 @@ the repository pattern for clean separation of concerns.
 """
 
 from datetime import datetime
-from uuid import UUID
+from typing import Any
+from uuid import UUID, uuid4
 
-from sqlalchemy import func, select
+from sqlalchemy import Insert, Row, case, exists, func, insert, literal, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import contains_eager, raiseload, selectinload
 
 from .models import (
     ExecutionRun,
@@ -132,20 +133,51 @@ class ReasoningKitRepository:
             slug: The kit's unique slug
 
         Returns:
-            Reasoning kit with current version, resources, and steps loaded
+            Reasoning kit with current version, resources, steps, and tools
+            loaded. The owner, the version history, and the current version's
+            author and execution runs are not loaded and raise on access.
         """
+        # The models default every relationship to selectin, which would also
+        # pull in the owner's other kits and every version with its runs.
         stmt = (
             select(ReasoningKit)
             .where(ReasoningKit.slug == slug)
             .options(
-                selectinload(ReasoningKit.current_version).selectinload(KitVersion.resources),
-                selectinload(ReasoningKit.current_version).selectinload(KitVersion.workflow_steps),
-                selectinload(ReasoningKit.current_version).selectinload(KitVersion.tools),
+                selectinload(ReasoningKit.current_version).options(
+                    selectinload(KitVersion.resources),
+                    selectinload(KitVersion.workflow_steps),
+                    selectinload(KitVersion.tools),
+                    raiseload(KitVersion.created_by_user),
+                    raiseload(KitVersion.execution_runs),
+                ),
+                raiseload(ReasoningKit.owner),
+                raiseload(ReasoningKit.versions),
             )
         )
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def get_ref_by_slug(self, slug: str) -> Row | None:
+        """Get only the identifying columns of a kit by its slug.
+
+        Unlike ``get_by_slug`` this loads no relationships, which makes it
+        suitable for existence and ownership checks.
+
+        Args:
+            slug: The kit's unique slug
+
+        Returns:
+            Row of (id, owner_id, current_version_id, is_public) or None if not found
+        """
+        stmt = select(
+            ReasoningKit.id,
+            ReasoningKit.owner_id,
+            ReasoningKit.current_version_id,
+            ReasoningKit.is_public,
+        ).where(ReasoningKit.slug == slug)
+        result = await self.session.execute(stmt)
+        return result.one_or_none()
+
     async def list_public(self) -> list[ReasoningKit]:
         """List all public reasoning kits.
 
@@ -274,11 +306,7 @@ class ReasoningKitRepository:
         Returns:
             List of matching reasoning kits
         """
-        # Basic search on name and description
-        search_pattern = f"%{query}%"
-        search_condition = ReasoningKit.name.ilike(search_pattern) | ReasoningKit.description.ilike(
-            search_pattern
-        )
+        search_condition = self._search_condition(query)
 
         if not include_private:
             # Only public kits matching search
@@ -310,6 +338,54 @@ class ReasoningKitRepository:
         result = await self.session.execute(stmt)
         return list(result.scalars().all())
 
+    async def list_with_bookmarks(
+        self,
+        user_id: UUID,
+        query: str | None = None,
+        mine: bool = False,
+    ) -> list[Row]:
+        """List kits with whether a user has bookmarked each, in one query.
+
+        Args:
+            user_id: The user whose bookmarks are reported
+            query: If set, only kits whose name or description match, at most 50
+            mine: If True, the user's own and bookmarked kits; otherwise public kits
+
+        Returns:
+            List of (kit, is_bookmarked) rows ordered by name. The kits'
+            relationships are not loaded and raise on access.
+        """
+        is_bookmarked = exists().where(
+            UserKitBookmark.kit_id == ReasoningKit.id,
+            UserKitBookmark.user_id == user_id,
+        )
+        stmt = (
+            select(ReasoningKit, is_bookmarked.label("is_bookmarked"))
+            .options(
+                raiseload(ReasoningKit.owner),
+                raiseload(ReasoningKit.versions),
+                raiseload(ReasoningKit.current_version),
+            )
+            .order_by(ReasoningKit.name)
+        )
+        if mine:
+            stmt = stmt.where((ReasoningKit.owner_id == user_id) | is_bookmarked)
+        else:
+            stmt = stmt.where(ReasoningKit.is_public == True)  # noqa: E712
+        if query:
+            stmt = stmt.where(self._search_condition(query)).limit(50)
+
+        result = await self.session.execute(stmt)
+        return list(result.all())
+
+    @staticmethod
+    def _search_condition(query: str):
+        """Match kits whose name or description contains the query."""
+        search_pattern = f"%{query}%"
+        return ReasoningKit.name.ilike(search_pattern) | ReasoningKit.description.ilike(
+            search_pattern
+        )
+
 
 class KitVersionRepository:
     """Repository for kit version operations."""
@@ -318,13 +394,14 @@ class KitVersionRepository:
         self.session = session
 
     async def get_by_id(self, version_id: UUID) -> KitVersion | None:
-        """Get a version by ID with resources and steps loaded.
+        """Get a version by ID with resources, steps, and tools loaded.
 
         Args:
             version_id: The version's UUID
 
         Returns:
-            Kit version or None if not found
+            Kit version or None if not found. The kit, author, and execution
+            runs are not loaded and raise on access.
         """
         stmt = (
             select(KitVersion)
@@ -332,6 +409,10 @@ class KitVersionRepository:
             .options(
                 selectinload(KitVersion.resources),
                 selectinload(KitVersion.workflow_steps),
+                selectinload(KitVersion.tools),
+                raiseload(KitVersion.kit),
+                raiseload(KitVersion.created_by_user),
+                raiseload(KitVersion.execution_runs),
             )
         )
         result = await self.session.execute(stmt)
@@ -368,6 +449,36 @@ class KitVersionRepository:
         max_version = result.scalar_one_or_none()
         return max_version or 0
 
+    async def get_next_item_numbers(self, version_id: UUID | None) -> tuple[int, int, int]:
+        """Get the next free resource, step, and tool numbers of a version.
+
+        The maxima are computed in SQL, so the version's contents are not
+        loaded.
+
+        Args:
+            version_id: The version's UUID, or None for a kit without versions
+
+        Returns:
+            Tuple of (next_resource_number, next_step_number, next_tool_number)
+        """
+        if version_id is None:
+            return 1, 1, 1
+
+        stmt = select(
+            select(func.max(Resource.resource_number))
+            .where(Resource.version_id == version_id)
+            .scalar_subquery(),
+            select(func.max(WorkflowStep.step_number))
+            .where(WorkflowStep.version_id == version_id)
+            .scalar_subquery(),
+            select(func.max(Tool.tool_number))
+            .where(Tool.version_id == version_id)
+            .scalar_subquery(),
+        )
+        result = await self.session.execute(stmt)
+        resource_max, step_max, tool_max = result.one()
+        return (resource_max or 0) + 1, (step_max or 0) + 1, (tool_max or 0) + 1
+
     async def create(
         self,
         kit_id: UUID,
@@ -390,7 +501,10 @@ class KitVersionRepository:
         latest = await self.get_latest_version_number(kit_id)
         version_number = latest + 1
 
+        # Assign the id up front so the version needs no flush of its own; it
+        # is written by the autoflush before the next statement that uses it.
         version = KitVersion(
+            id=uuid4(),
             kit_id=kit_id,
             version_number=version_number,
             commit_message=commit_message,
@@ -398,19 +512,166 @@ class KitVersionRepository:
             is_draft=is_draft,
         )
         self.session.add(version)
-        await self.session.flush()
 
         # Update kit's current_version_id if not a draft
         if not is_draft:
-            stmt = select(ReasoningKit).where(ReasoningKit.id == kit_id)
-            result = await self.session.execute(stmt)
-            kit = result.scalar_one()
-            kit.current_version_id = version.id
-            kit.updated_at = datetime.utcnow()
-            await self.session.flush()
+            await self.session.execute(
+                update(ReasoningKit)
+                .where(ReasoningKit.id == kit_id)
+                .values(current_version_id=version.id, updated_at=datetime.utcnow())
+            )
 
         return version
 
+    async def create_from(
+        self,
+        kit_id: UUID,
+        source_version_id: UUID | None,
+        commit_message: str | None = None,
+        created_by: UUID | None = None,
+        **changes: Any,
+    ) -> KitVersion:
+        """Create a new version for a kit as a copy of an existing version.
+
+        This is how every kit edit produces its new version: the contents are
+        copied server-side by ``copy_contents``, applying the edit on the way.
+
+        Args:
+            kit_id: The kit's UUID
+            source_version_id: Version to copy from, or None to start empty
+            commit_message: Optional commit message
+            created_by: Optional creator user ID
+            **changes: ``skip_*`` and ``patch_*`` arguments for ``copy_contents``
+
+        Returns:
+            Created kit version
+        """
+        version = await self.create(
+            kit_id=kit_id,
+            commit_message=commit_message,
+            created_by=created_by,
+        )
+        if source_version_id is not None:
+            await self.copy_contents(source_version_id, version.id, **changes)
+        return version
+
+    async def copy_contents(
+        self,
+        source_version_id: UUID,
+        target_version_id: UUID,
+        skip_resource: int | None = None,
+        skip_step: int | None = None,
+        skip_tool: int | None = None,
+        patch_resource: tuple[int, dict[str, Any]] | None = None,
+        patch_step: tuple[int, dict[str, Any]] | None = None,
+        patch_tool: tuple[int, dict[str, Any]] | None = None,
+    ) -> None:
+        """Copy resources, workflow steps, and tools from one version to another.
+
+        Each table is copied with an INSERT ... SELECT, so the rows never leave
+        the database, and the three copies are sent as a single statement (the
+        first two as data-modifying CTEs). Rows matching a ``skip_*`` number are left out,
+        which callers use to delete an item. A ``patch_*`` pair of
+        ``(number, {column: value})`` overrides columns of that one row while
+        it is copied, which callers use to update an item; if no row has that
+        number, nothing is patched.
+
+        Args:
+            source_version_id: Version to copy from
+            target_version_id: Version to copy into
+            skip_resource: Resource number to leave out
+            skip_step: Workflow step number to leave out
+            skip_tool: Tool number to leave out
+            patch_resource: Resource number and column values to override
+            patch_step: Workflow step number and column values to override
+            patch_tool: Tool number and column values to override
+        """
+        copy_resources = self._copy_rows(
+            Resource,
+            "resource_number",
+            source_version_id,
+            target_version_id,
+            skip_resource,
+            patch_resource,
+        )
+        copy_steps = self._copy_rows(
+            WorkflowStep,
+            "step_number",
+            source_version_id,
+            target_version_id,
+            skip_step,
+            patch_step,
+        )
+        copy_tools = self._copy_rows(
+            Tool, "tool_number", source_version_id, target_version_id, skip_tool, patch_tool
+        )
+        await self.session.execute(
+            copy_tools.add_cte(
+                copy_resources.cte("copy_resources"),
+                copy_steps.cte("copy_workflow_steps"),
+            )
+        )
+
+    @staticmethod
+    def _copy_rows(
+        model: type[Resource] | type[WorkflowStep] | type[Tool],
+        number_column_name: str,
+        source_version_id: UUID,
+        target_version_id: UUID,
+        skip_number: int | None,
+        patch: tuple[int, dict[str, Any]] | None,
+    ) -> Insert:
+        """Build the INSERT ... SELECT copying one table's rows between versions."""
+        table = model.__table__
+        number_column = table.c[number_column_name]
+        patch_number, patch_values = patch if patch else (None, {})
+
+        # id and created_at come from the server defaults of the new rows
+        names = [
+            column.name
+            for column in table.columns
+            if column.name not in ("id", "version_id", "created_at")
+        ]
+        selected = [
+            case(
+                (
+                    number_column == patch_number,
+                    literal(patch_values[name], type_=table.c[name].type),
+                ),
+                else_=table.c[name],
+            )
+            if name in patch_values
+            else table.c[name]
+            for name in names
+        ]
+        source = select(
+            literal(target_version_id, type_=table.c.version_id.type),
+            *selected,
+        ).where(table.c.version_id == source_version_id)
+        if skip_number is not None:
+            source = source.where(number_column != skip_number)
+
+        return insert(model).from_select(["version_id", *names], source, include_defaults=False)
+
+    async def has_resource(self, version_id: UUID, resource_number: int) -> bool:
+        """Check whether a version has a resource with the given number.
+
+        Args:
+            version_id: The version's UUID
+            resource_number: The resource number
+
+        Returns:
+            True if the resource exists
+        """
+        stmt = select(
+            exists().where(
+                Resource.version_id == version_id,
+                Resource.resource_number == resource_number,
+            )
+        )
+        result = await self.session.execute(stmt)
+        return bool(result.scalar())
+
     async def add_resource(
         self,
         version_id: UUID,
@@ -422,6 +683,7 @@ class KitVersionRepository:
         file_size_bytes: int | None = None,
         is_dynamic: bool = False,
         display_name: str | None = None,
+        status: str = "ready",
     ) -> Resource:
         """Add a resource to a version.
 
@@ -435,6 +697,7 @@ class KitVersionRepository:
             file_size_bytes: File size in bytes
             is_dynamic: Whether the resource is user-supplied at execution time
             display_name: Optional custom display name
+            status: Upload status ('pending' while the file is being stored)
 
         Returns:
             Created resource
@@ -449,27 +712,46 @@ class KitVersionRepository:
             file_size_bytes=file_size_bytes,
             is_dynamic=is_dynamic,
             display_name=display_name,
+            status=status,
         )
         self.session.add(resource)
-        await self.session.flush()
         return resource
 
+    async def set_resource_status(self, storage_path: str, status: str) -> list[UUID]:
+        """Set the upload status of every resource stored at a path.
+
+        Versions created while an upload was pending copied the resource row,
+        so all rows sharing the storage path are updated.
+
+        Args:
+            storage_path: Path in Supabase Storage
+            status: New status ('ready' or 'failed')
+
+        Returns:
+            UUIDs of the versions whose resources were updated
+        """
+        result = await self.session.execute(
+            update(Resource)
+            .where(Resource.storage_path == storage_path)
+            .values(status=status)
+            .returning(Resource.version_id)
+        )
+        return list(result.scalars())
+
     async def add_resources(
         self,
         resources_data: list[dict],
-    ) -> list[Resource]:
+    ) -> None:
         """Add multiple resources to a version in bulk.
 
+        Rows are sent as a single executemany INSERT without building ORM
+        objects for them.
+
         Args:
             resources_data: List of dictionaries containing kwargs for Resource
-
-        Returns:
-            List of created resources
         """
-        resources = [Resource(**data) for data in resources_data]
-        self.session.add_all(resources)
-        await self.session.flush()
-        return resources
+        if resources_data:
+            await self.session.execute(insert(Resource), resources_data)
 
     async def add_workflow_step(
         self,
@@ -496,25 +778,22 @@ class KitVersionRepository:
             display_name=display_name,
         )
         self.session.add(step)
-        await self.session.flush()
         return step
 
     async def add_workflow_steps(
         self,
         steps_data: list[dict],
-    ) -> list[WorkflowStep]:
+    ) -> None:
         """Add multiple workflow steps to a version in bulk.
 
+        Rows are sent as a single executemany INSERT without building ORM
+        objects for them.
+
         Args:
             steps_data: List of dictionaries containing kwargs for WorkflowStep
-
-        Returns:
-            List of created workflow steps
         """
-        steps = [WorkflowStep(**data) for data in steps_data]
-        self.session.add_all(steps)
-        await self.session.flush()
-        return steps
+        if steps_data:
+            await self.session.execute(insert(WorkflowStep), steps_data)
 
     async def add_tool(
         self,
@@ -544,25 +823,22 @@ class KitVersionRepository:
             configuration=configuration,
         )
         self.session.add(tool)
-        await self.session.flush()
         return tool
 
     async def add_tools(
         self,
         tools_data: list[dict],
-    ) -> list[Tool]:
+    ) -> None:
         """Add multiple tools to a version in bulk.
 
+        Rows are sent as a single executemany INSERT without building ORM
+        objects for them.
+
         Args:
             tools_data: List of dictionaries containing kwargs for Tool
-
-        Returns:
-            List of created tools
         """
-        tools = [Tool(**data) for data in tools_data]
-        self.session.add_all(tools)
-        await self.session.flush()
-        return tools
+        if tools_data:
+            await self.session.execute(insert(Tool), tools_data)
 
 
 class ExecutionRepository:
@@ -578,15 +854,75 @@ class ExecutionRepository:
             run_id: The run's UUID
 
         Returns:
-            Execution run with step executions and version loaded
+            Execution run with its step executions, version, version workflow
+            steps, and kit loaded. The user, the version's other relationships,
+            and the kit's relationships are not loaded and raise on access.
         """
+        # Without the raiseloads the selectin defaults would also pull in the
+        # version's resources and tools and every other run of the version.
         stmt = (
             select(ExecutionRun)
             .where(ExecutionRun.id == run_id)
             .options(
                 selectinload(ExecutionRun.step_executions),
-                selectinload(ExecutionRun.version).selectinload(KitVersion.kit),
-                selectinload(ExecutionRun.version).selectinload(KitVersion.workflow_steps),
+                selectinload(ExecutionRun.version).options(
+                    selectinload(KitVersion.kit).options(
+                        raiseload(ReasoningKit.owner),
+                        raiseload(ReasoningKit.versions),
+                        raiseload(ReasoningKit.current_version),
+                    ),
+                    selectinload(KitVersion.workflow_steps),
+                    raiseload(KitVersion.resources),
+                    raiseload(KitVersion.tools),
+                    raiseload(KitVersion.created_by_user),
+                    raiseload(KitVersion.execution_runs),
+                ),
+                raiseload(ExecutionRun.user),
+            )
+        )
+        result = await self.session.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def get_for_user(self, run_id: UUID, user_id: UUID, slug: str) -> ExecutionRun | None:
+        """Get a user's execution run of a kit, with what is needed to display it.
+
+        The run, its version, and the kit are fetched in one joined query; the
+        step executions and the version's workflow steps are loaded alongside.
+
+        Args:
+            run_id: The run's UUID
+            user_id: The UUID of the user the run must belong to
+            slug: The slug of the kit the run must belong to
+
+        Returns:
+            Execution run, or None if there is no such run for this user and
+            kit. The user, the version's other relationships, and the kit's
+            relationships are not loaded and raise on access.
+        """
+        stmt = (
+            select(ExecutionRun)
+            .join(ExecutionRun.version)
+            .join(KitVersion.kit)
+            .where(
+                ExecutionRun.id == run_id,
+                ExecutionRun.user_id == user_id,
+                ReasoningKit.slug == slug,
+            )
+            .options(
+                selectinload(ExecutionRun.step_executions),
+                contains_eager(ExecutionRun.version).options(
+                    contains_eager(KitVersion.kit).options(
+                        raiseload(ReasoningKit.owner),
+                        raiseload(ReasoningKit.versions),
+                        raiseload(ReasoningKit.current_version),
+                    ),
+                    selectinload(KitVersion.workflow_steps),
+                    raiseload(KitVersion.resources),
+                    raiseload(KitVersion.tools),
+                    raiseload(KitVersion.created_by_user),
+                    raiseload(KitVersion.execution_runs),
+                ),
+                raiseload(ExecutionRun.user),
             )
         )
         result = await self.session.execute(stmt)
@@ -614,32 +950,70 @@ class ExecutionRepository:
         kit_id: UUID,
         user_id: UUID | None = None,
         limit: int = 100,
-    ) -> list[ExecutionRun]:
+        offset: int = 0,
+    ) -> list[dict[str, Any]]:
         """List execution runs for a kit (across all versions).
 
         Args:
             kit_id: The kit's UUID
             user_id: If provided, only return runs by this user
             limit: Maximum number of runs to return
+            offset: Number of runs to skip, for paging
 
         Returns:
-            List of execution runs ordered by start time descending
+            Plain dicts of the runs' summary columns plus ``total_steps``,
+            ordered by start time descending. Only those columns are selected,
+            so no ORM objects are built for this read-only listing.
         """
+        # Count steps in SQL rather than loading every step's input and output
+        step_count = (
+            select(func.count(StepExecution.id))
+            .where(StepExecution.run_id == ExecutionRun.id)
+            .correlate(ExecutionRun)
+            .scalar_subquery()
+        )
         stmt = (
-            select(ExecutionRun)
+            select(
+                ExecutionRun.id,
+                ExecutionRun.status,
+                ExecutionRun.label,
+                ExecutionRun.started_at,
+                ExecutionRun.completed_at,
+                ExecutionRun.storage_mode,
+                step_count.label("total_steps"),
+                ExecutionRun.error_message,
+            )
             .join(KitVersion, ExecutionRun.version_id == KitVersion.id)
             .where(KitVersion.kit_id == kit_id)
-            .options(
-                selectinload(ExecutionRun.step_executions),
-                selectinload(ExecutionRun.version),
-            )
-            .order_by(ExecutionRun.started_at.desc())
+            # The id breaks ties so pages never overlap or skip runs
+            .order_by(ExecutionRun.started_at.desc(), ExecutionRun.id.desc())
             .limit(limit)
+            .offset(offset)
         )
         if user_id is not None:
             stmt = stmt.where(ExecutionRun.user_id == user_id)
         result = await self.session.execute(stmt)
-        return list(result.scalars().all())
+        return [dict(row) for row in result.mappings()]
+
+    async def count_for_kit(self, kit_id: UUID, user_id: UUID | None = None) -> int:
+        """Count execution runs for a kit (across all versions).
+
+        Args:
+            kit_id: The kit's UUID
+            user_id: If provided, only count runs by this user
+
+        Returns:
+            Number of matching runs
+        """
+        stmt = (
+            select(func.count(ExecutionRun.id))
+            .join(KitVersion, ExecutionRun.version_id == KitVersion.id)
+            .where(KitVersion.kit_id == kit_id)
+        )
+        if user_id is not None:
+            stmt = stmt.where(ExecutionRun.user_id == user_id)
+        result = await self.session.execute(stmt)
+        return result.scalar_one()
 
     async def list_for_user(self, user_id: UUID, limit: int = 50) -> list[ExecutionRun]:
         """List recent execution runs for a user.
@@ -732,11 +1106,26 @@ class ExecutionRepository:
         await self.session.flush()
         return step
 
+    async def add_step_executions(
+        self,
+        steps_data: list[dict],
+    ) -> None:
+        """Add multiple step executions in bulk.
+
+        Rows are sent as a single executemany INSERT without building ORM
+        objects for them.
+
+        Args:
+            steps_data: List of dictionaries containing kwargs for StepExecution
+        """
+        if steps_data:
+            await self.session.execute(insert(StepExecution), steps_data)
+
     async def complete_run(
         self,
         run_id: UUID,
         error: str | None = None,
-    ) -> ExecutionRun | None:
+    ) -> bool:
         """Mark a run as completed or failed.
 
         Args:
@@ -744,35 +1133,51 @@ class ExecutionRepository:
             error: Error message if failed (None for success)
 
         Returns:
-            Updated run or None if not found
+            True if updated, False if not found
         """
-        run = await self.get_by_id(run_id)
-        if run is None:
-            return None
+        return await self._update_run(
+            run_id,
+            status="failed" if error else "completed",
+            completed_at=datetime.utcnow(),
+            error_message=error,
+        )
 
-        run.status = "failed" if error else "completed"
-        run.completed_at = datetime.utcnow()
-        run.error_message = error
+    async def pause_run(self, run_id: UUID) -> bool:
+        """Mark a run as paused.
 
-        await self.session.flush()
-        return run
+        Args:
+            run_id: The run's UUID
 
-    async def pause_run(self, run_id: UUID) -> ExecutionRun | None:
-        """Mark a run as paused.
+        Returns:
+            True if updated, False if not found
+        """
+        return await self._update_run(run_id, status="paused")
+
+    async def resume_run(self, run_id: UUID) -> bool:
+        """Mark a paused run as running again.
+
+        The status check is part of the UPDATE, so of two concurrent resumes
+        only one succeeds.
 
         Args:
             run_id: The run's UUID
 
         Returns:
-            Updated run or None if not found
+            True if the run was paused and is now running, False otherwise
         """
-        run = await self.get_by_id(run_id)
-        if run is None:
-            return None
+        result = await self.session.execute(
+            update(ExecutionRun)
+            .where(ExecutionRun.id == run_id, ExecutionRun.status == "paused")
+            .values(status="running")
+        )
+        return result.rowcount > 0
 
-        run.status = "paused"
-        await self.session.flush()
-        return run
+    async def _update_run(self, run_id: UUID, **values: Any) -> bool:
+        """Update columns of a run with a single UPDATE, without loading it."""
+        result = await self.session.execute(
+            update(ExecutionRun).where(ExecutionRun.id == run_id).values(**values)
+        )
+        return result.rowcount > 0
 
     async def delete_run(self, run_id: UUID) -> bool:
         """Delete an execution run and its steps.
@@ -795,7 +1200,7 @@ class ExecutionRepository:
         self,
         run_id: UUID,
         label: str | None,
-    ) -> ExecutionRun | None:
+    ) -> bool:
         """Update the label for an execution run.
 
         Args:
@@ -803,22 +1208,16 @@ class ExecutionRepository:
             label: New label (None to clear)
 
         Returns:
-            Updated run or None if not found
+            True if updated, False if not found
         """
-        run = await self.get_by_id(run_id)
-        if run is None:
-            return None
-
-        run.label = label
-        await self.session.flush()
-        return run
+        return await self._update_run(run_id, label=label)
 
     async def update_step_evaluation(
         self,
         run_id: UUID,
         step_number: int,
         evaluation_score: int,
-    ) -> StepExecution | None:
+    ) -> bool:
         """Update the evaluation score for a step.
 
         Args:
@@ -827,22 +1226,16 @@ class ExecutionRepository:
             evaluation_score: Evaluation score (0-100)
 
         Returns:
-            Updated step execution or None if not found
+            True if updated, False if not found
         """
         stmt = (
-            select(StepExecution)
+            update(StepExecution)
             .where(StepExecution.run_id == run_id)
             .where(StepExecution.step_number == step_number)
+            .values(evaluation_score=evaluation_score)
         )
         result = await self.session.execute(stmt)
-        step = result.scalar_one_or_none()
-
-        if step is None:
-            return None
-
-        step.evaluation_score = evaluation_score
-        await self.session.flush()
-        return step
+        return result.rowcount > 0
 
 
 class BookmarkRepository:
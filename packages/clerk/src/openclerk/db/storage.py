@@ -1,13 +1,27 @@
 """Supabase Storage integration for resource files."""
 
+from functools import cache
 from pathlib import Path
 from uuid import UUID
 
+from supabase import Client
+
 from .config import get_supabase_client
 
 BUCKET_NAME = "reasoning-kits"
 
 
+@cache
+def _get_storage_client(use_service_key: bool) -> Client:
+    """Get the Supabase client shared by all storage services.
+
+    Clients used here never sign in, so unlike the per-call anon clients used
+    for auth they carry no user session and can be shared. Reusing them keeps
+    the storage HTTP connection pool warm across requests.
+    """
+    return get_supabase_client(use_service_key)
+
+
 class StorageService:
     """Service for managing files in Supabase Storage.
 
@@ -21,38 +35,59 @@ class StorageService:
         Args:
             use_service_key: Use service role key for admin operations.
         """
-        self.client = get_supabase_client(use_service_key)
+        self.client = _get_storage_client(use_service_key)
         self.bucket = self.client.storage.from_(BUCKET_NAME)
 
+    @staticmethod
+    def resource_path(kit_id: UUID, version_id: UUID, filename: str) -> str:
+        """Build the storage path of a resource file.
+
+        Args:
+            kit_id: The reasoning kit ID
+            version_id: The kit version ID
+            filename: The filename to use in storage
+
+        Returns:
+            Storage path for the file
+        """
+        return f"{kit_id}/{version_id}/resources/{filename}"
+
     def upload_resource(
         self,
         kit_id: UUID,
         version_id: UUID,
         filename: str,
         file_path: Path,
+        content_type: str | None = None,
     ) -> str:
         """Upload a resource file to storage.
 
+        The open file is handed to the storage client, which streams it into
+        the request body instead of reading it into memory first.
+
         Args:
             kit_id: The reasoning kit ID
             version_id: The kit version ID
             filename: The filename to use in storage
             file_path: Local path to the file
+            content_type: MIME type of the content
 
         Returns:
             Storage path for the uploaded file
         """
-        storage_path = f"{kit_id}/{version_id}/resources/{filename}"
+        storage_path = self.resource_path(kit_id, version_id, filename)
 
-        with open(file_path, "rb") as f:
-            file_content = f.read()
+        file_options = {"upsert": "true"}
+        if content_type:
+            file_options["contentType"] = content_type
 
         # Upload file (will overwrite if exists)
-        self.bucket.upload(
-            path=storage_path,
-            file=file_content,
-            file_options={"upsert": "true"},
-        )
+        with open(file_path, "rb") as f:
+            self.bucket.upload(
+                path=storage_path,
+                file=f,
+                file_options=file_options,  # type: ignore[arg-type]
+            )
 
         return storage_path
 
@@ -76,7 +111,7 @@ class StorageService:
         Returns:
             Storage path for the uploaded file
         """
-        storage_path = f"{kit_id}/{version_id}/resources/{filename}"
+        storage_path = self.resource_path(kit_id, version_id, filename)
 
         file_options = {"upsert": "true"}
         if content_type:
@@ -8,7 +8,10 @@ Supports:
 - Excel files (.xlsx, .xls)
 """
 
+import io
+import os
 from pathlib import Path
+from typing import BinaryIO
 
 # MIME type mapping based on file extensions
 EXTENSION_TO_MIME: dict[str, str] = {
@@ -45,7 +48,8 @@ def detect_mime_type_from_filename(filename: str) -> str:
     Returns:
         MIME type string
     """
-    return detect_mime_type(Path(filename))
+    suffix = os.path.splitext(filename)[1].lower()
+    return EXTENSION_TO_MIME.get(suffix, "application/octet-stream")
 
 
 def extract_text(file_path: Path, mime_type: str | None = None) -> str | None:
@@ -138,6 +142,34 @@ def extract_text_from_bytes(
         return None
 
 
+def extract_text_from_file(file: BinaryIO, mime_type: str) -> str | None:
+    """Extract text content from an open binary file based on MIME type.
+
+    PDF, Excel, and Word files are parsed straight from the file, so large
+    uploads are not read into memory first.
+
+    Args:
+        file: Readable, seekable binary file positioned at the start
+        mime_type: MIME type of the file content
+
+    Returns:
+        Extracted text content, or None if extraction failed
+    """
+    if mime_type == "application/pdf":
+        return _extract_pdf_text(file)
+
+    if mime_type in (
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        "application/vnd.ms-excel",
+    ):
+        return _extract_xlsx_text(file)
+
+    if mime_type == "application/vnd.openxmlformats-officedocument.wordprocessingml.document":
+        return _extract_docx_text(file)
+
+    return extract_text_from_bytes(file.read(), mime_type)
+
+
 def _extract_text_file(file_path: Path) -> str:
     """Extract text from a plain text file.
 
@@ -153,18 +185,18 @@ def _extract_text_file(file_path: Path) -> str:
         return file_path.read_text(encoding="latin-1")
 
 
-def _extract_pdf_text(file_path: Path) -> str:
+def _extract_pdf_text(source: Path | BinaryIO) -> str:
     """Extract text from a PDF file.
 
     Args:
-        file_path: Path to the PDF file
+        source: Path to the PDF file, or the open file
 
     Returns:
         Extracted text from all pages
     """
     from pypdf import PdfReader
 
-    reader = PdfReader(file_path)
+    reader = PdfReader(source)
     text_parts = []
 
     for page in reader.pages:
@@ -184,33 +216,21 @@ def _extract_pdf_text_from_bytes(content: bytes) -> str:
     Returns:
         Extracted text from all pages
     """
-    import io
-
-    from pypdf import PdfReader
-
-    reader = PdfReader(io.BytesIO(content))
-    text_parts = []
-
-    for page in reader.pages:
-        page_text = page.extract_text()
-        if page_text:
-            text_parts.append(page_text)
-
-    return "\n\n".join(text_parts)
+    return _extract_pdf_text(io.BytesIO(content))
 
 
-def _extract_xlsx_text(file_path: Path) -> str:
+def _extract_xlsx_text(source: Path | BinaryIO) -> str:
     """Extract text from an Excel file.
 
     Args:
-        file_path: Path to the Excel file
+        source: Path to the Excel file, or the open file
 
     Returns:
         CSV-like text representation of all sheets
     """
     from openpyxl import load_workbook
 
-    wb = load_workbook(file_path, read_only=True, data_only=True)
+    wb = load_workbook(source, read_only=True, data_only=True)
     text_parts = []
 
     for sheet in wb.worksheets:
@@ -241,42 +261,21 @@ def _extract_xlsx_text_from_bytes(content: bytes) -> str:
     Returns:
         CSV-like text representation of all sheets
     """
-    import io
-
-    from openpyxl import load_workbook
-
-    wb = load_workbook(io.BytesIO(content), read_only=True, data_only=True)
-    text_parts = []
-
-    for sheet in wb.worksheets:
-        sheet_lines = []
-        for row in sheet.iter_rows(values_only=True):
-            row_values = [str(cell) if cell is not None else "" for cell in row]
-            row_text = ", ".join(row_values)
-            if row_text.strip(", "):
-                sheet_lines.append(row_text)
+    return _extract_xlsx_text(io.BytesIO(content))
 
-        if sheet_lines:
-            text_parts.append(f"[{sheet.title}]")
-            text_parts.extend(sheet_lines)
-            text_parts.append("")
 
-    wb.close()
-    return "\n".join(text_parts)
-
-
-def _extract_docx_text(file_path: Path) -> str:
+def _extract_docx_text(source: Path | BinaryIO) -> str:
     """Extract text from a Word document (.docx) file.
 
     Args:
-        file_path: Path to the .docx file
+        source: Path to the .docx file, or the open file
 
     Returns:
         Extracted text with paragraphs joined by newlines
     """
     from docx import Document
 
-    doc = Document(str(file_path))
+    doc = Document(str(source) if isinstance(source, Path) else source)
     return "\n".join(para.text for para in doc.paragraphs if para.text)
 
 
@@ -289,12 +288,7 @@ def _extract_docx_text_from_bytes(content: bytes) -> str:
     Returns:
         Extracted text with paragraphs joined by newlines
     """
-    import io
-
-    from docx import Document
-
-    doc = Document(io.BytesIO(content))
-    return "\n".join(para.text for para in doc.paragraphs if para.text)
+    return _extract_docx_text(io.BytesIO(content))
 
 
 def get_file_size(file_path: Path) -> int:
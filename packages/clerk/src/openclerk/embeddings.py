@@ -5,6 +5,7 @@ import logging
 
 from langchain_core.embeddings import Embeddings
 from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from .db.models import EmbeddingCache
@@ -60,13 +61,13 @@ class CachedEmbeddings(Embeddings):
                 # pgvector returns ndarray or list; ensure it's a list
                 cached_results[row.text_hash] = list(row.embedding)
 
-        # 3. Identify texts that missed the cache
-        missing_indices: list[int] = []
-        missing_texts: list[str] = []
-        for i, text_hash in enumerate(text_hashes):
+        # 3. Identify texts that missed the cache (each distinct text once)
+        missing: dict[str, str] = {}
+        for text_hash, text in zip(text_hashes, texts):
             if text_hash not in cached_results:
-                missing_indices.append(i)
-                missing_texts.append(texts[i])
+                missing.setdefault(text_hash, text)
+        missing_hashes = list(missing)
+        missing_texts = list(missing.values())
 
         # 4. Fetch missing embeddings from the underlying provider
         if missing_texts:
@@ -78,23 +79,21 @@ class CachedEmbeddings(Embeddings):
             else:
                 raise NotImplementedError("Underlying embeddings does not support async")
 
-            # 5. Save the newly fetched embeddings to the database
-            async with self.session_factory() as session:
-                for i, text in enumerate(missing_texts):
-                    text_hash = text_hashes[missing_indices[i]]
-                    embedding = new_embeddings[i]
-
-                    # Store in our original order tracking
-                    cached_results[text_hash] = embedding
-
-                    # Store in DB
-                    db_entry = EmbeddingCache(
-                        text_hash=text_hash,
-                        embedding=embedding,
-                    )
-                    session.add(db_entry)
+            cached_results.update(zip(missing_hashes, new_embeddings))
 
+            # 5. Save the newly fetched embeddings to the database in one
+            # executemany; rows cached concurrently by another run are skipped
+            async with self.session_factory() as session:
                 try:
+                    await session.execute(
+                        insert(EmbeddingCache).on_conflict_do_nothing(
+                            index_elements=[EmbeddingCache.text_hash]
+                        ),
+                        [
+                            {"text_hash": text_hash, "embedding": embedding}
+                            for text_hash, embedding in zip(missing_hashes, new_embeddings)
+                        ],
+                    )
                     await session.commit()
                 except Exception as e:
                     logger.warning("Failed to save embeddings to cache: %s", e)
@@ -4,6 +4,7 @@ import json
 from pathlib import Path
 from uuid import UUID
 
+from .db import ExecutionRepository, get_async_session
 from .models import Evaluation, StepEvaluation
 
 
@@ -142,8 +143,6 @@ async def save_evaluation_to_db(
         tokens_used: Total tokens consumed
         latency_ms: Execution latency in milliseconds
     """
-    from .db import ExecutionRepository, get_async_session
-
     async with get_async_session() as session:
         repo = ExecutionRepository(session)
 
@@ -193,31 +192,55 @@ async def save_step_to_db(
         tokens_used: Total tokens consumed
         latency_ms: Execution latency in milliseconds
     """
-    from .db import ExecutionRepository, get_async_session
-
-    async with get_async_session() as session:
-        repo = ExecutionRepository(session)
+    await save_steps_to_db(
+        run_id=run_id,
+        steps=[
+            {
+                "step_number": step_number,
+                "prompt": prompt,
+                "output": output,
+                "tokens_used": tokens_used,
+                "latency_ms": latency_ms,
+            }
+        ],
+        mode=mode,
+        model_used=model_used,
+    )
+
+
+async def save_steps_to_db(
+    run_id: UUID,
+    steps: list[dict],
+    mode: str,
+    model_used: str | None = None,
+) -> None:
+    """Save several step executions (without evaluation) in one transaction.
 
+    Args:
+        run_id: The execution run's UUID
+        steps: Dicts with step_number, prompt, output, tokens_used and latency_ms
+        mode: Either "transparent" or "anonymous"
+        model_used: LLM model used for these steps
+    """
+    rows = []
+    for step in steps:
+        row = {
+            "run_id": run_id,
+            "step_number": step["step_number"],
+            "model_used": model_used,
+            "tokens_used": step.get("tokens_used"),
+            "latency_ms": step.get("latency_ms"),
+        }
         if mode == "transparent":
-            await repo.add_step_execution(
-                run_id=run_id,
-                step_number=step_number,
-                input_text=prompt,
-                output_text=output,
-                model_used=model_used,
-                tokens_used=tokens_used,
-                latency_ms=latency_ms,
-            )
+            row["input_text"] = step["prompt"]
+            row["output_text"] = step["output"]
         else:  # anonymous
-            await repo.add_step_execution(
-                run_id=run_id,
-                step_number=step_number,
-                input_char_count=len(prompt),
-                output_char_count=len(output),
-                model_used=model_used,
-                tokens_used=tokens_used,
-                latency_ms=latency_ms,
-            )
+            row["input_char_count"] = len(step["prompt"])
+            row["output_char_count"] = len(step["output"])
+        rows.append(row)
+
+    async with get_async_session() as session:
+        await ExecutionRepository(session).add_step_executions(rows)
 
 
 async def update_step_evaluation_in_db(
@@ -232,8 +255,6 @@ async def update_step_evaluation_in_db(
         step_number: The workflow step number
         score: The user's evaluation score (0-100)
     """
-    from .db import ExecutionRepository, get_async_session
-
     async with get_async_session() as session:
         repo = ExecutionRepository(session)
         await repo.update_step_evaluation(
@@ -258,8 +279,6 @@ async def create_execution_run(
     Returns:
         The created run's UUID
     """
-    from .db import ExecutionRepository, get_async_session
-
     async with get_async_session() as session:
         repo = ExecutionRepository(session)
         run = await repo.create(
@@ -280,8 +299,6 @@ async def complete_execution_run(
         run_id: The run's UUID
         error: Error message if failed (None for success)
     """
-    from .db import ExecutionRepository, get_async_session
-
     async with get_async_session() as session:
         repo = ExecutionRepository(session)
         await repo.complete_run(run_id=run_id, error=error)
@@ -293,8 +310,6 @@ async def pause_execution_run(run_id: UUID) -> None:
     Args:
         run_id: The run's UUID
     """
-    from .db import ExecutionRepository, get_async_session
-
     async with get_async_session() as session:
         repo = ExecutionRepository(session)
         await repo.pause_run(run_id=run_id)
@@ -309,8 +324,6 @@ async def delete_execution_run(run_id: UUID) -> bool:
     Returns:
         True if deleted, False if not found
     """
-    from .db import ExecutionRepository, get_async_session
-
     async with get_async_session() as session:
         repo = ExecutionRepository(session)
         return await repo.delete_run(run_id=run_id)
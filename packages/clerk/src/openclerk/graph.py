@@ -5,10 +5,12 @@ import logging
 import os
 import re
 import time
+from functools import lru_cache
 from pathlib import Path
 from typing import Annotated, Any, Coroutine, TypedDict, TypeVar, cast
 from uuid import UUID
 
+from langchain_core.messages import HumanMessage, ToolMessage
 from langchain_core.vectorstores import InMemoryVectorStore
 from langchain_openai import OpenAIEmbeddings
 from langgraph.graph import END, StateGraph
@@ -25,7 +27,7 @@ from .evaluation import (
     update_step_evaluation_in_db,
 )
 from .llm_factory import get_llm
-from .models import Evaluation, ReasoningKit, StepEvaluation
+from .models import Evaluation, ReasoningKit, StepEvaluation, WorkflowStep
 from .tools import get_openai_tool_schema, get_tool
 
 logger = logging.getLogger(__name__)
@@ -122,15 +124,7 @@ def create_initial_state(
     resources = {r.resource_id: r.content for r in kit.resources.values()}
     workflow_prompts = {k: v.prompt for k, v in kit.workflow.items()}
     workflow_output_ids = {k: v.output_id for k, v in kit.workflow.items()}
-    tools_data = {
-        k: {
-            "tool_name": v.tool_name,
-            "tool_id": v.tool_id,
-            "display_name": v.display_name,
-            "configuration": v.configuration,
-        }
-        for k, v in kit.tools.items()
-    }
+    tools_data = kit.tool_metadata
 
     return State(
         kit_name=kit.name,
@@ -215,9 +209,42 @@ def chunk_text(text: str, max_size: int = 2000, overlap: int = 200) -> list[str]
     return chunks
 
 
+# Placeholder patterns, compiled once and shared by every step resolution
+_PLACEHOLDER_RE = re.compile(r"\{(\w+)\}")
+_TOOL_PLACEHOLDER_RE = re.compile(r"\{tool_(\d+)\}")
+_MULTI_SPACE_RE = re.compile(r"  +")
+
+
+def _substitute_placeholders(text: str, replacements: dict[str, str]) -> str:
+    """Replace every {placeholder} with its value in a single pass over the text."""
+    if not replacements:
+        return text
+    return _PLACEHOLDER_RE.sub(lambda m: replacements.get(m.group(1), m.group(0)), text)
+
+
+def message_text(message: Any) -> str:
+    """Return a chat model response's content as text.
+
+    Content is almost always a string already and is returned as-is; other
+    content (such as a list of content blocks) is converted with ``str``.
+    """
+    content = message.content
+    return content if isinstance(content, str) else str(content)
+
+
 def extract_search_query(text: str) -> str:
     """Remove all {placeholders} from text to create a clean search query."""
-    return re.sub(r"\{(\w+)\}", "", text).strip()
+    return _PLACEHOLDER_RE.sub("", text).strip()
+
+
+@lru_cache(maxsize=1024)
+def _referenced_tool_numbers(text: str) -> tuple[str, ...]:
+    """Return the distinct tool numbers referenced by {tool_N} in text, in order.
+
+    Prompt templates do not change within a kit version, so the scan is cached;
+    schemas are still looked up per call since the tool registry can change.
+    """
+    return tuple(dict.fromkeys(_TOOL_PLACEHOLDER_RE.findall(text)))
 
 
 def extract_tool_refs(text: str, kit_tools: dict[str, dict]) -> list[dict]:
@@ -230,19 +257,12 @@ def extract_tool_refs(text: str, kit_tools: dict[str, dict]) -> list[dict]:
     Returns:
         List of OpenAI-compatible tool schemas for referenced tools
     """
-    placeholders = re.findall(r"\{(tool_\d+)\}", text)
     schemas = []
-    seen = set()
-
-    for placeholder in placeholders:
-        # Extract number from "tool_1" -> "1"
-        num = placeholder.replace("tool_", "")
-        if num in kit_tools and placeholder not in seen:
-            tool_name = kit_tools[num]["tool_name"]
-            schema = get_openai_tool_schema(tool_name)
+    for num in _referenced_tool_numbers(text):
+        if num in kit_tools:
+            schema = get_openai_tool_schema(kit_tools[num]["tool_name"])
             if schema:
                 schemas.append(schema)
-                seen.add(placeholder)
 
     return schemas
 
@@ -254,21 +274,48 @@ def remove_tool_placeholders(text: str, kit_tools: dict[str, dict] | None = None
     reference like 'the read_url tool' so the LLM knows which tool to use.
     The actual tool definitions are passed separately via the tools parameter.
     """
-    import re as _re
 
-    def _replace_match(m: _re.Match) -> str:
+    def _replace_match(m: re.Match) -> str:
         num = m.group(1)
         if kit_tools and num in kit_tools:
             name = kit_tools[num].get("display_name") or kit_tools[num].get("tool_name", "")
             return f"the {name} tool"
         return ""
 
-    cleaned = _re.sub(r"\{tool_(\d+)\}", _replace_match, text)
+    cleaned = _TOOL_PLACEHOLDER_RE.sub(_replace_match, text) if "{tool_" in text else text
     # Collapse any double spaces left behind
-    cleaned = _re.sub(r"  +", " ", cleaned)
+    cleaned = _MULTI_SPACE_RE.sub(" ", cleaned)
     return cleaned.strip()
 
 
+def plan_step_waves(kit: ReasoningKit) -> list[list[tuple[int, WorkflowStep]]]:
+    """Group workflow steps into waves that can run concurrently.
+
+    Steps keep their numeric order. A step joins the current wave unless its
+    prompt references the output of a step already in that wave, in which
+    case it starts a new wave. Running each wave concurrently therefore
+    resolves exactly the same placeholders as running the steps one by one.
+
+    Args:
+        kit: The reasoning kit whose workflow should be planned
+
+    Returns:
+        List of waves, each a list of (step number, step) pairs
+    """
+    waves: list[list[tuple[int, WorkflowStep]]] = []
+    wave_outputs: set[str] = set()
+
+    for step_num, step in kit.ordered_steps:
+        refs = set(_PLACEHOLDER_RE.findall(step.prompt))
+        if not waves or refs & wave_outputs:
+            waves.append([])
+            wave_outputs = set()
+        waves[-1].append((step_num, step))
+        wave_outputs.add(step.output_id)
+
+    return waves
+
+
 def resolve_placeholders(
     text: str,
     resources: dict[str, str],
@@ -288,7 +335,7 @@ def resolve_placeholders(
     Returns:
         Text with all placeholders resolved
     """
-    placeholders = re.findall(r"\{(\w+)\}", text)
+    placeholders = dict.fromkeys(_PLACEHOLDER_RE.findall(text))
     if not placeholders:
         return text
 
@@ -297,6 +344,7 @@ def resolve_placeholders(
 
     # We load embeddings lazily to avoid unnecessary initialization
     embeddings = None
+    replacements: dict[str, str] = {}
 
     for placeholder in placeholders:
         if placeholder in resources:
@@ -318,7 +366,7 @@ def resolve_placeholders(
                     relevant_content = "\n\n... [Context skipped] ...\n\n".join(
                         [doc.page_content for doc in results]
                     )
-                    text = text.replace(f"{{{placeholder}}}", relevant_content)
+                    replacements[placeholder] = relevant_content
                     logger.debug(
                         "RAG triggered for %s: chunked %d chars into %d parts, retrieved %d chunks.",
                         placeholder,
@@ -332,14 +380,14 @@ def resolve_placeholders(
                         placeholder,
                         e,
                     )
-                    text = text.replace(f"{{{placeholder}}}", content)
+                    replacements[placeholder] = content
             else:
-                text = text.replace(f"{{{placeholder}}}", content)
+                replacements[placeholder] = content
 
         elif placeholder in outputs:
-            text = text.replace(f"{{{placeholder}}}", outputs[placeholder])
+            replacements[placeholder] = outputs[placeholder]
 
-    return text
+    return _substitute_placeholders(text, replacements)
 
 
 async def aresolve_placeholders(
@@ -350,12 +398,13 @@ async def aresolve_placeholders(
     max_chunks: int = 4,
 ) -> str:
     """Async version of resolve_placeholders for non-blocking execution."""
-    placeholders = re.findall(r"\{(\w+)\}", text)
+    placeholders = dict.fromkeys(_PLACEHOLDER_RE.findall(text))
     if not placeholders:
         return text
 
     search_query = extract_search_query(text)
     embeddings = None
+    replacements: dict[str, str] = {}
 
     for placeholder in placeholders:
         if placeholder in resources:
@@ -380,21 +429,21 @@ async def aresolve_placeholders(
                     relevant_content = "\n\n... [Context skipped] ...\n\n".join(
                         [doc.page_content for doc in results]
                     )
-                    text = text.replace(f"{{{placeholder}}}", relevant_content)
+                    replacements[placeholder] = relevant_content
                 except Exception as e:
                     logger.debug(
                         "Async RAG failed for %s, falling back to full text. Error: %s",
                         placeholder,
                         e,
                     )
-                    text = text.replace(f"{{{placeholder}}}", content)
+                    replacements[placeholder] = content
             else:
-                text = text.replace(f"{{{placeholder}}}", content)
+                replacements[placeholder] = content
 
         elif placeholder in outputs:
-            text = text.replace(f"{{{placeholder}}}", outputs[placeholder])
+            replacements[placeholder] = outputs[placeholder]
 
-    return text
+    return _substitute_placeholders(text, replacements)
 
 
 T = TypeVar("T")
@@ -446,8 +495,6 @@ def execute_step(state: State) -> dict[str, Any]:
 
     if openai_tools:
         # Tool-aware execution
-        from langchain_core.messages import HumanMessage, ToolMessage
-
         tool_names = [t["function"]["name"] for t in openai_tools]
         logger.info("Step %s - Tools enabled: %s", current_step, ", ".join(tool_names))
 
@@ -493,7 +540,7 @@ def execute_step(state: State) -> dict[str, Any]:
             response = llm_with_tools.invoke(messages)
             messages.append(response)
 
-        result = str(response.content)
+        result = message_text(response)
         # If the model never returned text (kept calling tools), force final response
         if not response.content:
             logger.info(
@@ -507,11 +554,11 @@ def execute_step(state: State) -> dict[str, Any]:
             llm_final = llm.bind_tools([t["function"] for t in openai_tools], tool_choice="none")
             response = llm_final.invoke(messages)
             messages.append(response)
-            result = str(response.content)
+            result = message_text(response)
     else:
         # Standard execution without tools
         response = llm.invoke(clean_prompt)
-        result = str(response.content)
+        result = message_text(response)
 
     # Calculate latency
     latency_ms = int((time.time() - start_time) * 1000)
@@ -750,8 +797,6 @@ def run_reasoning_kit(
     # Save evaluation if enabled (to local file)
     if evaluate and final_state["evaluations"] and not kit.path.startswith("db://"):
         # Convert dict representations back to StepEvaluation objects
-        from .models import StepEvaluation
-
         steps: dict[str, StepEvaluation] = {
             str(k): StepEvaluation(**v) if isinstance(v, dict) else v
             for k, v in final_state["evaluations"].items()
@@ -829,15 +874,7 @@ async def run_reasoning_kit_async(
     error_message: str | None = None
 
     # Build tool data from kit
-    kit_tools = {
-        k: {
-            "tool_name": v.tool_name,
-            "tool_id": v.tool_id,
-            "display_name": v.display_name,
-            "configuration": v.configuration,
-        }
-        for k, v in kit.tools.items()
-    }
+    kit_tools = kit.tool_metadata
 
     if verbose:
         print(f"\n{'#' * 60}")
@@ -852,10 +889,7 @@ async def run_reasoning_kit_async(
             print("Database tracking: enabled")
         print(f"{'#' * 60}\n")
 
-    for step_key in sorted(kit.workflow.keys(), key=int):
-        step = kit.workflow[step_key]
-        step_num = int(step_key)
-
+    for step_num, step in kit.ordered_steps:
         prompt = await aresolve_placeholders(step.prompt, resources, outputs)
 
         # Extract tool references and clean prompt
@@ -870,8 +904,6 @@ async def run_reasoning_kit_async(
         try:
             if openai_tools:
                 # Tool-aware execution
-                from langchain_core.messages import HumanMessage, ToolMessage
-
                 tool_names = [t["function"]["name"] for t in openai_tools]
                 logger.info("Step %s - Tools enabled: %s", step_num, ", ".join(tool_names))
 
@@ -952,7 +984,7 @@ async def run_reasoning_kit_async(
                     response = await llm_with_tools.ainvoke(messages)
                     messages.append(response)
 
-                result = str(response.content)
+                result = message_text(response)
                 # If the model never returned text (kept calling tools), force final response
                 if not response.content:
                     logger.info(
@@ -968,7 +1000,7 @@ async def run_reasoning_kit_async(
                     )
                     response = await llm_final.ainvoke(messages)
                     messages.append(response)
-                    result = str(response.content)
+                    result = message_text(response)
 
                 if verbose:
                     print(f"\n[Final Response]\n{result}")
@@ -976,7 +1008,7 @@ async def run_reasoning_kit_async(
             else:
                 # Standard execution without tools
                 response = await llm.ainvoke(clean_prompt)
-                result = str(response.content)
+                result = message_text(response)
 
                 if verbose:
                     print(f"\n{'=' * 60}")
@@ -1,8 +1,10 @@
 import json
 import os
+import time
 from typing import Any
 from uuid import UUID
 
+import httpx
 from langchain_core.language_models.chat_models import BaseChatModel
 from sqlalchemy import select
 
@@ -20,6 +22,40 @@ DEFAULT_MODELS = {
     "openrouter": "openai/gpt-5.4-nano",
 }
 
+# Chat model clients are stateless between calls, so they are reused per
+# (provider, model, temperature, credentials) to keep connections warm.
+_LLM_CACHE_MAXSIZE = 64
+_llm_cache: dict[tuple, BaseChatModel] = {}
+
+# OpenAI-compatible clients (OpenAI, OpenRouter) share one async HTTP connection
+# pool instead of each opening their own. Timeouts match the OpenAI SDK defaults.
+_HTTP_TIMEOUT = httpx.Timeout(600.0, connect=5.0)
+_HTTP_LIMITS = httpx.Limits(max_connections=256, max_keepalive_connections=64)
+_http_async_client: httpx.AsyncClient | None = None
+
+# Each execution looks up the user's active provider; keep the answer briefly so
+# repeated runs skip the query. Updates through the API invalidate it at once.
+_PROVIDER_CONFIG_TTL = 30.0
+_PROVIDER_CONFIG_MAXSIZE = 1024
+_provider_config_cache: dict[UUID, tuple[float, dict[str, Any] | None]] = {}
+
+
+def _get_http_async_client() -> httpx.AsyncClient:
+    """Return the shared async HTTP client, creating it on first use."""
+    global _http_async_client
+    if _http_async_client is None or _http_async_client.is_closed:
+        _http_async_client = httpx.AsyncClient(timeout=_HTTP_TIMEOUT, limits=_HTTP_LIMITS)
+    return _http_async_client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client and drop the chat models bound to it."""
+    global _http_async_client
+    if _http_async_client is not None:
+        await _http_async_client.aclose()
+        _http_async_client = None
+    _llm_cache.clear()
+
 
 async def get_active_provider_config(user_id: UUID | None) -> dict[str, Any] | None:
     """Get the active LLM provider configuration for a user."""
@@ -30,6 +66,12 @@ async def get_active_provider_config(user_id: UUID | None) -> dict[str, Any] | N
     if not config.is_database_configured:
         return None
 
+    now = time.monotonic()
+    cached = _provider_config_cache.get(user_id)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    active_config = None
     try:
         async with get_async_session() as session:
             stmt = select(LlmProviderConfig).where(
@@ -40,7 +82,7 @@ async def get_active_provider_config(user_id: UUID | None) -> dict[str, Any] | N
             provider_config = result.scalar_one_or_none()
 
             if provider_config:
-                return {
+                active_config = {
                     "provider": provider_config.provider_name,
                     "env_vars": provider_config.env_vars,
                     "model": provider_config.selected_model
@@ -48,9 +90,18 @@ async def get_active_provider_config(user_id: UUID | None) -> dict[str, Any] | N
                 }
     except Exception as e:
         print(f"Error fetching active provider config: {e}")
-        pass
+        return None
+
+    _provider_config_cache.pop(user_id, None)
+    if len(_provider_config_cache) >= _PROVIDER_CONFIG_MAXSIZE:
+        _provider_config_cache.pop(next(iter(_provider_config_cache)))
+    _provider_config_cache[user_id] = (now + _PROVIDER_CONFIG_TTL, active_config)
+    return active_config
+
 
-    return None
+def invalidate_provider_config(user_id: UUID) -> None:
+    """Forget the cached active provider of a user after their settings change."""
+    _provider_config_cache.pop(user_id, None)
 
 
 async def get_llm(
@@ -62,6 +113,9 @@ async def get_llm(
     Order of precedence:
     1. Active provider config from DB for the user.
     2. Global environment variables (e.g., OPENAI_API_KEY).
+
+    Instances are cached per provider settings, so repeated calls share one
+    client and its HTTP connection pool instead of opening a new one each time.
     """
     # Check DB for user override
     active_config = None
@@ -71,6 +125,29 @@ async def get_llm(
         except ValueError:
             pass
 
+    if active_config:
+        cache_key: tuple = (
+            active_config["provider"],
+            model or active_config["model"],
+            temperature,
+            json.dumps(active_config["env_vars"], sort_keys=True),
+        )
+    else:
+        cache_key = ("env", model or DEFAULT_MODELS["openai"], temperature)
+
+    llm = _llm_cache.get(cache_key)
+    if llm is None:
+        llm = _create_llm(active_config, model, temperature)
+        if len(_llm_cache) >= _LLM_CACHE_MAXSIZE:
+            _llm_cache.pop(next(iter(_llm_cache)))
+        _llm_cache[cache_key] = llm
+    return llm
+
+
+def _create_llm(
+    active_config: dict[str, Any] | None, model: str | None, temperature: float
+) -> BaseChatModel:
+    """Instantiate a chat model for a provider config, or from environment variables."""
     if active_config:
         provider = active_config["provider"]
         env_vars = active_config["env_vars"]
@@ -82,7 +159,13 @@ async def get_llm(
             from langchain_openai import ChatOpenAI
 
             api_key = env_vars.get("OPENAI_API_KEY")
-            return ChatOpenAI(model=target_model, temperature=temperature, api_key=api_key)
+            return ChatOpenAI(
+                model=target_model,
+                temperature=temperature,
+                api_key=api_key,
+                stream_usage=True,
+                http_async_client=_get_http_async_client(),
+            )
 
         elif provider == "anthropic":
             from langchain_anthropic import ChatAnthropic
@@ -117,6 +200,8 @@ async def get_llm(
                 temperature=temperature,
                 api_key=api_key,
                 base_url="https://openrouter.ai/api/v1",
+                stream_usage=True,
+                http_async_client=_get_http_async_client(),
             )
 
         elif provider == "vertex":
@@ -167,7 +252,12 @@ async def get_llm(
     if inferred_provider == "openai" and os.environ.get("OPENAI_API_KEY"):
         from langchain_openai import ChatOpenAI
 
-        return ChatOpenAI(model=target_model, temperature=temperature)
+        return ChatOpenAI(
+            model=target_model,
+            temperature=temperature,
+            stream_usage=True,
+            http_async_client=_get_http_async_client(),
+        )
 
     elif inferred_provider == "anthropic" and os.environ.get("ANTHROPIC_API_KEY"):
         from langchain_anthropic import ChatAnthropic
@@ -199,15 +289,27 @@ async def get_llm(
             temperature=temperature,
             api_key=SecretStr(os.environ["OPENROUTER_API_KEY"]),
             base_url="https://openrouter.ai/api/v1",
+            stream_usage=True,
+            http_async_client=_get_http_async_client(),
         )
 
     # Fallback if the inferred provider key is missing but another is present
     if os.environ.get("OPENAI_API_KEY"):
         from langchain_openai import ChatOpenAI
 
-        return ChatOpenAI(model=target_model, temperature=temperature)
+        return ChatOpenAI(
+            model=target_model,
+            temperature=temperature,
+            stream_usage=True,
+            http_async_client=_get_http_async_client(),
+        )
 
     # Absolute default
     from langchain_openai import ChatOpenAI
 
-    return ChatOpenAI(model=target_model, temperature=temperature)
+    return ChatOpenAI(
+        model=target_model,
+        temperature=temperature,
+        stream_usage=True,
+        http_async_client=_get_http_async_client(),
+    )
@@ -219,11 +219,15 @@ async def _convert_db_kit_to_model(db_kit: DBReasoningKit, version: KitVersion)
     # Load resources
     resources: dict[str, Resource] = {}
     for db_resource in version.resources:
-        is_dynamic = getattr(db_resource, "is_dynamic", False)
+        is_dynamic = db_resource.is_dynamic
 
         # Dynamic resources have no pre-loaded content
         if is_dynamic:
             content = ""
+        elif db_resource.status != "ready":
+            # The file never reached storage (or has not yet), so only the
+            # extracted text is available
+            content = db_resource.extracted_text or ""
         else:
             # Download content from storage
             try:
@@ -322,7 +326,8 @@ async def get_kit_info_from_db(slug: str) -> dict | None:
                         "filename": r.filename,
                         "mime_type": r.mime_type,
                         "file_size_bytes": r.file_size_bytes,
-                        "is_dynamic": getattr(r, "is_dynamic", False),
+                        "is_dynamic": r.is_dynamic,
+                        "status": r.status,
                     }
                     for r in version.resources
                 ],
@@ -7,12 +7,17 @@ Reads configuration from mcp_servers.json in the current working directory.
 import json
 import logging
 import os
+import uuid
 from contextlib import AsyncExitStack
 from typing import Any
 
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
+from sqlalchemy import select
 
+from openclerk.db import get_async_session
+from openclerk.db.config import get_config
+from openclerk.db.models import McpServerConfig
 from openclerk.tools import ToolDefinition, clear_mcp_tools, register_tool
 
 logger = logging.getLogger(__name__)
@@ -179,17 +184,8 @@ async def init_mcp_servers(
 
                         # Per-user overrides are only meaningful for stdio transport
                         if user_id and cfg.get("transport", "stdio") == "stdio":
-                            from openclerk.db.config import get_config
-
                             if get_config().is_database_configured:
                                 try:
-                                    import uuid
-
-                                    from sqlalchemy import select
-
-                                    from openclerk.db import get_async_session
-                                    from openclerk.db.models import McpServerConfig
-
                                     async with get_async_session() as db_session:
                                         stmt = select(McpServerConfig).where(
                                             McpServerConfig.user_id == uuid.UUID(user_id),
@@ -1,6 +1,8 @@
 """Data models for reasoning kits."""
 
-from pydantic import BaseModel, ConfigDict
+from functools import cached_property
+
+from pydantic import BaseModel, ConfigDict, field_validator
 
 
 class Resource(BaseModel):
@@ -37,9 +39,40 @@ class ReasoningKit(BaseModel):
     name: str
     path: str
     resources: dict[str, Resource]
-    workflow: dict[str, WorkflowStep]
+    workflow: dict[str, WorkflowStep]  # step number -> step, kept in step order
     tools: dict[str, Tool] = {}  # tool_number -> Tool
 
+    @field_validator("workflow")
+    @classmethod
+    def _order_workflow(cls, workflow: dict[str, WorkflowStep]) -> dict[str, WorkflowStep]:
+        """Order steps numerically once, so callers can iterate the dict as-is."""
+        return dict(sorted(workflow.items(), key=lambda item: int(item[0])))
+
+    @cached_property
+    def ordered_steps(self) -> list[tuple[int, WorkflowStep]]:
+        """Workflow steps as (step number, step) pairs in execution order.
+
+        Computed once per kit; kits are not modified after they are loaded.
+        """
+        return [(int(key), step) for key, step in self.workflow.items()]
+
+    @cached_property
+    def tool_metadata(self) -> dict[str, dict[str, str | None]]:
+        """Tool fields used to resolve tool placeholders, keyed by tool number.
+
+        Computed once per kit and shared between runs, so callers must not
+        modify it.
+        """
+        return {
+            key: {
+                "tool_name": tool.tool_name,
+                "tool_id": tool.tool_id,
+                "display_name": tool.display_name,
+                "configuration": tool.configuration,
+            }
+            for key, tool in self.tools.items()
+        }
+
 
 class StepEvaluation(BaseModel):
     """Evaluation data for a single workflow step."""
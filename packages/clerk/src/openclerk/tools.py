@@ -12,6 +12,9 @@ Tools follow the OpenAI function-calling pattern:
 from dataclasses import dataclass
 from typing import Any, Awaitable, Callable
 
+import httpx
+from bs4 import BeautifulSoup
+
 
 @dataclass
 class ToolDefinition:
@@ -30,10 +33,16 @@ class ToolDefinition:
 
 TOOL_REGISTRY: dict[str, ToolDefinition] = {}
 
+# JSON summaries of the registered tools grouped by source, rebuilt lazily
+# after the registry changes
+_summaries_by_source: dict[str, list[dict[str, Any]]] | None = None
+
 
 def register_tool(tool: ToolDefinition) -> None:
     """Register a tool in the global registry."""
+    global _summaries_by_source
     TOOL_REGISTRY[tool.name] = tool
+    _summaries_by_source = None
 
 
 def get_tool(name: str) -> ToolDefinition | None:
@@ -46,11 +55,35 @@ def list_tools() -> list[ToolDefinition]:
     return list(TOOL_REGISTRY.values())
 
 
+def list_tool_summaries_by_source() -> dict[str, list[dict[str, Any]]]:
+    """Return the name, description and source of every tool.
+
+    Parameter schemas are left out; they can be large and are looked up per
+    tool when needed. Summaries are grouped by source in registry order and
+    cached until the registry changes, so callers must not mutate them.
+    """
+    global _summaries_by_source
+    if _summaries_by_source is None:
+        summaries: dict[str, list[dict[str, Any]]] = {}
+        for tool in TOOL_REGISTRY.values():
+            summaries.setdefault(tool.source, []).append(
+                {
+                    "name": tool.name,
+                    "description": tool.description,
+                    "source": tool.source,
+                }
+            )
+        _summaries_by_source = summaries
+    return _summaries_by_source
+
+
 def clear_mcp_tools() -> None:
     """Remove all non-builtin tools from the global registry."""
+    global _summaries_by_source
     mcp_names = [n for n, t in TOOL_REGISTRY.items() if t.source != "builtin"]
     for n in mcp_names:
         del TOOL_REGISTRY[n]
+    _summaries_by_source = None
 
 
 def get_openai_tool_schema(name: str) -> dict[str, Any] | None:
@@ -84,9 +117,6 @@ async def _read_url(args: dict[str, Any]) -> str:
     Falls back to raw text for non-HTML responses.
     If SSL verification fails, retries without verification.
     """
-    import httpx
-    from bs4 import BeautifulSoup
-
     url = args.get("url", "")
     if not url:
         return "Error: No URL provided."
@@ -156,8 +186,6 @@ async def _jina_reader(args: dict[str, Any]) -> str:
 
     Uses httpx to hit https://r.jina.ai/{url}.
     """
-    import httpx
-
     url = args.get("url", "")
     if not url:
         return "Error: No URL provided."
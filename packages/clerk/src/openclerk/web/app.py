@@ -1,5 +1,6 @@
 """FastAPI application factory for OpenClerk API."""
 
+import asyncio
 import os
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
@@ -7,10 +8,13 @@ from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from starlette.middleware.sessions import SessionMiddleware
 from starlette.types import ASGIApp, Receive, Scope, Send
 
 from openclerk.db.config import close_engines, get_config, init_engines
+from openclerk.llm_factory import close_http_client
 from openclerk.mcp_client import close_mcp_servers, init_mcp_servers
 
 
@@ -28,9 +32,15 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         else []
     )
     await init_mcp_servers(extra_kit_config_paths=kit_mcp_paths or None)
+
+    from openclerk.web.routes.api import sweep_executions
+
+    execution_sweeper = asyncio.create_task(sweep_executions())
     yield
     # Cleanup
+    execution_sweeper.cancel()
     await close_mcp_servers()
+    await close_http_client()
     await close_engines()
 
 
@@ -63,6 +73,7 @@ def create_app() -> FastAPI:
         docs_url="/docs" if os.getenv("ENV") == "development" else None,
         redoc_url="/redoc" if os.getenv("ENV") == "development" else None,
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
     )
 
     # CORS middleware for web frontend (add first - runs last/wraps everything)
@@ -74,6 +85,10 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    # Compress JSON responses. The SSE execution stream compresses itself (with a
+    # sync flush per chunk) and sets Content-Encoding, so this middleware skips it.
+    app.add_middleware(GZipMiddleware, minimum_size=512)
+
     # Auth state middleware - copies session user to request.state
     # Must be added before SessionMiddleware so it runs AFTER SessionMiddleware
     app.add_middleware(AuthStateMiddleware)
@@ -6,7 +6,7 @@ from fastapi import Depends, HTTPException, Request
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from ..db.config import get_async_session, get_config
+from ..db.config import get_async_session, get_config, get_supabase_client
 
 security = HTTPBearer(auto_error=False)
 
@@ -42,8 +42,6 @@ def get_optional_user(
     if credentials and credentials.scheme.lower() == "bearer":
         token = credentials.credentials
         try:
-            from ..db.config import get_supabase_client
-
             client = get_supabase_client()
             if client:
                 # Verify the JWT token with Supabase
@@ -92,6 +90,4 @@ async def get_supabase_auth():
     if not config.is_configured:
         return None
 
-    from ..db.config import get_supabase_client
-
     return get_supabase_client()
@@ -0,0 +1,115 @@
+"""State store for in-flight kit executions.
+
+An execution is started with ``POST /kits/{slug}/execute`` and consumed by the
+SSE stream endpoint, so its state has to live somewhere between the two
+requests. ``ExecutionStore`` is the single place that owns that state; the
+routes only talk to it through ``get``/``set``/``pop``.
+"""
+
+import asyncio
+import time
+from typing import Any
+
+# Executions that are never streamed (or never finish) are dropped after this.
+DEFAULT_EXECUTION_TTL = 3600.0
+# Upper bound on tracked executions; the oldest are evicted beyond this.
+DEFAULT_MAX_EXECUTIONS = 1024
+# Upper bound on idle events kept for reuse.
+DEFAULT_MAX_IDLE_EVENTS = 1024
+# How often ``run_sweeper`` drops expired executions.
+DEFAULT_SWEEP_INTERVAL = 60.0
+
+
+class ExecutionStore:
+    """Process-local execution state keyed by execution id, with expiry.
+
+    The state dicts hold live objects (the loaded kit and the ``asyncio.Event``
+    used to hand evaluation scores to the stream), so they are kept in memory
+    rather than serialized to an external store. Entries expire ``ttl``
+    seconds after they were stored, and at most ``maxsize`` entries are kept so
+    abandoned executions cannot grow the store without bound.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_EXECUTION_TTL,
+        maxsize: int = DEFAULT_MAX_EXECUTIONS,
+    ) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._entries: dict[str, tuple[float, dict[str, Any]]] = {}
+
+    def get(self, execution_id: str) -> dict[str, Any] | None:
+        """Return the state for an execution, or None if missing or expired."""
+        entry = self._entries.get(execution_id)
+        if entry is None:
+            return None
+        expires_at, state = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(execution_id, None)
+            return None
+        return state
+
+    def set(self, execution_id: str, state: dict[str, Any]) -> None:
+        """Store the state for an execution, resetting its expiry."""
+        now = time.monotonic()
+        # Re-insert so entries stay ordered by expiry, oldest first
+        self._entries.pop(execution_id, None)
+        self._entries[execution_id] = (now + self.ttl, state)
+        self._evict(now)
+
+    def pop(self, execution_id: str, default: Any = None) -> dict[str, Any] | None:
+        """Remove an execution and return its state."""
+        entry = self._entries.pop(execution_id, None)
+        return entry[1] if entry is not None else default
+
+    def sweep(self) -> None:
+        """Drop expired entries now rather than on the next ``set``."""
+        self._evict(time.monotonic())
+
+    async def run_sweeper(self, interval: float = DEFAULT_SWEEP_INTERVAL) -> None:
+        """Sweep expired entries every ``interval`` seconds until cancelled.
+
+        Without it, executions abandoned before streaming keep their loaded
+        kits in memory until another execution is started.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            self.sweep()
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, then the oldest ones while over ``maxsize``."""
+        while self._entries:
+            oldest_id = next(iter(self._entries))
+            expires_at, _ = self._entries[oldest_id]
+            if expires_at > now and len(self._entries) <= self.maxsize:
+                break
+            del self._entries[oldest_id]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class EventPool:
+    """Free list of ``asyncio.Event`` objects reused across evaluated executions.
+
+    Each evaluated execution needs one event to hand scores to its stream.
+    Released events are cleared on reuse; at most ``maxsize`` idle events are kept.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MAX_IDLE_EVENTS) -> None:
+        self.maxsize = maxsize
+        self._free: list[asyncio.Event] = []
+
+    def acquire(self) -> asyncio.Event:
+        """Return a cleared event, reusing an idle one when available."""
+        if not self._free:
+            return asyncio.Event()
+        event = self._free.pop()
+        event.clear()
+        return event
+
+    def release(self, event: asyncio.Event) -> None:
+        """Return an event to the pool once its execution is finished."""
+        if len(self._free) < self.maxsize:
+            self._free.append(event)
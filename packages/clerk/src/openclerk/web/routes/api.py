@@ -4,41 +4,198 @@ Handles kit CRUD operations, resource/step management, execution streaming, and
 """
 
 import asyncio
-import json
+import hashlib
+import io
 import logging
+import os
 import re
+import shutil
+import tempfile
 import time
+import uuid
+import zlib
+from collections.abc import AsyncGenerator, AsyncIterator, Iterable
 from pathlib import Path
-from typing import Any
+from typing import Any, NamedTuple
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, File, Form, Request, UploadFile
-from fastapi.responses import JSONResponse, StreamingResponse
+import orjson
+from fastapi import APIRouter, BackgroundTasks, Depends, File, Form, Request, UploadFile
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+from langchain_core.messages import HumanMessage, ToolMessage
+from sqlalchemy import select, update
+from sqlalchemy.exc import SQLAlchemyError
 from starlette.datastructures import UploadFile as StarletteUploadFile
 
+from ...cli import resolve_kit_path
+from ...db import (
+    BookmarkRepository,
+    ExecutionRepository,
+    KitVersionRepository,
+    ReasoningKitRepository,
+    StorageService,
+    detect_mime_type_from_filename,
+    extract_text,
+    extract_text_from_bytes,
+    extract_text_from_file,
+    get_async_session,
+)
+from ...db.config import get_config, get_supabase_client
+from ...db.models import LlmProviderConfig, McpServerConfig
+from ...evaluation import (
+    complete_execution_run,
+    create_execution_run,
+    pause_execution_run,
+    save_steps_to_db,
+    update_step_evaluation_in_db,
+)
+from ...graph import (
+    DEFAULT_MODEL,
+    extract_tool_refs,
+    message_text,
+    plan_step_waves,
+    remove_tool_placeholders,
+    resolve_placeholders,
+)
+from ...llm_factory import get_llm, invalidate_provider_config
+from ...loader import (
+    LoadedKit,
+    list_reasoning_kits,
+    load_reasoning_kit,
+    load_reasoning_kit_from_db,
+)
+from ...tools import get_tool, list_tool_summaries_by_source
 from ..dependencies import get_optional_user
+from ..execution_store import EventPool, ExecutionStore
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
+_FORM_CONTENT_TYPES = ("multipart/form-data", "application/x-www-form-urlencoded")
+_SLUG_SEPARATOR_RE = re.compile(r"[^a-z0-9]+")
+_RESOURCE_FILE_RE = re.compile(r"resource_(\d+)\.")
+_INSTRUCTION_FILE_RE = re.compile(r"instruction_(\d+)\.txt")
 
-def _check_auth(user: dict | None) -> JSONResponse | None:
+
+def _kit_file_names(kit_path: Path, prefix: str) -> list[str]:
+    """Return the names of the regular files in ``kit_path`` starting with ``prefix``.
+
+    Uses ``os.scandir`` so each entry's name and type come from the directory
+    listing itself rather than a ``Path`` object and stat per file.
+    """
+    try:
+        with os.scandir(kit_path) as entries:
+            return [e.name for e in entries if e.name.startswith(prefix) and e.is_file()]
+    except FileNotFoundError:
+        return []
+
+
+def _next_file_number(names: Iterable[str], pattern: re.Pattern[str]) -> int:
+    """Return one past the highest number ``pattern`` captures from ``names``."""
+    numbers = (int(match.group(1)) for name in names if (match := pattern.match(name)))
+    return max(numbers, default=0) + 1
+
+
+async def _read_json(request: Request) -> Any:
+    """Parse the request body as JSON with orjson.
+
+    Raises ``orjson.JSONDecodeError`` (a ``ValueError``) on malformed bodies,
+    like ``request.json()`` does with the stdlib decoder.
+    """
+    return orjson.loads(await request.body())
+
+
+def _check_auth(user: dict | None) -> ORJSONResponse | None:
     """Return a 401 JSON response if user is not logged in, else None."""
     if not user:
-        return JSONResponse({"ok": False, "error": "Sign in to manage kits."}, status_code=401)
+        return ORJSONResponse({"ok": False, "error": "Sign in to manage kits."}, status_code=401)
     return None
 
 
-def _check_kit_ownership(db_kit, user: dict | None) -> JSONResponse | None:
+def _check_kit_ownership(db_kit, user: dict | None) -> ORJSONResponse | None:
     """Return a 403 JSON response if user doesn't own the kit, else None."""
     if db_kit.owner_id and (not user or str(db_kit.owner_id) != user["id"]):
-        return JSONResponse(
+        return ORJSONResponse(
             {"ok": False, "error": "You don't have permission to modify this kit."},
             status_code=403,
         )
     return None
 
 
+class _KitRef(NamedTuple):
+    """Identifying columns of a kit — enough for ownership checks and versioning."""
+
+    id: UUID
+    owner_id: UUID | None
+    current_version_id: UUID | None
+    is_public: bool
+
+
+# Short-lived slug -> _KitRef cache so bursts of edits from the UI skip the
+# kit lookup. Entries are dropped on every write to the kit.
+_KIT_REF_TTL = 1.0
+_KIT_REF_MAXSIZE = 4096
+_kit_ref_cache: dict[str, tuple[float, _KitRef]] = {}
+
+
+async def _get_kit_ref(kit_repo, slug: str) -> _KitRef | None:
+    """Return the cached ref for a kit slug, querying the database on a miss."""
+    now = time.monotonic()
+    cached = _kit_ref_cache.get(slug)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    row = await kit_repo.get_ref_by_slug(slug)
+    if row is None:
+        _kit_ref_cache.pop(slug, None)
+        return None
+
+    if len(_kit_ref_cache) >= _KIT_REF_MAXSIZE:
+        for key in [k for k, (expires, _) in _kit_ref_cache.items() if expires <= now]:
+            del _kit_ref_cache[key]
+        if len(_kit_ref_cache) >= _KIT_REF_MAXSIZE:
+            _kit_ref_cache.pop(next(iter(_kit_ref_cache)))
+
+    kit_ref = _KitRef(*row)
+    _kit_ref_cache[slug] = (now + _KIT_REF_TTL, kit_ref)
+    return kit_ref
+
+
+def _invalidate_kit_ref(slug: str) -> None:
+    """Drop the cached ref for a kit, and the kit list, after it has been modified."""
+    _kit_ref_cache.pop(slug, None)
+    _invalidate_kit_list()
+
+
+async def _get_owned_kit_ref(
+    kit_repo, slug: str, user: dict | None, require_version: bool = False
+) -> _KitRef | ORJSONResponse:
+    """Look up a kit the user may modify.
+
+    Combines the (cached) kit lookup with the 404 and ownership checks every
+    write handler needs.
+
+    Args:
+        kit_repo: Repository to query on a cache miss
+        slug: The kit's slug
+        user: The signed-in user, if any
+        require_version: Also answer 404 if the kit has no current version
+
+    Returns:
+        The kit's ref, or an error response if the kit is missing or owned by
+        someone else
+    """
+    kit_ref = await _get_kit_ref(kit_repo, slug)
+    if not kit_ref or (require_version and not kit_ref.current_version_id):
+        error = "Kit or version not found." if require_version else f"Kit '{slug}' not found."
+        return ORJSONResponse({"ok": False, "error": error}, status_code=404)
+
+    own_err = _check_kit_ownership(kit_ref, user)
+    if own_err:
+        return own_err
+    return kit_ref
+
+
 # =============================================================================
 # KIT CRUD
 # =============================================================================
@@ -55,34 +212,30 @@ async def create_kit(
         return auth_err
 
     try:
-        body = await request.json()
+        body = await _read_json(request)
     except Exception:
-        return JSONResponse({"ok": False, "error": "Invalid JSON body"}, status_code=400)
+        return ORJSONResponse({"ok": False, "error": "Invalid JSON body"}, status_code=400)
 
     name = body.get("name", "").strip()
     description = body.get("description", "").strip()
     if not name:
-        return JSONResponse({"ok": False, "error": "Kit name is required."}, status_code=400)
+        return ORJSONResponse({"ok": False, "error": "Kit name is required."}, status_code=400)
 
-    slug = re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")
+    slug = _SLUG_SEPARATOR_RE.sub("-", name.lower()).strip("-")
     if not slug:
-        return JSONResponse({"ok": False, "error": "Invalid kit name."}, status_code=400)
-
-    from ...db.config import get_config
+        return ORJSONResponse({"ok": False, "error": "Invalid kit name."}, status_code=400)
 
     config = get_config()
     if config.is_database_configured:
         try:
-            from ...db import ReasoningKitRepository, get_async_session
-
             owner_id = UUID(user["id"]) if user else None
 
             async with get_async_session() as session:
                 repo = ReasoningKitRepository(session)
 
-                existing = await repo.get_by_slug(slug)
+                existing = await repo.get_ref_by_slug(slug)
                 if existing:
-                    return JSONResponse(
+                    return ORJSONResponse(
                         {
                             "ok": False,
                             "error": f"A kit with slug '{slug}' already exists.",
@@ -98,22 +251,27 @@ async def create_kit(
                     is_public=True,
                 )
 
+            _invalidate_kit_list()
             return {"ok": True, "slug": slug}
 
         except Exception as e:
-            return JSONResponse({"ok": False, "error": f"Error creating kit: {e}"}, status_code=500)
+            return ORJSONResponse(
+                {"ok": False, "error": f"Error creating kit: {e}"}, status_code=500
+            )
     else:
         try:
             kit_path = Path("reasoning_kits") / slug
             if kit_path.exists():
-                return JSONResponse(
+                return ORJSONResponse(
                     {"ok": False, "error": f"Kit '{slug}' already exists."},
                     status_code=409,
                 )
             kit_path.mkdir(parents=True)
             return {"ok": True, "slug": slug}
         except Exception as e:
-            return JSONResponse({"ok": False, "error": f"Error creating kit: {e}"}, status_code=500)
+            return ORJSONResponse(
+                {"ok": False, "error": f"Error creating kit: {e}"}, status_code=500
+            )
 
 
 @router.put("/kits/{slug}")
@@ -128,45 +286,36 @@ async def update_kit(
         return auth_err
 
     try:
-        body = await request.json()
+        body = await _read_json(request)
     except Exception:
-        return JSONResponse({"ok": False, "error": "Invalid JSON body"}, status_code=400)
+        return ORJSONResponse({"ok": False, "error": "Invalid JSON body"}, status_code=400)
 
     name = body.get("name", "").strip()
     description = body.get("description", "").strip()
 
-    from ...db.config import get_config
-
     config = get_config()
     if config.is_database_configured:
         try:
-            from ...db import ReasoningKitRepository, get_async_session
-
             async with get_async_session() as session:
                 repo = ReasoningKitRepository(session)
-                db_kit = await repo.get_by_slug(slug)
-
-                if not db_kit:
-                    return JSONResponse(
-                        {"ok": False, "error": f"Kit '{slug}' not found."},
-                        status_code=404,
-                    )
-
-                own_err = _check_kit_ownership(db_kit, user)
-                if own_err:
-                    return own_err
+                kit_ref = await _get_owned_kit_ref(repo, slug, user)
+                if isinstance(kit_ref, ORJSONResponse):
+                    return kit_ref
 
                 await repo.update(
-                    kit_id=db_kit.id,
+                    kit_id=kit_ref.id,
                     name=name,
                     description=description or None,
                 )
 
+            _invalidate_kit_ref(slug)
             return {"ok": True}
         except Exception as e:
-            return JSONResponse({"ok": False, "error": f"Error updating kit: {e}"}, status_code=500)
+            return ORJSONResponse(
+                {"ok": False, "error": f"Error updating kit: {e}"}, status_code=500
+            )
 
-    return JSONResponse({"ok": False, "error": "Database not configured"}, status_code=500)
+    return ORJSONResponse({"ok": False, "error": "Database not configured"}, status_code=500)
 
 
 @router.delete("/kits/{slug}")
@@ -180,41 +329,32 @@ async def delete_kit(
     if auth_err:
         return auth_err
 
-    from ...db.config import get_config
-
     config = get_config()
     if config.is_database_configured:
         try:
-            from ...db import ReasoningKitRepository, get_async_session
-
             async with get_async_session() as session:
                 repo = ReasoningKitRepository(session)
-                db_kit = await repo.get_by_slug(slug)
-
-                if not db_kit:
-                    return JSONResponse(
-                        {"ok": False, "error": f"Kit '{slug}' not found."},
-                        status_code=404,
-                    )
-
-                own_err = _check_kit_ownership(db_kit, user)
-                if own_err:
-                    return own_err
+                kit_ref = await _get_owned_kit_ref(repo, slug, user)
+                if isinstance(kit_ref, ORJSONResponse):
+                    return kit_ref
 
-                await repo.delete(db_kit.id)
+                await repo.delete(kit_ref.id)
 
+            _invalidate_kit_ref(slug)
             return {"ok": True}
         except Exception as e:
-            return JSONResponse({"ok": False, "error": f"Error deleting kit: {e}"}, status_code=500)
+            return ORJSONResponse(
+                {"ok": False, "error": f"Error deleting kit: {e}"}, status_code=500
+            )
     else:
-        import shutil
-
         kit_path = Path("reasoning_kits") / slug
         if kit_path.exists():
             shutil.rmtree(kit_path)
             return {"ok": True}
         else:
-            return JSONResponse({"ok": False, "error": f"Kit '{slug}' not found."}, status_code=404)
+            return ORJSONResponse(
+                {"ok": False, "error": f"Kit '{slug}' not found."}, status_code=404
+            )
 
 
 # =============================================================================
@@ -222,9 +362,170 @@ async def delete_kit(
 # =============================================================================
 
 
+_UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+def _write_source(source: bytes | UploadFile, out) -> None:
+    """Write resource content to an open binary file.
+
+    Uploads that Starlette has already rolled over to a temporary file on disk
+    are copied in the kernel with ``os.sendfile``. Small in-memory uploads, and
+    platforms without file-to-file ``sendfile``, are copied in fixed-size
+    chunks, so the full upload is never held in memory twice.
+    """
+    if isinstance(source, bytes):
+        out.write(source)
+        return
+
+    src = source.file
+    src.seek(0)
+    if getattr(src, "_rolled", True):
+        try:
+            out.flush()
+            in_fd, out_fd = src.fileno(), out.fileno()
+            offset, size = 0, os.fstat(in_fd).st_size
+            while offset < size:
+                sent = os.sendfile(out_fd, in_fd, offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+            return
+        except (AttributeError, OSError, io.UnsupportedOperation):
+            src.seek(0)
+            out.seek(0)
+            out.truncate()
+    shutil.copyfileobj(src, out, _UPLOAD_CHUNK_SIZE)
+
+
+def _spool_to_tempfile(source: bytes | UploadFile, suffix: str) -> Path:
+    """Write resource content to a new temporary file and return its path."""
+    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+        _write_source(source, tmp)
+    return Path(tmp.name)
+
+
+def _spool_and_extract(
+    source: UploadFile, suffix: str, mime_type: str
+) -> tuple[Path, str | None, int]:
+    """Spool an upload to a temporary file and extract its text.
+
+    Both steps block, so they run back to back in a single worker thread.
+    The temporary file is removed if extraction fails.
+
+    Returns:
+        Tuple of (temporary_file_path, extracted_text, file_size_bytes)
+    """
+    tmp_path = _spool_to_tempfile(source, suffix)
+    try:
+        return tmp_path, extract_text(tmp_path, mime_type), tmp_path.stat().st_size
+    except Exception:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
+class _DeferredUpload(NamedTuple):
+    """Resource content waiting to be uploaded once its version is committed."""
+
+    storage: Any
+    kit_id: UUID
+    version_id: UUID
+    filename: str
+    source: bytes | Path
+    mime_type: str
+
+    async def upload(self) -> None:
+        """Upload the content to storage and record the resource's status.
+
+        Runs as a background task once the response has been sent. The rows
+        stay 'pending' until the upload finishes and become 'failed' if it
+        does not, so kit pages and ``clerk pull`` can report it. The
+        temporary file is removed either way.
+        """
+        try:
+            await asyncio.to_thread(self._store)
+        except Exception:
+            logger.exception("Background upload of resource %s failed", self.filename)
+            status = "failed"
+        else:
+            status = "ready"
+        finally:
+            self.discard()
+
+        storage_path = self.storage.resource_path(self.kit_id, self.version_id, self.filename)
+        try:
+            async with get_async_session() as session:
+                version_ids = await KitVersionRepository(session).set_resource_status(
+                    storage_path, status
+                )
+        except Exception:
+            logger.exception("Could not record status of resource %s", self.filename)
+            return
+        # Kits loaded while the upload was pending used the extracted text
+        for version_id in version_ids:
+            _loaded_kit_cache.pop(version_id, None)
+
+    def _store(self) -> None:
+        """Upload the content with the blocking storage client."""
+        if isinstance(self.source, bytes):
+            self.storage.upload_resource_bytes(
+                kit_id=self.kit_id,
+                version_id=self.version_id,
+                filename=self.filename,
+                content=self.source,
+                content_type=self.mime_type,
+            )
+        else:
+            self.storage.upload_resource(
+                kit_id=self.kit_id,
+                version_id=self.version_id,
+                filename=self.filename,
+                file_path=self.source,
+                content_type=self.mime_type,
+            )
+
+    def discard(self) -> None:
+        """Remove the spooled temporary file, if any, without uploading."""
+        if isinstance(self.source, Path):
+            self.source.unlink(missing_ok=True)
+
+
+async def _extract_for_upload(
+    storage,
+    kit_id: UUID,
+    version_id: UUID,
+    filename: str,
+    source: bytes | UploadFile,
+    mime_type: str,
+) -> tuple[str, str | None, int, _DeferredUpload]:
+    """Extract a resource's text now and prepare its upload for later.
+
+    Extraction runs in a worker thread because the resource row needs its
+    result. The storage path is deterministic, so the upload itself can wait:
+    callers queue it as a background task once the session has committed, or
+    discard it when the request fails, so no object is stored for a version
+    that was rolled back. Uploaded files are spooled to a temporary file off
+    the event loop first; the upload removes it when done.
+
+    Returns:
+        Tuple of (storage_path, extracted_text, file_size_bytes, deferred_upload)
+    """
+    if isinstance(source, bytes):
+        extracted = await asyncio.to_thread(extract_text_from_bytes, source, mime_type)
+        file_size = len(source)
+        upload_source: bytes | Path = source
+    else:
+        upload_source, extracted, file_size = await asyncio.to_thread(
+            _spool_and_extract, source, Path(filename).suffix, mime_type
+        )
+
+    upload = _DeferredUpload(storage, kit_id, version_id, filename, upload_source, mime_type)
+    return storage.resource_path(kit_id, version_id, filename), extracted, file_size, upload
+
+
 @router.post("/kits/{slug}/resources")
 async def add_resource(
     request: Request,
+    background_tasks: BackgroundTasks,
     slug: str,
     file: UploadFile | None = File(None),
     text_content: str = Form(""),
@@ -237,38 +538,28 @@ async def add_resource(
     if auth_err:
         return auth_err
 
-    from ...db.config import get_config
-
     config = get_config()
     if config.is_database_configured:
+        upload: _DeferredUpload | None = None
         try:
-            from ...db import (
-                KitVersionRepository,
-                ReasoningKitRepository,
-                StorageService,
-                detect_mime_type_from_filename,
-                extract_text_from_bytes,
-                get_async_session,
-            )
-
             if text_content.strip():
-                file_content = text_content.encode("utf-8")
+                file_source: bytes | UploadFile = text_content.encode("utf-8")
                 safe_name = (display_name.strip() or "resource").replace(" ", "_")
                 filename = f"{safe_name}.txt"
                 mime_type = "text/plain"
             elif file and file.filename:
-                file_content = await file.read()
+                file_source = file
                 filename = file.filename
                 mime_type = detect_mime_type_from_filename(filename)
             elif is_dynamic:
                 # Dynamic resources have no pre-loaded content — the user
                 # supplies it at execution time.
-                file_content = b""
+                file_source = b""
                 safe_name = (display_name.strip() or "resource").replace(" ", "_")
                 filename = f"{safe_name}.txt"
                 mime_type = "text/plain"
             else:
-                return JSONResponse(
+                return ORJSONResponse(
                     {
                         "ok": False,
                         "error": "Please upload a file or paste text content.",
@@ -279,81 +570,28 @@ async def add_resource(
             async with get_async_session() as session:
                 kit_repo = ReasoningKitRepository(session)
                 version_repo = KitVersionRepository(session)
-                db_kit = await kit_repo.get_by_slug(slug)
-
-                if not db_kit:
-                    return JSONResponse(
-                        {"ok": False, "error": f"Kit '{slug}' not found."},
-                        status_code=404,
-                    )
+                kit_ref = await _get_owned_kit_ref(kit_repo, slug, user)
+                if isinstance(kit_ref, ORJSONResponse):
+                    return kit_ref
 
-                own_err = _check_kit_ownership(db_kit, user)
-                if own_err:
-                    return own_err
-
-                resource_number = 1
-                if db_kit.current_version and db_kit.current_version.resources:
-                    resource_number = (
-                        max(r.resource_number for r in db_kit.current_version.resources) + 1
-                    )
+                resource_number, _, _ = await version_repo.get_next_item_numbers(
+                    kit_ref.current_version_id
+                )
 
                 commit_msg = f"Added resource: {filename}"
-                version = await version_repo.create(
-                    kit_id=db_kit.id,
-                    commit_message=commit_msg,
+                version = await version_repo.create_from(
+                    kit_ref.id, kit_ref.current_version_id, commit_message=commit_msg
                 )
 
-                if db_kit.current_version:
-                    old_version = db_kit.current_version
-                    resources_to_add = []
-                    for r in old_version.resources:
-                        resources_to_add.append(
-                            {
-                                "version_id": version.id,
-                                "resource_number": r.resource_number,
-                                "filename": r.filename,
-                                "storage_path": r.storage_path,
-                                "mime_type": r.mime_type,
-                                "extracted_text": r.extracted_text,
-                                "file_size_bytes": r.file_size_bytes,
-                                "is_dynamic": getattr(r, "is_dynamic", False),
-                                "display_name": r.display_name,
-                            }
-                        )
-                    if resources_to_add:
-                        await version_repo.add_resources(resources_to_add)
-
-                    steps_to_add = []
-                    for s in old_version.workflow_steps:
-                        steps_to_add.append(
-                            {
-                                "version_id": version.id,
-                                "step_number": s.step_number,
-                                "prompt_template": s.prompt_template,
-                                "display_name": s.display_name,
-                            }
-                        )
-                    if steps_to_add:
-                        await version_repo.add_workflow_steps(steps_to_add)
-
                 storage = StorageService(use_service_key=True)
-                import tempfile
-
-                with tempfile.NamedTemporaryFile(delete=False, suffix=Path(filename).suffix) as tmp:
-                    tmp.write(file_content)
-                    tmp_path = Path(tmp.name)
-
-                try:
-                    storage_path = storage.upload_resource(
-                        kit_id=db_kit.id,
-                        version_id=version.id,
-                        filename=f"resource_{resource_number}{Path(filename).suffix}",
-                        file_path=tmp_path,
-                    )
-                finally:
-                    tmp_path.unlink(missing_ok=True)
-
-                extracted = extract_text_from_bytes(file_content, mime_type)
+                storage_path, extracted, file_size, upload = await _extract_for_upload(
+                    storage,
+                    kit_id=kit_ref.id,
+                    version_id=version.id,
+                    filename=f"resource_{resource_number}{Path(filename).suffix}",
+                    source=file_source,
+                    mime_type=mime_type,
+                )
 
                 await version_repo.add_resource(
                     version_id=version.id,
@@ -362,44 +600,45 @@ async def add_resource(
                     storage_path=storage_path,
                     mime_type=mime_type,
                     extracted_text=extracted,
-                    file_size_bytes=len(file_content),
+                    file_size_bytes=file_size,
                     is_dynamic=bool(is_dynamic),
                     display_name=display_name.strip() or None,
+                    status="pending",
                 )
 
+            # The version is committed now, so its file can be uploaded
+            if upload:
+                background_tasks.add_task(upload.upload)
+            _invalidate_kit_ref(slug)
             return {"ok": True}
 
         except Exception as e:
-            return JSONResponse(
+            if upload:
+                upload.discard()
+            return ORJSONResponse(
                 {"ok": False, "error": f"Error adding resource: {e}"}, status_code=500
             )
     else:
         try:
             kit_path = Path("reasoning_kits") / slug
             if not kit_path.exists():
-                return JSONResponse(
+                return ORJSONResponse(
                     {"ok": False, "error": f"Kit '{slug}' not found."}, status_code=404
                 )
 
-            existing = list(kit_path.glob("resource_*.*"))
-            numbers = []
-            for f in existing:
-                match = re.search(r"resource_(\d+)\.", f.name)
-                if match:
-                    numbers.append(int(match.group(1)))
-            next_num = max(numbers, default=0) + 1
+            next_num = _next_file_number(_kit_file_names(kit_path, "resource_"), _RESOURCE_FILE_RE)
 
             if text_content.strip():
                 ext = ".txt"
-                content = text_content.encode("utf-8")
+                content: bytes | UploadFile = text_content.encode("utf-8")
             elif file and file.filename:
                 ext = Path(file.filename).suffix or ".txt"
-                content = await file.read()
+                content = file
             elif is_dynamic:
                 ext = ".txt"
                 content = b""
             else:
-                return JSONResponse(
+                return ORJSONResponse(
                     {
                         "ok": False,
                         "error": "Please upload a file or paste text content.",
@@ -408,11 +647,12 @@ async def add_resource(
                 )
 
             dest = kit_path / f"resource_{next_num}{ext}"
-            dest.write_bytes(content)
+            with dest.open("wb") as out:
+                await asyncio.to_thread(_write_source, content, out)
 
             return {"ok": True}
         except Exception as e:
-            return JSONResponse(
+            return ORJSONResponse(
                 {"ok": False, "error": f"Error adding resource: {e}"}, status_code=500
             )
 
@@ -429,101 +669,43 @@ async def delete_resource(
     if auth_err:
         return auth_err
 
-    from ...db.config import get_config
-
     config = get_config()
     if not config.is_database_configured:
         kit_path = Path("reasoning_kits") / slug
-        matches = list(kit_path.glob(f"resource_{number}.*"))
+        matches = _kit_file_names(kit_path, f"resource_{number}.")
         if matches:
-            matches[0].unlink()
+            (kit_path / matches[0]).unlink()
             return {"ok": True}
         else:
-            return JSONResponse(
+            return ORJSONResponse(
                 {"ok": False, "error": f"Resource {number} not found."}, status_code=404
             )
     else:
         try:
-            from ...db import (
-                KitVersionRepository,
-                ReasoningKitRepository,
-                get_async_session,
-            )
-
             async with get_async_session() as session:
                 kit_repo = ReasoningKitRepository(session)
                 version_repo = KitVersionRepository(session)
-                db_kit = await kit_repo.get_by_slug(slug)
+                kit_ref = await _get_owned_kit_ref(kit_repo, slug, user, require_version=True)
+                if isinstance(kit_ref, ORJSONResponse):
+                    return kit_ref
 
-                if not db_kit or not db_kit.current_version:
-                    return JSONResponse(
-                        {"ok": False, "error": "Kit or version not found."},
-                        status_code=404,
-                    )
-
-                own_err = _check_kit_ownership(db_kit, user)
-                if own_err:
-                    return own_err
-
-                version = await version_repo.create(
-                    kit_id=db_kit.id,
+                await version_repo.create_from(
+                    kit_ref.id,
+                    kit_ref.current_version_id,
                     commit_message=f"Deleted resource {number}",
+                    skip_resource=number,
                 )
 
-                resources_to_add = []
-                for r in db_kit.current_version.resources:
-                    if r.resource_number != number:
-                        resources_to_add.append(
-                            {
-                                "version_id": version.id,
-                                "resource_number": r.resource_number,
-                                "filename": r.filename,
-                                "storage_path": r.storage_path,
-                                "mime_type": r.mime_type,
-                                "extracted_text": r.extracted_text,
-                                "file_size_bytes": r.file_size_bytes,
-                                "is_dynamic": getattr(r, "is_dynamic", False),
-                                "display_name": r.display_name,
-                            }
-                        )
-                if resources_to_add:
-                    await version_repo.add_resources(resources_to_add)
-
-                steps_to_add = []
-                for s in db_kit.current_version.workflow_steps:
-                    steps_to_add.append(
-                        {
-                            "version_id": version.id,
-                            "step_number": s.step_number,
-                            "prompt_template": s.prompt_template,
-                            "display_name": s.display_name,
-                        }
-                    )
-                if steps_to_add:
-                    await version_repo.add_workflow_steps(steps_to_add)
-
-                tools_to_add = []
-                for t in db_kit.current_version.tools:
-                    tools_to_add.append(
-                        {
-                            "version_id": version.id,
-                            "tool_number": t.tool_number,
-                            "tool_name": t.tool_name,
-                            "display_name": t.display_name,
-                            "configuration": t.configuration,
-                        }
-                    )
-                if tools_to_add:
-                    await version_repo.add_tools(tools_to_add)
-
+            _invalidate_kit_ref(slug)
             return {"ok": True}
         except Exception as e:
-            return JSONResponse({"ok": False, "error": str(e)}, status_code=500)
+            return ORJSONResponse({"ok": False, "error": str(e)}, status_code=500)
 
 
 @router.post("/kits/{slug}/resources/{number}/update")
 async def update_resource(
     request: Request,
+    background_tasks: BackgroundTasks,
     slug: str,
     number: int,
     display_name: str = Form(""),
@@ -537,157 +719,83 @@ async def update_resource(
     if auth_err:
         return auth_err
 
-    from ...db.config import get_config
-
     config = get_config()
     if config.is_database_configured:
+        upload: _DeferredUpload | None = None
         try:
-            from ...db import (
-                KitVersionRepository,
-                ReasoningKitRepository,
-                StorageService,
-                detect_mime_type_from_filename,
-                extract_text_from_bytes,
-                get_async_session,
-            )
-
-            new_file_content = None
+            new_file_source: bytes | UploadFile | None = None
             new_filename = None
             if text_content.strip():
-                new_file_content = text_content.encode("utf-8")
+                new_file_source = text_content.encode("utf-8")
                 safe_name = (display_name.strip() or f"resource_{number}").replace(" ", "_")
                 new_filename = f"{safe_name}.txt"
             elif file and file.filename:
-                new_file_content = await file.read()
+                new_file_source = file
                 new_filename = file.filename
 
             async with get_async_session() as session:
                 kit_repo = ReasoningKitRepository(session)
                 version_repo = KitVersionRepository(session)
-                db_kit = await kit_repo.get_by_slug(slug)
-
-                if not db_kit or not db_kit.current_version:
-                    return JSONResponse(
-                        {"ok": False, "error": "Kit or version not found."},
-                        status_code=404,
-                    )
-
-                own_err = _check_kit_ownership(db_kit, user)
-                if own_err:
-                    return own_err
+                kit_ref = await _get_owned_kit_ref(kit_repo, slug, user, require_version=True)
+                if isinstance(kit_ref, ORJSONResponse):
+                    return kit_ref
+                source_version_id = kit_ref.current_version_id
+                assert source_version_id is not None  # ensured by require_version
 
                 version = await version_repo.create(
-                    kit_id=db_kit.id,
+                    kit_id=kit_ref.id,
                     commit_message=f"Updated resource {number}",
                 )
 
-                resources_to_add = []
-                for r in db_kit.current_version.resources:
-                    if r.resource_number == number:
-                        res_display_name = display_name.strip() or None
-                        res_is_dynamic = bool(is_dynamic)
-
-                        if new_file_content and new_filename:
-                            mime_type = detect_mime_type_from_filename(new_filename)
-                            extracted = extract_text_from_bytes(new_file_content, mime_type)
-
-                            storage = StorageService(use_service_key=True)
-                            import tempfile
-
-                            with tempfile.NamedTemporaryFile(
-                                delete=False, suffix=Path(new_filename).suffix
-                            ) as tmp:
-                                tmp.write(new_file_content)
-                                tmp_path = Path(tmp.name)
-
-                            try:
-                                storage_path = storage.upload_resource(
-                                    kit_id=db_kit.id,
-                                    version_id=version.id,
-                                    filename=f"resource_{number}{Path(new_filename).suffix}",
-                                    file_path=tmp_path,
-                                )
-                            finally:
-                                tmp_path.unlink(missing_ok=True)
-
-                            resources_to_add.append(
-                                {
-                                    "version_id": version.id,
-                                    "resource_number": number,
-                                    "filename": f"resource_{number}{Path(new_filename).suffix}",
-                                    "storage_path": storage_path,
-                                    "mime_type": mime_type,
-                                    "extracted_text": extracted,
-                                    "file_size_bytes": len(new_file_content),
-                                    "is_dynamic": res_is_dynamic,
-                                    "display_name": res_display_name,
-                                }
-                            )
-                        else:
-                            resources_to_add.append(
-                                {
-                                    "version_id": version.id,
-                                    "resource_number": r.resource_number,
-                                    "filename": r.filename,
-                                    "storage_path": r.storage_path,
-                                    "mime_type": r.mime_type,
-                                    "extracted_text": r.extracted_text,
-                                    "file_size_bytes": r.file_size_bytes,
-                                    "is_dynamic": res_is_dynamic,
-                                    "display_name": res_display_name,
-                                }
-                            )
-                    else:
-                        resources_to_add.append(
-                            {
-                                "version_id": version.id,
-                                "resource_number": r.resource_number,
-                                "filename": r.filename,
-                                "storage_path": r.storage_path,
-                                "mime_type": r.mime_type,
-                                "extracted_text": r.extracted_text,
-                                "file_size_bytes": r.file_size_bytes,
-                                "is_dynamic": getattr(r, "is_dynamic", False),
-                                "display_name": r.display_name,
-                            }
-                        )
-                if resources_to_add:
-                    await version_repo.add_resources(resources_to_add)
-
-                steps_to_add = []
-                for s in db_kit.current_version.workflow_steps:
-                    steps_to_add.append(
-                        {
-                            "version_id": version.id,
-                            "step_number": s.step_number,
-                            "prompt_template": s.prompt_template,
-                            "display_name": s.display_name,
-                        }
+                resource_patch: dict[str, Any] = {
+                    "is_dynamic": bool(is_dynamic),
+                    "display_name": display_name.strip() or None,
+                }
+                if (
+                    new_file_source
+                    and new_filename
+                    and await version_repo.has_resource(source_version_id, number)
+                ):
+                    mime_type = detect_mime_type_from_filename(new_filename)
+                    stored_filename = f"resource_{number}{Path(new_filename).suffix}"
+
+                    storage = StorageService(use_service_key=True)
+                    storage_path, extracted, file_size, upload = await _extract_for_upload(
+                        storage,
+                        kit_id=kit_ref.id,
+                        version_id=version.id,
+                        filename=stored_filename,
+                        source=new_file_source,
+                        mime_type=mime_type,
                     )
-                if steps_to_add:
-                    await version_repo.add_workflow_steps(steps_to_add)
-
-                tools_to_add = []
-                for t in db_kit.current_version.tools:
-                    tools_to_add.append(
-                        {
-                            "version_id": version.id,
-                            "tool_number": t.tool_number,
-                            "tool_name": t.tool_name,
-                            "display_name": t.display_name,
-                            "configuration": t.configuration,
-                        }
+                    resource_patch.update(
+                        filename=stored_filename,
+                        storage_path=storage_path,
+                        mime_type=mime_type,
+                        extracted_text=extracted,
+                        file_size_bytes=file_size,
+                        status="pending",
                     )
-                if tools_to_add:
-                    await version_repo.add_tools(tools_to_add)
 
+                await version_repo.copy_contents(
+                    source_version_id,
+                    version.id,
+                    patch_resource=(number, resource_patch),
+                )
+
+            # The version is committed now, so its file can be uploaded
+            if upload:
+                background_tasks.add_task(upload.upload)
+            _invalidate_kit_ref(slug)
             return {"ok": True}
         except Exception as e:
-            return JSONResponse(
+            if upload:
+                upload.discard()
+            return ORJSONResponse(
                 {"ok": False, "error": f"Error updating resource: {e}"}, status_code=500
             )
 
-    return JSONResponse({"ok": False, "error": "Database not configured"}, status_code=500)
+    return ORJSONResponse({"ok": False, "error": "Database not configured"}, status_code=500)
 
 
 # =============================================================================
@@ -707,99 +815,36 @@ async def add_step(
         return auth_err
 
     try:
-        body = await request.json()
+        body = await _read_json(request)
     except Exception:
-        return JSONResponse({"ok": False, "error": "Invalid JSON body"}, status_code=400)
+        return ORJSONResponse({"ok": False, "error": "Invalid JSON body"}, status_code=400)
 
     prompt = body.get("prompt_template", "") or body.get("prompt", "")
     display_name = body.get("display_name", "")
 
     if not prompt:
-        return JSONResponse({"ok": False, "error": "Prompt is required."}, status_code=400)
-
-    from ...db.config import get_config
+        return ORJSONResponse({"ok": False, "error": "Prompt is required."}, status_code=400)
 
     config = get_config()
     if config.is_database_configured:
         try:
-            from ...db import (
-                KitVersionRepository,
-                ReasoningKitRepository,
-                get_async_session,
-            )
-
             async with get_async_session() as session:
                 kit_repo = ReasoningKitRepository(session)
                 version_repo = KitVersionRepository(session)
-                db_kit = await kit_repo.get_by_slug(slug)
-
-                if not db_kit:
-                    return JSONResponse(
-                        {"ok": False, "error": f"Kit '{slug}' not found."},
-                        status_code=404,
-                    )
-
-                own_err = _check_kit_ownership(db_kit, user)
-                if own_err:
-                    return own_err
+                kit_ref = await _get_owned_kit_ref(kit_repo, slug, user)
+                if isinstance(kit_ref, ORJSONResponse):
+                    return kit_ref
 
-                step_number = 1
-                if db_kit.current_version and db_kit.current_version.workflow_steps:
-                    step_number = (
-                        max(s.step_number for s in db_kit.current_version.workflow_steps) + 1
-                    )
+                _, step_number, _ = await version_repo.get_next_item_numbers(
+                    kit_ref.current_version_id
+                )
 
-                version = await version_repo.create(
-                    kit_id=db_kit.id,
+                version = await version_repo.create_from(
+                    kit_ref.id,
+                    kit_ref.current_version_id,
                     commit_message=f"Added step {step_number}",
                 )
 
-                if db_kit.current_version:
-                    resources_to_add = []
-                    for r in db_kit.current_version.resources:
-                        resources_to_add.append(
-                            {
-                                "version_id": version.id,
-                                "resource_number": r.resource_number,
-                                "filename": r.filename,
-                                "storage_path": r.storage_path,
-                                "mime_type": r.mime_type,
-                                "extracted_text": r.extracted_text,
-                                "file_size_bytes": r.file_size_bytes,
-                                "is_dynamic": getattr(r, "is_dynamic", False),
-                                "display_name": r.display_name,
-                            }
-                        )
-                    if resources_to_add:
-                        await version_repo.add_resources(resources_to_add)
-
-                    steps_to_add = []
-                    for s in db_kit.current_version.workflow_steps:
-                        steps_to_add.append(
-                            {
-                                "version_id": version.id,
-                                "step_number": s.step_number,
-                                "prompt_template": s.prompt_template,
-                                "display_name": s.display_name,
-                            }
-                        )
-                    if steps_to_add:
-                        await version_repo.add_workflow_steps(steps_to_add)
-
-                    tools_to_add = []
-                    for t in db_kit.current_version.tools:
-                        tools_to_add.append(
-                            {
-                                "version_id": version.id,
-                                "tool_number": t.tool_number,
-                                "tool_name": t.tool_name,
-                                "display_name": t.display_name,
-                                "configuration": t.configuration,
-                            }
-                        )
-                    if tools_to_add:
-                        await version_repo.add_tools(tools_to_add)
-
                 await version_repo.add_workflow_step(
                     version_id=version.id,
                     step_number=step_number,
@@ -807,31 +852,32 @@ async def add_step(
                     display_name=display_name.strip() or None,
                 )
 
+            _invalidate_kit_ref(slug)
             return {"ok": True}
 
         except Exception as e:
-            return JSONResponse({"ok": False, "error": f"Error adding step: {e}"}, status_code=500)
+            return ORJSONResponse(
+                {"ok": False, "error": f"Error adding step: {e}"}, status_code=500
+            )
     else:
         try:
             kit_path = Path("reasoning_kits") / slug
             if not kit_path.exists():
-                return JSONResponse(
+                return ORJSONResponse(
                     {"ok": False, "error": f"Kit '{slug}' not found."}, status_code=404
                 )
 
-            existing = list(kit_path.glob("instruction_*.txt"))
-            numbers = []
-            for f in existing:
-                match = re.search(r"instruction_(\d+)\.txt", f.name)
-                if match:
-                    numbers.append(int(match.group(1)))
-            next_num = max(numbers, default=0) + 1
+            next_num = _next_file_number(
+                _kit_file_names(kit_path, "instruction_"), _INSTRUCTION_FILE_RE
+            )
 
             dest = kit_path / f"instruction_{next_num}.txt"
             dest.write_text(prompt)
             return {"ok": True}
         except Exception as e:
-            return JSONResponse({"ok": False, "error": f"Error adding step: {e}"}, status_code=500)
+            return ORJSONResponse(
+                {"ok": False, "error": f"Error adding step: {e}"}, status_code=500
+            )
 
 
 @router.post("/kits/{slug}/steps/{number}/update")
@@ -849,111 +895,52 @@ async def update_step(
 
     # Handle both FormData and JSON for smooth frontend migration
     content_type = request.headers.get("content-type", "")
-    if "multipart/form-data" in content_type or "application/x-www-form-urlencoded" in content_type:
+    if content_type.startswith(_FORM_CONTENT_TYPES):
         form = await request.form()
         prompt = str(form.get("prompt", ""))
         display_name = str(form.get("display_name", ""))
     else:
         try:
-            body = await request.json()
+            body = await _read_json(request)
             prompt = body.get("prompt_template", "") or body.get("prompt", "")
             display_name = body.get("display_name", "")
         except Exception:
-            return JSONResponse({"ok": False, "error": "Invalid request body"}, status_code=400)
+            return ORJSONResponse({"ok": False, "error": "Invalid request body"}, status_code=400)
 
     if not prompt:
-        return JSONResponse({"ok": False, "error": "Prompt is required."}, status_code=400)
-
-    from ...db.config import get_config
+        return ORJSONResponse({"ok": False, "error": "Prompt is required."}, status_code=400)
 
     config = get_config()
     if config.is_database_configured:
         try:
-            from ...db import (
-                KitVersionRepository,
-                ReasoningKitRepository,
-                get_async_session,
-            )
-
             async with get_async_session() as session:
                 kit_repo = ReasoningKitRepository(session)
                 version_repo = KitVersionRepository(session)
-                db_kit = await kit_repo.get_by_slug(slug)
-
-                if not db_kit or not db_kit.current_version:
-                    return JSONResponse(
-                        {"ok": False, "error": "Kit or version not found."},
-                        status_code=404,
-                    )
+                kit_ref = await _get_owned_kit_ref(kit_repo, slug, user, require_version=True)
+                if isinstance(kit_ref, ORJSONResponse):
+                    return kit_ref
 
-                own_err = _check_kit_ownership(db_kit, user)
-                if own_err:
-                    return own_err
-
-                version = await version_repo.create(
-                    kit_id=db_kit.id,
+                await version_repo.create_from(
+                    kit_ref.id,
+                    kit_ref.current_version_id,
                     commit_message=f"Updated step {number}",
+                    patch_step=(
+                        number,
+                        {"prompt_template": prompt, "display_name": display_name.strip() or None},
+                    ),
                 )
 
-                resources_to_add = []
-                for r in db_kit.current_version.resources:
-                    resources_to_add.append(
-                        {
-                            "version_id": version.id,
-                            "resource_number": r.resource_number,
-                            "filename": r.filename,
-                            "storage_path": r.storage_path,
-                            "mime_type": r.mime_type,
-                            "extracted_text": r.extracted_text,
-                            "file_size_bytes": r.file_size_bytes,
-                            "is_dynamic": getattr(r, "is_dynamic", False),
-                            "display_name": r.display_name,
-                        }
-                    )
-                if resources_to_add:
-                    await version_repo.add_resources(resources_to_add)
-
-                steps_to_add = []
-                for s in db_kit.current_version.workflow_steps:
-                    template = prompt if s.step_number == number else s.prompt_template
-                    step_display = (
-                        display_name.strip() or None if s.step_number == number else s.display_name
-                    )
-                    steps_to_add.append(
-                        {
-                            "version_id": version.id,
-                            "step_number": s.step_number,
-                            "prompt_template": template,
-                            "display_name": step_display,
-                        }
-                    )
-                if steps_to_add:
-                    await version_repo.add_workflow_steps(steps_to_add)
-
-                tools_to_add = []
-                for t in db_kit.current_version.tools:
-                    tools_to_add.append(
-                        {
-                            "version_id": version.id,
-                            "tool_number": t.tool_number,
-                            "tool_name": t.tool_name,
-                            "display_name": t.display_name,
-                            "configuration": t.configuration,
-                        }
-                    )
-                if tools_to_add:
-                    await version_repo.add_tools(tools_to_add)
-
+            _invalidate_kit_ref(slug)
             return {"ok": True}
         except Exception as e:
-            return JSONResponse({"ok": False, "error": str(e)}, status_code=500)
+            return ORJSONResponse({"ok": False, "error": str(e)}, status_code=500)
     else:
         step_file = Path("reasoning_kits") / slug / f"instruction_{number}.txt"
         if step_file.exists():
             step_file.write_text(prompt)
             return {"ok": True}
         else:
-            return JSONResponse(
+            return ORJSONResponse(
                 {"ok": False, "error": f"Step {number} not found."}, status_code=404
             )
 
@@ -970,8 +957,6 @@ async def delete_step(
     if auth_err:
         return auth_err
 
-    from ...db.config import get_config
-
     config = get_config()
     if not config.is_database_configured:
         step_file = Path("reasoning_kits") / slug / f"instruction_{number}.txt"
@@ -979,86 +964,29 @@ async def delete_step(
             step_file.unlink()
             return {"ok": True}
         else:
-            return JSONResponse(
+            return ORJSONResponse(
                 {"ok": False, "error": f"Step {number} not found."}, status_code=404
             )
     else:
         try:
-            from ...db import (
-                KitVersionRepository,
-                ReasoningKitRepository,
-                get_async_session,
-            )
-
             async with get_async_session() as session:
                 kit_repo = ReasoningKitRepository(session)
                 version_repo = KitVersionRepository(session)
-                db_kit = await kit_repo.get_by_slug(slug)
+                kit_ref = await _get_owned_kit_ref(kit_repo, slug, user, require_version=True)
+                if isinstance(kit_ref, ORJSONResponse):
+                    return kit_ref
 
-                if not db_kit or not db_kit.current_version:
-                    return JSONResponse(
-                        {"ok": False, "error": "Kit or version not found."},
-                        status_code=404,
-                    )
-
-                own_err = _check_kit_ownership(db_kit, user)
-                if own_err:
-                    return own_err
-
-                version = await version_repo.create(
-                    kit_id=db_kit.id,
+                await version_repo.create_from(
+                    kit_ref.id,
+                    kit_ref.current_version_id,
                     commit_message=f"Deleted step {number}",
+                    skip_step=number,
                 )
 
-                resources_to_add = []
-                for r in db_kit.current_version.resources:
-                    resources_to_add.append(
-                        {
-                            "version_id": version.id,
-                            "resource_number": r.resource_number,
-                            "filename": r.filename,
-                            "storage_path": r.storage_path,
-                            "mime_type": r.mime_type,
-                            "extracted_text": r.extracted_text,
-                            "file_size_bytes": r.file_size_bytes,
-                            "is_dynamic": getattr(r, "is_dynamic", False),
-                            "display_name": r.display_name,
-                        }
-                    )
-                if resources_to_add:
-                    await version_repo.add_resources(resources_to_add)
-
-                steps_to_add = []
-                for s in db_kit.current_version.workflow_steps:
-                    if s.step_number != number:
-                        steps_to_add.append(
-                            {
-                                "version_id": version.id,
-                                "step_number": s.step_number,
-                                "prompt_template": s.prompt_template,
-                                "display_name": s.display_name,
-                            }
-                        )
-                if steps_to_add:
-                    await version_repo.add_workflow_steps(steps_to_add)
-
-                tools_to_add = []
-                for t in db_kit.current_version.tools:
-                    tools_to_add.append(
-                        {
-                            "version_id": version.id,
-                            "tool_number": t.tool_number,
-                            "tool_name": t.tool_name,
-                            "display_name": t.display_name,
-                            "configuration": t.configuration,
-                        }
-                    )
-                if tools_to_add:
-                    await version_repo.add_tools(tools_to_add)
-
+            _invalidate_kit_ref(slug)
             return {"ok": True}
         except Exception as e:
-            return JSONResponse({"ok": False, "error": str(e)}, status_code=500)
+            return ORJSONResponse({"ok": False, "error": str(e)}, status_code=500)
 
 
 # =============================================================================
@@ -1066,48 +994,105 @@ async def delete_step(
 # =============================================================================
 
 
+def _json_with_etag(request: Request, content: Any) -> Response:
+    """Build a JSON response tagged with an ETag of its body.
+
+    Answers 304 without a body when the client already holds that version.
+    The response is marked for revalidation, so browsers ask again on every
+    use but only download the body when it changed.
+    """
+    body = orjson.dumps(content)
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        client_tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if etag in client_tags or "*" in client_tags:
+            return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+# user id -> names of the user's active MCP servers. Entries are dropped when
+# the user changes an MCP config; the TTL covers changes made elsewhere. After
+# a failed lookup the last known value is served for a short retry delay.
+_ACTIVE_MCP_TTL = 30.0
+_ACTIVE_MCP_RETRY_DELAY = 5.0
+_ACTIVE_MCP_MAXSIZE = 1024
+_active_mcp_cache: dict[str, tuple[float, frozenset[str]]] = {}
+
+
+async def _get_active_mcp_servers(user_id: str, sources: Iterable[str]) -> frozenset[str]:
+    """Return which of ``sources`` are active MCP servers of the user.
+
+    Results are cached per user for a short time, so the sources should be
+    those currently in the tool registry.
+    """
+    now = time.monotonic()
+    cached = _active_mcp_cache.get(user_id)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    ttl = _ACTIVE_MCP_TTL
+    try:
+        async with get_async_session() as session:
+            stmt = select(McpServerConfig.server_name).where(
+                McpServerConfig.user_id == user_id,
+                McpServerConfig.is_active,
+                McpServerConfig.server_name.in_(sources),
+            )
+            result = await session.execute(stmt)
+            servers = frozenset(result.scalars().all())
+    except (SQLAlchemyError, OSError) as e:
+        # Keep serving the last known servers so a struggling database is not
+        # queried again on every request
+        logger.warning("Failed to look up active MCP servers for %s: %s", user_id, e)
+        servers = cached[1] if cached else frozenset()
+        ttl = _ACTIVE_MCP_RETRY_DELAY
+
+    _active_mcp_cache.pop(user_id, None)
+    if len(_active_mcp_cache) >= _ACTIVE_MCP_MAXSIZE:
+        _active_mcp_cache.pop(next(iter(_active_mcp_cache)))
+    _active_mcp_cache[user_id] = (now + ttl, servers)
+    return servers
+
+
 @router.get("/tools/available")
 async def list_available_tools(
     request: Request,
     user: dict | None = Depends(get_optional_user),
 ):
     """List all globally available tools from the registry."""
-    from ...tools import list_tools
-
-    tools = list_tools()
-
-    active_mcp_servers = set()
-    if user and "id" in user:
-        try:
-            from sqlalchemy import select
+    # The summaries are already JSON-ready, so responses are built directly
+    # rather than returning a dict that FastAPI would walk with jsonable_encoder
+    summaries_by_source = list_tool_summaries_by_source()
+    mcp_sources = [source for source in summaries_by_source if source != "builtin"]
+    if not mcp_sources or not user or "id" not in user or not get_config().is_database_configured:
+        # No registered MCP tools, or no user whose MCP servers to look up
+        return _json_with_etag(request, {"tools": summaries_by_source.get("builtin", [])})
+
+    active_mcp_servers = await _get_active_mcp_servers(user["id"], mcp_sources)
+    filtered_tools = [
+        summary
+        for source, summaries in summaries_by_source.items()
+        if source == "builtin" or source in active_mcp_servers
+        for summary in summaries
+    ]
+    return _json_with_etag(request, {"tools": filtered_tools})
 
-            from ...db import get_async_session
-            from ...db.models import McpServerConfig
 
-            async with get_async_session() as session:
-                stmt = select(McpServerConfig.server_name).where(
-                    McpServerConfig.user_id == user["id"],
-                    McpServerConfig.is_active,
-                )
-                result = await session.execute(stmt)
-                active_mcp_servers = set(result.scalars().all())
-        except Exception:
-            pass
+@router.get("/tools/{name}/schema")
+async def get_tool_schema(name: str):
+    """Get the JSON Schema of a registered tool's parameters."""
+    tool = get_tool(name)
+    if tool is None:
+        return ORJSONResponse({"ok": False, "error": f"Tool '{name}' not found."}, status_code=404)
 
-    filtered_tools = []
-    for t in tools:
-        source = getattr(t, "source", "builtin")
-        if source == "builtin" or source in active_mcp_servers:
-            filtered_tools.append(
-                {
-                    "name": t.name,
-                    "description": t.description,
-                    "parameters": t.parameters,
-                    "source": source,
-                }
-            )
-
-    return {"tools": filtered_tools}
+    return ORJSONResponse(
+        {"name": tool.name, "parameters": tool.parameters},
+        headers={"Cache-Control": "public, max-age=3600"},
+    )
 
 
 @router.post("/kits/{slug}/tools")
@@ -1122,106 +1107,41 @@ async def add_tool(
         return auth_err
 
     try:
-        body = await request.json()
+        body = await _read_json(request)
     except Exception:
-        return JSONResponse({"ok": False, "error": "Invalid JSON body"}, status_code=400)
+        return ORJSONResponse({"ok": False, "error": "Invalid JSON body"}, status_code=400)
 
     tool_name = body.get("tool_name", "")
     display_name = body.get("display_name", "")
     configuration = body.get("configuration")
 
     if not tool_name:
-        return JSONResponse({"ok": False, "error": "tool_name is required."}, status_code=400)
+        return ORJSONResponse({"ok": False, "error": "tool_name is required."}, status_code=400)
 
     # Verify tool exists in global registry
-    from ...tools import get_tool as get_global_tool
-
-    if get_global_tool(tool_name) is None:
-        return JSONResponse(
+    if get_tool(tool_name) is None:
+        return ORJSONResponse(
             {"ok": False, "error": f"Tool '{tool_name}' is not available."},
             status_code=400,
         )
 
-    from ...db.config import get_config
-
     config = get_config()
     if config.is_database_configured:
         try:
-            from ...db import (
-                KitVersionRepository,
-                ReasoningKitRepository,
-                get_async_session,
-            )
-
             async with get_async_session() as session:
                 kit_repo = ReasoningKitRepository(session)
                 version_repo = KitVersionRepository(session)
-                db_kit = await kit_repo.get_by_slug(slug)
-
-                if not db_kit:
-                    return JSONResponse(
-                        {"ok": False, "error": f"Kit '{slug}' not found."},
-                        status_code=404,
-                    )
-
-                own_err = _check_kit_ownership(db_kit, user)
-                if own_err:
-                    return own_err
-
-                tool_number = 1
-                if db_kit.current_version and db_kit.current_version.tools:
-                    tool_number = max(t.tool_number for t in db_kit.current_version.tools) + 1
+                kit_ref = await _get_owned_kit_ref(kit_repo, slug, user)
+                if isinstance(kit_ref, ORJSONResponse):
+                    return kit_ref
 
-                version = await version_repo.create(
-                    kit_id=db_kit.id,
-                    commit_message=f"Added tool {tool_name}",
+                _, _, tool_number = await version_repo.get_next_item_numbers(
+                    kit_ref.current_version_id
                 )
 
-                if db_kit.current_version:
-                    resources_to_add = []
-                    for r in db_kit.current_version.resources:
-                        resources_to_add.append(
-                            {
-                                "version_id": version.id,
-                                "resource_number": r.resource_number,
-                                "filename": r.filename,
-                                "storage_path": r.storage_path,
-                                "mime_type": r.mime_type,
-                                "extracted_text": r.extracted_text,
-                                "file_size_bytes": r.file_size_bytes,
-                                "is_dynamic": getattr(r, "is_dynamic", False),
-                                "display_name": r.display_name,
-                            }
-                        )
-                    if resources_to_add:
-                        await version_repo.add_resources(resources_to_add)
-
-                    steps_to_add = []
-                    for s in db_kit.current_version.workflow_steps:
-                        steps_to_add.append(
-                            {
-                                "version_id": version.id,
-                                "step_number": s.step_number,
-                                "prompt_template": s.prompt_template,
-                                "display_name": s.display_name,
-                            }
-                        )
-                    if steps_to_add:
-                        await version_repo.add_workflow_steps(steps_to_add)
-
-                    tools_to_add = []
-                    for t in db_kit.current_version.tools:
-                        tools_to_add.append(
-                            {
-                                "version_id": version.id,
-                                "tool_number": t.tool_number,
-                                "tool_name": t.tool_name,
-                                "display_name": t.display_name,
-                                "configuration": t.configuration,
-                            }
-                        )
-                    if tools_to_add:
-                        await version_repo.add_tools(tools_to_add)
+                version = await version_repo.create_from(
+                    kit_ref.id, kit_ref.current_version_id, commit_message=f"Added tool {tool_name}"
+                )
 
                 await version_repo.add_tool(
                     version_id=version.id,
@@ -1231,12 +1151,15 @@ async def add_tool(
                     configuration=configuration,
                 )
 
+            _invalidate_kit_ref(slug)
             return {"ok": True}
 
         except Exception as e:
-            return JSONResponse({"ok": False, "error": f"Error adding tool: {e}"}, status_code=500)
+            return ORJSONResponse(
+                {"ok": False, "error": f"Error adding tool: {e}"}, status_code=500
+            )
 
-    return JSONResponse({"ok": False, "error": "Database not configured"}, status_code=500)
+    return ORJSONResponse({"ok": False, "error": "Database not configured"}, status_code=500)
 
 
 @router.post("/kits/{slug}/tools/{number}/update")
@@ -1252,104 +1175,41 @@ async def update_tool(
         return auth_err
 
     try:
-        body = await request.json()
+        body = await _read_json(request)
     except Exception:
-        return JSONResponse({"ok": False, "error": "Invalid JSON body"}, status_code=400)
+        return ORJSONResponse({"ok": False, "error": "Invalid JSON body"}, status_code=400)
 
     display_name = body.get("display_name")
     configuration = body.get("configuration")
 
-    from ...db.config import get_config
-
     config = get_config()
     if config.is_database_configured:
         try:
-            from ...db import (
-                KitVersionRepository,
-                ReasoningKitRepository,
-                get_async_session,
-            )
-
             async with get_async_session() as session:
                 kit_repo = ReasoningKitRepository(session)
                 version_repo = KitVersionRepository(session)
-                db_kit = await kit_repo.get_by_slug(slug)
-
-                if not db_kit or not db_kit.current_version:
-                    return JSONResponse(
-                        {"ok": False, "error": "Kit or version not found."},
-                        status_code=404,
-                    )
-
-                own_err = _check_kit_ownership(db_kit, user)
-                if own_err:
-                    return own_err
-
-                version = await version_repo.create(
-                    kit_id=db_kit.id,
+                kit_ref = await _get_owned_kit_ref(kit_repo, slug, user, require_version=True)
+                if isinstance(kit_ref, ORJSONResponse):
+                    return kit_ref
+
+                tool_patch: dict[str, Any] = {}
+                if display_name is not None:
+                    tool_patch["display_name"] = display_name.strip()
+                if configuration is not None:
+                    tool_patch["configuration"] = configuration
+                await version_repo.create_from(
+                    kit_ref.id,
+                    kit_ref.current_version_id,
                     commit_message=f"Updated tool {number}",
+                    patch_tool=(number, tool_patch),
                 )
 
-                resources_to_add = []
-                for r in db_kit.current_version.resources:
-                    resources_to_add.append(
-                        {
-                            "version_id": version.id,
-                            "resource_number": r.resource_number,
-                            "filename": r.filename,
-                            "storage_path": r.storage_path,
-                            "mime_type": r.mime_type,
-                            "extracted_text": r.extracted_text,
-                            "file_size_bytes": r.file_size_bytes,
-                            "is_dynamic": getattr(r, "is_dynamic", False),
-                            "display_name": r.display_name,
-                        }
-                    )
-                if resources_to_add:
-                    await version_repo.add_resources(resources_to_add)
-
-                steps_to_add = []
-                for s in db_kit.current_version.workflow_steps:
-                    steps_to_add.append(
-                        {
-                            "version_id": version.id,
-                            "step_number": s.step_number,
-                            "prompt_template": s.prompt_template,
-                            "display_name": s.display_name,
-                        }
-                    )
-                if steps_to_add:
-                    await version_repo.add_workflow_steps(steps_to_add)
-
-                tools_to_add = []
-                for t in db_kit.current_version.tools:
-                    t_display = (
-                        display_name.strip()
-                        if t.tool_number == number and display_name is not None
-                        else t.display_name
-                    )
-                    t_config = (
-                        configuration
-                        if t.tool_number == number and configuration is not None
-                        else t.configuration
-                    )
-                    tools_to_add.append(
-                        {
-                            "version_id": version.id,
-                            "tool_number": t.tool_number,
-                            "tool_name": t.tool_name,
-                            "display_name": t_display,
-                            "configuration": t_config,
-                        }
-                    )
-                if tools_to_add:
-                    await version_repo.add_tools(tools_to_add)
-
+            _invalidate_kit_ref(slug)
             return {"ok": True}
         except Exception as e:
-            return JSONResponse({"ok": False, "error": str(e)}, status_code=500)
+            return ORJSONResponse({"ok": False, "error": str(e)}, status_code=500)
 
-    return JSONResponse({"ok": False, "error": "Database not configured"}, status_code=500)
+    return ORJSONResponse({"ok": False, "error": "Database not configured"}, status_code=500)
 
 
 @router.delete("/kits/{slug}/tools/{number}")
@@ -1364,95 +1224,250 @@ async def delete_tool(
     if auth_err:
         return auth_err
 
-    from ...db.config import get_config
-
     config = get_config()
     if not config.is_database_configured:
-        return JSONResponse({"ok": False, "error": "Database not configured"}, status_code=500)
+        return ORJSONResponse({"ok": False, "error": "Database not configured"}, status_code=500)
 
     try:
-        from ...db import (
-            KitVersionRepository,
-            ReasoningKitRepository,
-            get_async_session,
-        )
-
         async with get_async_session() as session:
             kit_repo = ReasoningKitRepository(session)
             version_repo = KitVersionRepository(session)
-            db_kit = await kit_repo.get_by_slug(slug)
-
-            if not db_kit or not db_kit.current_version:
-                return JSONResponse(
-                    {"ok": False, "error": "Kit or version not found."}, status_code=404
-                )
+            kit_ref = await _get_owned_kit_ref(kit_repo, slug, user, require_version=True)
+            if isinstance(kit_ref, ORJSONResponse):
+                return kit_ref
 
-            own_err = _check_kit_ownership(db_kit, user)
-            if own_err:
-                return own_err
-
-            version = await version_repo.create(
-                kit_id=db_kit.id,
+            await version_repo.create_from(
+                kit_ref.id,
+                kit_ref.current_version_id,
                 commit_message=f"Deleted tool {number}",
+                skip_tool=number,
             )
 
-            resources_to_add = []
-            for r in db_kit.current_version.resources:
-                resources_to_add.append(
-                    {
-                        "version_id": version.id,
-                        "resource_number": r.resource_number,
-                        "filename": r.filename,
-                        "storage_path": r.storage_path,
-                        "mime_type": r.mime_type,
-                        "extracted_text": r.extracted_text,
-                        "file_size_bytes": r.file_size_bytes,
-                        "is_dynamic": getattr(r, "is_dynamic", False),
-                        "display_name": r.display_name,
-                    }
-                )
-            if resources_to_add:
-                await version_repo.add_resources(resources_to_add)
-
-            steps_to_add = []
-            for s in db_kit.current_version.workflow_steps:
-                steps_to_add.append(
-                    {
-                        "version_id": version.id,
-                        "step_number": s.step_number,
-                        "prompt_template": s.prompt_template,
-                        "display_name": s.display_name,
-                    }
-                )
-            if steps_to_add:
-                await version_repo.add_workflow_steps(steps_to_add)
-
-            tools_to_add = []
-            for t in db_kit.current_version.tools:
-                if t.tool_number != number:
-                    tools_to_add.append(
-                        {
-                            "version_id": version.id,
-                            "tool_number": t.tool_number,
-                            "tool_name": t.tool_name,
-                            "display_name": t.display_name,
-                            "configuration": t.configuration,
-                        }
-                    )
-            if tools_to_add:
-                await version_repo.add_tools(tools_to_add)
-
+        _invalidate_kit_ref(slug)
         return {"ok": True}
     except Exception as e:
-        return JSONResponse({"ok": False, "error": str(e)}, status_code=500)
+        return ORJSONResponse({"ok": False, "error": str(e)}, status_code=500)
 
 
 # =============================================================================
 # EXECUTION — SSE Streaming (two-step: POST config, then GET SSE stream)
 # =============================================================================
 
-# In-memory execution state: {execution_id: {kit, config, events, ...}}
-_executions: dict[str, dict] = {}
+# Execution state between POST /execute and the SSE stream: {execution_id: {kit, ...}}
+_executions = ExecutionStore()
+# Events used to hand evaluation scores to a stream, reused across executions
+_eval_events = EventPool()
+
+
+async def sweep_executions() -> None:
+    """Drop expired execution state periodically; runs for the app's lifetime."""
+    await _executions.run_sweeper()
+
+
+# Upper bound on LLM calls a single execution runs at once for independent steps
+_MAX_CONCURRENT_STEPS = 4
+
+# SSE frames are coalesced until this many bytes or this many seconds pass
+_SSE_BATCH_BYTES = 4096
+_SSE_BATCH_DELAY = 0.02
+
+# How often in-flight LLM calls check whether the client is still connected
+_DISCONNECT_POLL_INTERVAL = 0.25
+# Same while waiting for a step score; that wait is idle and can last minutes
+_EVAL_DISCONNECT_POLL_INTERVAL = 2.0
+
+# Loaded kits keyed by version id. Versions are immutable, so entries never go
+# stale; the TTL only bounds how long resource contents stay in memory.
+_LOADED_KIT_TTL = 60.0
+_LOADED_KIT_MAXSIZE = 256
+_loaded_kit_cache: dict[UUID, tuple[float, Any]] = {}
+
+
+async def _load_kit_version(slug: str, version_id: UUID):
+    """Load a kit version from the database, reusing a recently loaded copy.
+
+    Returns a deep copy of the cached kit because executions inject dynamic
+    resource content into it.
+    """
+    now = time.monotonic()
+    cached = _loaded_kit_cache.get(version_id)
+    if cached and cached[0] > now:
+        loaded = cached[1]
+    else:
+        loaded = await load_reasoning_kit_from_db(slug, version_id=version_id)
+        if len(_loaded_kit_cache) >= _LOADED_KIT_MAXSIZE:
+            _loaded_kit_cache.pop(next(iter(_loaded_kit_cache)))
+        _loaded_kit_cache[version_id] = (now + _LOADED_KIT_TTL, loaded)
+
+    return LoadedKit(
+        kit=loaded.kit.model_copy(deep=True),
+        version_id=loaded.version_id,
+        kit_id=loaded.kit_id,
+    )
+
+
+# Pre-encoded frame prefixes for the events the execution stream sends
+_SSE_PREFIXES = {
+    event: f"event: {event}\ndata: ".encode()
+    for event in (
+        "start",
+        "step-start",
+        "step-token",
+        "step-complete",
+        "step-await-eval",
+        "step-error",
+        "done",
+        "error",
+    )
+}
+
+
+def _sse(event: str, payload: dict) -> bytes:
+    """Format one Server-Sent Events frame with a JSON payload."""
+    prefix = _SSE_PREFIXES.get(event) or f"event: {event}\ndata: ".encode()
+    return prefix + orjson.dumps(payload) + b"\n\n"
+
+
+async def _coalesce_sse(
+    frames: AsyncIterator[bytes],
+    max_bytes: int = _SSE_BATCH_BYTES,
+    max_delay: float = _SSE_BATCH_DELAY,
+) -> AsyncIterator[bytes]:
+    """Coalesce SSE frames that arrive close together into a single write.
+
+    Buffered frames are flushed once ``max_bytes`` accumulate or no new frame
+    arrives within ``max_delay`` seconds. Frames larger than ``max_bytes`` are
+    sent straight through.
+    """
+    iterator = aiter(frames)
+    next_frame = asyncio.ensure_future(anext(iterator))
+    buffer: list[bytes] = []
+    buffered = 0
+    try:
+        while True:
+            done, _ = await asyncio.wait({next_frame}, timeout=max_delay if buffer else None)
+            if not done:
+                yield b"".join(buffer)
+                buffer.clear()
+                buffered = 0
+                continue
+
+            try:
+                frame = next_frame.result()
+            except StopAsyncIteration:
+                break
+            next_frame = asyncio.ensure_future(anext(iterator))
+
+            if len(frame) >= max_bytes:
+                if buffer:
+                    yield b"".join(buffer)
+                    buffer.clear()
+                    buffered = 0
+                yield frame
+                continue
+
+            buffer.append(frame)
+            buffered += len(frame)
+            if buffered >= max_bytes:
+                yield b"".join(buffer)
+                buffer.clear()
+                buffered = 0
+
+        if buffer:
+            yield b"".join(buffer)
+    finally:
+        if not next_frame.done():
+            next_frame.cancel()
+
+
+async def _gzip_sse(frames: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Gzip-encode an SSE stream, flushing after every chunk so events arrive live."""
+    compressor = zlib.compressobj(wbits=31)  # 31 = gzip container
+    async for frame in frames:
+        yield compressor.compress(frame) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """Check whether an Accept-Encoding header allows gzip, honouring q-values.
+
+    ``gzip;q=0`` refuses gzip; without a gzip entry a ``*`` entry decides.
+    """
+    wildcard = False
+    for entry in accept_encoding.split(","):
+        coding, *params = (part.strip() for part in entry.split(";"))
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        coding = coding.lower()
+        if coding in ("gzip", "x-gzip"):
+            return q > 0
+        if coding == "*":
+            wildcard = q > 0
+    return wildcard
+
+
+async def _cancel_on_disconnect(
+    request: Request, task: asyncio.Future, interval: float = _DISCONNECT_POLL_INTERVAL
+) -> None:
+    """Cancel ``task`` as soon as the client behind ``request`` disconnects.
+
+    LLM calls can run for a long time without the stream writing anything, so
+    a dropped connection would otherwise go unnoticed until the next frame.
+    """
+    while not task.done():
+        if await request.is_disconnected():
+            task.cancel()
+            return
+        await asyncio.sleep(interval)
+
+
+async def _wait_for_any(*events: asyncio.Event) -> None:
+    """Return as soon as any of ``events`` is set."""
+    waiters = [asyncio.ensure_future(event.wait()) for event in events]
+    try:
+        await asyncio.wait(waiters, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for waiter in waiters:
+            waiter.cancel()
+
+
+async def _release_execution_on_close(
+    frames: AsyncGenerator[bytes, None], execution_id: str
+) -> AsyncIterator[bytes]:
+    """Drop an execution's state however its stream ends.
+
+    This is the single cleanup point for finished, paused, failed and
+    abandoned streams: the state leaves ``_executions`` and its evaluation
+    event goes back to the pool.
+    """
+    try:
+        async for frame in frames:
+            yield frame
+    finally:
+        await frames.aclose()
+        state = _executions.pop(execution_id)
+        if state and state.get("eval_event"):
+            _eval_events.release(state["eval_event"])
+
+
+async def _extract_upload_text(upload: StarletteUploadFile) -> str:
+    """Extract the text of an uploaded dynamic resource, or "" on failure.
+
+    Reads straight from the upload's spooled file rather than copying it into
+    memory first.
+    """
+    try:
+        mime_type = detect_mime_type_from_filename(upload.filename)
+        text: str | None = await asyncio.to_thread(extract_text_from_file, upload.file, mime_type)
+        return text or ""
+    except Exception:
+        return ""
 
 
 @router.post("/kits/{slug}/execute")
@@ -1470,10 +1485,6 @@ async def start_execution(
             "dynamic_resources": {"resource_1": "content", ...}
         }
     """
-    import uuid as _uuid
-
-    from ...db.config import get_config
-
     # Parse config
     content_type = request.headers.get("content-type", "")
 
@@ -1481,38 +1492,31 @@ async def start_execution(
     evaluation_mode = "transparent"
     dynamic_resources = {}
 
-    if "multipart/form-data" in content_type:
+    if content_type.startswith("multipart/form-data"):
         form = await request.form()
         evaluate = str(form.get("evaluate", "")).lower() == "true"
         evaluation_mode = str(form.get("evaluation_mode", "transparent"))
 
-        try:
-            from ...db import detect_mime_type_from_filename, extract_text_from_bytes
-        except ImportError:
-            pass  # Fallback logic if needed, but db should be available
-
+        uploaded_files: dict[str, StarletteUploadFile] = {}
         for key, value in form.multi_items():
             if key.startswith("dynamic_resource_text_"):
                 res_id = key.replace("dynamic_resource_text_", "")
                 dynamic_resources[res_id] = str(value)
+                uploaded_files.pop(res_id, None)
             elif key.startswith("dynamic_resource_file_"):
                 res_id = key.replace("dynamic_resource_file_", "")
                 if isinstance(value, StarletteUploadFile) and value.filename:
-                    file_bytes = await value.read()
-                    try:
-                        from ...db import (
-                            detect_mime_type_from_filename,
-                            extract_text_from_bytes,
-                        )
+                    uploaded_files[res_id] = value
 
-                        mime_type = detect_mime_type_from_filename(value.filename)
-                        extracted = extract_text_from_bytes(file_bytes, mime_type)
-                        dynamic_resources[res_id] = extracted or ""
-                    except Exception:
-                        dynamic_resources[res_id] = ""
+        # Extract all uploaded files concurrently rather than one after another
+        if uploaded_files:
+            texts = await asyncio.gather(
+                *(_extract_upload_text(upload) for upload in uploaded_files.values())
+            )
+            dynamic_resources.update(zip(uploaded_files, texts))
     else:
         try:
-            body = await request.json()
+            body = await _read_json(request)
             evaluate = body.get("evaluate", False)
             evaluation_mode = body.get("evaluation_mode", "transparent")
             dynamic_resources = body.get("dynamic_resources", {})
@@ -1526,71 +1530,68 @@ async def start_execution(
 
     config = get_config()
     if config.is_database_configured:
+        kit_ref = None
         try:
-            from ...db import ReasoningKitRepository
-            from ...db import get_async_session as _get_session
-
             # Check private kit access
-            async with _get_session() as session:
-                repo = ReasoningKitRepository(session)
-                db_kit = await repo.get_by_slug(slug)
-                if db_kit and not db_kit.is_public:
-                    if not user or (db_kit.owner_id and str(db_kit.owner_id) != user["id"]):
-                        return {"error": "This kit is private."}
+            async with get_async_session() as session:
+                kit_ref = await _get_kit_ref(ReasoningKitRepository(session), slug)
+            if kit_ref and not kit_ref.is_public:
+                if not user or (kit_ref.owner_id and str(kit_ref.owner_id) != user["id"]):
+                    return {"error": "This kit is private."}
         except Exception:
             pass
 
-        try:
-            from ...loader import load_reasoning_kit_from_db
-
-            loaded = await load_reasoning_kit_from_db(slug)
-            kit = loaded.kit
-            db_version_id = loaded.version_id
-            save_to_db = True
-        except Exception:
-            pass
+        if kit_ref and kit_ref.current_version_id:
+            try:
+                loaded = await _load_kit_version(slug, kit_ref.current_version_id)
+                kit = loaded.kit
+                db_version_id = loaded.version_id
+                save_to_db = True
+            except Exception:
+                pass
 
     if kit is None:
         try:
-            from ...cli import resolve_kit_path
-            from ...loader import load_reasoning_kit
-
             kit_path = resolve_kit_path(slug, "reasoning_kits")
             kit = load_reasoning_kit(kit_path)
         except FileNotFoundError:
             return {"error": f"Kit '{slug}' not found."}
 
-    # Inject dynamic resource content
+    # Inject dynamic resource content and validate all dynamic resources were
+    # submitted in the same pass (check presence, not content — empty extraction
+    # e.g. from a scanned PDF is still a valid submission)
+    missing = []
     for resource in kit.resources.values():
-        if resource.is_dynamic and resource.resource_id in dynamic_resources:
+        if not resource.is_dynamic:
+            continue
+        if resource.resource_id in dynamic_resources:
             resource.content = dynamic_resources[resource.resource_id]
-
-    # Validate all dynamic resources were submitted (check presence, not content — empty
-    # extraction e.g. from a scanned PDF is still a valid submission)
-    missing = [
-        r.resource_id
-        for r in kit.resources.values()
-        if r.is_dynamic and r.resource_id not in dynamic_resources
-    ]
+        else:
+            missing.append(resource.resource_id)
     if missing:
         return {"error": f"Missing dynamic resources: {', '.join(missing)}"}
 
     # Create execution entry
-    execution_id = str(_uuid.uuid4())
-    _executions[execution_id] = {
-        "kit": kit,
-        "slug": slug,
-        "evaluate": evaluate,
-        "evaluation_mode": evaluation_mode,
-        "db_version_id": db_version_id,
-        "save_to_db": save_to_db,
-        "eval_event": asyncio.Event() if evaluate else None,
-        "eval_score": None,
-        "user_id": user["id"] if user else None,
-        "db_run_id": None,  # Will be created in stream
-        "resume_outputs": None,
-        "resume_step": None,
-    }
+    execution_id = str(uuid.uuid4())
+    _executions.set(
+        execution_id,
+        {
+            "kit": kit,
+            "slug": slug,
+            "evaluate": evaluate,
+            "evaluation_mode": evaluation_mode,
+            "db_version_id": db_version_id,
+            "save_to_db": save_to_db,
+            "eval_event": _eval_events.acquire() if evaluate else None,
+            "pause_event": asyncio.Event(),
+            "eval_score": None,
+            "user_id": user["id"] if user else None,
+            "db_run_id": None,  # Will be created in stream
+            "resume_outputs": None,
+            "resume_step": None,
+            "past_steps": None,
+        },
+    )
 
     return {"execution_id": execution_id}
 
@@ -1606,17 +1607,13 @@ async def resume_execution(
     Accepts JSON body: {"run_id": str}
     """
     try:
-        body = await request.json()
+        body = await _read_json(request)
         run_id = body.get("run_id")
         if not run_id:
             return {"error": "run_id is required"}
     except Exception:
         return {"error": "Invalid request body"}
 
-    import uuid as _uuid
-
-    from ...db.config import get_config
-
     config = get_config()
     if not config.is_database_configured:
         return {"error": "Database is not configured, cannot resume."}
@@ -1624,13 +1621,10 @@ async def resume_execution(
     user_id = UUID(user["id"]) if user else None
 
     try:
-        from ...db import ExecutionRepository
-        from ...db import get_async_session as _get_session
-        from ...loader import load_reasoning_kit_from_db
-
-        async with _get_session() as session:
+        run_uuid = UUID(run_id)
+        async with get_async_session() as session:
             repo = ExecutionRepository(session)
-            db_run = await repo.get_by_id(UUID(run_id))
+            db_run = await repo.get_by_id(run_uuid)
 
             if not db_run:
                 return {"error": "Execution run not found."}
@@ -1646,55 +1640,65 @@ async def resume_execution(
             evaluate = storage_mode != "transparent"
             evaluation_mode = storage_mode
 
-            # Load past outputs to inject into context
+            # Load past outputs to inject into context, keyed by the output_id
+            # of the step in this version
+            output_ids = {
+                ws.step_number: ws.output_id
+                for ws in (db_run.version.workflow_steps if db_run.version else [])
+            }
             past_outputs = {}
             for step in db_run.step_executions:
-                # Find output_id for this step in version
-                output_id = f"workflow_{step.step_number}"  # fallback
-                if db_run.version and db_run.version.workflow_steps:
-                    for ws in db_run.version.workflow_steps:
-                        if ws.step_number == step.step_number:
-                            output_id = ws.output_id
-                            break
+                output_id = output_ids.get(step.step_number, f"workflow_{step.step_number}")
                 past_outputs[output_id] = step.output_text
 
             # Highest step number done
             highest_step = max([s.step_number for s in db_run.step_executions], default=0)
 
-        # We must load the kit matching the exact DB version we are resuming
-        loaded = await load_reasoning_kit_from_db(slug, version_id=version_id)
-        kit = loaded.kit
+            # We must load the kit matching the exact DB version we are resuming
+            loaded = await _load_kit_version(slug, version_id)
+            kit = loaded.kit
+
+            # Completed steps, sent to the client when the stream starts
+            past_steps = [
+                {
+                    "step": step_num,
+                    "output_id": step.output_id,
+                    "display_name": step.display_name,
+                    "status": "done",
+                    "result": past_outputs.get(step.output_id, ""),
+                }
+                for step_num, step in kit.ordered_steps
+                if step_num <= highest_step
+            ]
+
+            # Set run status back to running in the same transaction
+            if not await repo.resume_run(db_run.id):
+                return {"error": "Execution run is already being resumed."}
 
     except Exception as e:
         return {"error": f"Failed to resume execution: {e}"}
 
-    # Set run status back to running
-    try:
-        async with _get_session() as session:
-            repo = ExecutionRepository(session)
-            db_run = await repo.get_by_id(UUID(run_id))
-            if db_run:
-                db_run.status = "running"
-                await session.flush()
-    except Exception:
-        pass
-
     # Create execution entry
-    execution_id = str(_uuid.uuid4())
-    _executions[execution_id] = {
-        "kit": kit,
-        "slug": slug,
-        "evaluate": evaluate,
-        "evaluation_mode": evaluation_mode,
-        "db_version_id": version_id,
-        "save_to_db": True,
-        "eval_event": asyncio.Event() if evaluate else None,
-        "eval_score": None,
-        "user_id": str(user_id) if user_id else None,
-        "db_run_id": UUID(run_id),  # Resume flag tells stream not to create new run
-        "resume_outputs": past_outputs,
-        "resume_step": highest_step + 1,
-    }
+    execution_id = str(uuid.uuid4())
+    _executions.set(
+        execution_id,
+        {
+            "kit": kit,
+            "slug": slug,
+            "evaluate": evaluate,
+            "evaluation_mode": evaluation_mode,
+            "db_version_id": version_id,
+            "save_to_db": True,
+            "eval_event": _eval_events.acquire() if evaluate else None,
+            "pause_event": asyncio.Event(),
+            "eval_score": None,
+            "user_id": user["id"] if user else None,
+            "db_run_id": run_uuid,  # Resume flag tells stream not to create new run
+            "resume_outputs": past_outputs,
+            "resume_step": highest_step + 1,
+            "past_steps": past_steps,
+        },
+    )
 
     return {"execution_id": execution_id}
 
@@ -1711,7 +1715,7 @@ async def execute_kit_stream(
     if not exec_state:
 
         async def error_stream():
-            yield f"event: error\ndata: {json.dumps({'message': 'Execution not found'})}\n\n"
+            yield _sse("error", {"message": "Execution not found"})
 
         return StreamingResponse(error_stream(), media_type="text/event-stream")
 
@@ -1721,16 +1725,10 @@ async def execute_kit_stream(
     db_version_id = exec_state["db_version_id"]
     save_to_db = exec_state["save_to_db"]
     eval_event = exec_state["eval_event"]
+    pause_event = exec_state["pause_event"]
 
     async def execution_stream():
         """Stream execution results as SSE events."""
-        from ...evaluation import (
-            complete_execution_run,
-            create_execution_run,
-            save_step_to_db,
-        )
-        from ...graph import DEFAULT_MODEL, resolve_placeholders
-
         persist = save_to_db  # local copy to allow mutation
 
         # Create DB run if needed or use existing
@@ -1746,32 +1744,17 @@ async def execute_kit_stream(
             except Exception:
                 persist = False
 
-        # Send initial event
-        past_steps = []
-        if exec_state.get("db_run_id") and exec_state.get("resume_outputs"):
-            resume_step = exec_state.get("resume_step", 1) or 1
-            for step_key in sorted(kit.workflow.keys(), key=int):
-                step_num = int(step_key)
-                if step_num < resume_step:
-                    step = kit.workflow[step_key]
-                    output_text = exec_state["resume_outputs"].get(step.output_id, "")
-                    past_steps.append(
-                        {
-                            "step": step_num,
-                            "output_id": step.output_id,
-                            "display_name": step.display_name,
-                            "status": "done",
-                            "result": output_text,
-                        }
-                    )
-
-        yield f"event: start\ndata: {json.dumps({'kit_name': kit.name, 'total_steps': len(kit.workflow), 'past_steps': past_steps})}\n\n"
+        # Send initial event; past steps are prepared when a run is resumed
+        yield _sse(
+            "start",
+            {
+                "kit_name": kit.name,
+                "total_steps": len(kit.workflow),
+                "past_steps": exec_state.get("past_steps") or [],
+            },
+        )
 
         # Execute step by step
-        from langchain_core.messages import HumanMessage, ToolMessage
-
-        from ...llm_factory import get_llm
-
         llm = await get_llm(
             user_id=user["id"] if user else None, model=DEFAULT_MODEL, temperature=0
         )
@@ -1780,52 +1763,52 @@ async def execute_kit_stream(
         resume_step = exec_state.get("resume_step", 1) or 1
 
         # Build tool data from kit
-        kit_tools = {
-            k: {
-                "tool_name": v.tool_name,
-                "tool_id": v.tool_id,
-                "display_name": v.display_name,
-                "configuration": v.configuration,
-            }
-            for k, v in kit.tools.items()
-        }
-
-        for step_key in sorted(kit.workflow.keys(), key=int):
-            step = kit.workflow[step_key]
-            step_num = int(step_key)
-
-            if step_num < resume_step:
-                continue
-
-            # Check for pause before sending step-start
-            if exec_state.get("pause_requested"):
-                if persist and db_run_id:
-                    try:
-                        from ...evaluation import pause_execution_run
-
-                        await pause_execution_run(db_run_id)
-                    except Exception:
-                        pass
-                yield f"event: done\ndata: {json.dumps({'status': 'paused', 'total_steps': len(kit.workflow), 'run_id': str(db_run_id) if db_run_id else None})}\n\n"
-                _executions.pop(execution_id, None)
-                return
-
-            # Send step-start event
-            yield f"event: step-start\ndata: {json.dumps({'step': step_num, 'output_id': step.output_id, 'display_name': step.display_name})}\n\n"
+        kit_tools = kit.tool_metadata
+
+        step_semaphore = asyncio.Semaphore(_MAX_CONCURRENT_STEPS)
+        # (step number, text delta) pairs from in-flight steps; None marks the
+        # end of a wave
+        token_queue: asyncio.Queue[tuple[int, str] | None] = asyncio.Queue()
+
+        # Step rows are written in the background; anything that updates the run
+        # afterwards (scores, pause, completion) waits for them first.
+        pending_writes: list[asyncio.Task] = []
+
+        async def flush_writes() -> None:
+            """Wait for queued step writes; failures are ignored as before."""
+            if pending_writes:
+                await asyncio.gather(*pending_writes, return_exceptions=True)
+                pending_writes.clear()
+
+        async def pause_run() -> bytes:
+            """Record the run as paused and return the frame that ends the stream."""
+            if persist and db_run_id:
+                await flush_writes()
+                try:
+                    await pause_execution_run(db_run_id)
+                except Exception:
+                    pass
+            return _sse(
+                "done",
+                {
+                    "status": "paused",
+                    "total_steps": len(kit.workflow),
+                    "run_id": str(db_run_id) if db_run_id else None,
+                },
+            )
 
+        async def run_step(step_num: int, step) -> tuple[str, str, int, int | None]:
+            """Run one step's LLM call (with tool loop) against the current outputs."""
             # Resolve placeholders
             prompt = resolve_placeholders(step.prompt, resources, outputs)
 
             # Check for tool references and prepare tool-aware LLM
-            from ...graph import extract_tool_refs, remove_tool_placeholders
-            from ...tools import get_tool as get_tool_def
-
             openai_tools = extract_tool_refs(step.prompt, kit_tools)
             clean_prompt = remove_tool_placeholders(prompt, kit_tools)
 
-            # Execute LLM call (with or without tools)
-            start_time = time.time()
-            try:
+            async with step_semaphore:
+                # Execute LLM call (with or without tools)
+                start_time = time.time()
                 if openai_tools:
                     # Tool-aware execution: bind tools and handle call loop
                     tool_names = [t["function"]["name"] for t in openai_tools]
@@ -1844,7 +1827,7 @@ async def execute_kit_stream(
 
                         # Execute each tool call
                         for tool_call in response.tool_calls:
-                            tool_def = get_tool_def(tool_call["name"])
+                            tool_def = get_tool(tool_call["name"])
                             if tool_def:
                                 try:
                                     user_id = exec_state.get("user_id")
@@ -1872,138 +1855,222 @@ async def execute_kit_stream(
                         response = await llm_with_tools.ainvoke(messages)
                         messages.append(response)
 
-                    result = str(response.content)
+                    result = message_text(response)
                 else:
-                    # Standard execution without tools
-                    response = await llm.ainvoke(clean_prompt)
-                    result = str(response.content)
+                    # Standard execution without tools: stream tokens to the client
+                    response = None
+                    async for chunk in llm.astream(clean_prompt):
+                        response = chunk if response is None else response + chunk
+                        if chunk.content and isinstance(chunk.content, str):
+                            token_queue.put_nowait((step_num, chunk.content))
+                    result = message_text(response) if response is not None else ""
 
                 latency_ms = int((time.time() - start_time) * 1000)
 
-                # Get token usage
-                tokens_used = None
-                if hasattr(response, "response_metadata"):
-                    metadata = response.response_metadata
-                    if "token_usage" in metadata:
-                        tokens_used = metadata["token_usage"].get("total_tokens")
-
-                outputs[step.output_id] = result
-
-                # Save to DB if enabled
-                if persist and db_run_id:
-                    try:
-                        await save_step_to_db(
-                            run_id=db_run_id,
-                            step_number=step_num,
-                            prompt=clean_prompt,
-                            output=result,
-                            mode=evaluation_mode if evaluate else "transparent",
-                            model_used=DEFAULT_MODEL,
-                            tokens_used=tokens_used,
-                            latency_ms=latency_ms,
+            # Get token usage (streamed responses report it as usage_metadata)
+            tokens_used = None
+            usage = getattr(response, "usage_metadata", None)
+            if usage:
+                tokens_used = usage.get("total_tokens")
+            elif hasattr(response, "response_metadata"):
+                metadata = response.response_metadata
+                if "token_usage" in metadata:
+                    tokens_used = metadata["token_usage"].get("total_tokens")
+
+            return clean_prompt, result, latency_ms, tokens_used
+
+        # Steps that don't depend on each other run concurrently. With
+        # evaluation enabled the user scores each step, so run one at a time.
+        if evaluate:
+            waves = [[pair] for pair in kit.ordered_steps]
+        else:
+            waves = plan_step_waves(kit)
+
+        for wave in waves:
+            wave = [(step_num, step) for step_num, step in wave if step_num >= resume_step]
+            if not wave:
+                continue
+
+            # Check for pause before sending step-start
+            if pause_event.is_set():
+                yield await pause_run()
+                return
+
+            # Send step-start events
+            for step_num, step in wave:
+                yield _sse(
+                    "step-start",
+                    {
+                        "step": step_num,
+                        "output_id": step.output_id,
+                        "display_name": step.display_name,
+                    },
+                )
+
+            wave_task = asyncio.ensure_future(
+                asyncio.gather(
+                    *(run_step(step_num, step) for step_num, step in wave),
+                    return_exceptions=True,
+                )
+            )
+            wave_task.add_done_callback(lambda _: token_queue.put_nowait(None))
+            disconnect_watch = asyncio.create_task(_cancel_on_disconnect(request, wave_task))
+            try:
+                while (token := await token_queue.get()) is not None:
+                    yield _sse("step-token", {"step": token[0], "delta": token[1]})
+            finally:
+                disconnect_watch.cancel()
+                if not wave_task.done():
+                    wave_task.cancel()
+
+            if wave_task.cancelled():
+                # The client went away mid-wave; pause the run so it can be resumed
+                await pause_run()
+                return
+            step_results = wave_task.result()
+
+            # Save the wave's steps up to the first failure in one transaction,
+            # without holding up the stream
+            if persist and db_run_id:
+                finished = []
+                for (step_num, _), step_result in zip(wave, step_results):
+                    if isinstance(step_result, BaseException):
+                        break
+                    clean_prompt, result, latency_ms, tokens_used = step_result
+                    finished.append(
+                        {
+                            "step_number": step_num,
+                            "prompt": clean_prompt,
+                            "output": result,
+                            "tokens_used": tokens_used,
+                            "latency_ms": latency_ms,
+                        }
+                    )
+                if finished:
+                    pending_writes.append(
+                        asyncio.create_task(
+                            save_steps_to_db(
+                                run_id=db_run_id,
+                                steps=finished,
+                                mode=evaluation_mode if evaluate else "transparent",
+                                model_used=DEFAULT_MODEL,
+                            )
                         )
-                    except Exception:
-                        pass
+                    )
 
-                # Send step-complete event
-                yield f"event: step-complete\ndata: {json.dumps({'step': step_num, 'output_id': step.output_id, 'display_name': step.display_name, 'prompt_preview': clean_prompt, 'result': result, 'latency_ms': latency_ms, 'tokens_used': tokens_used})}\n\n"
+            for (step_num, step), step_result in zip(wave, step_results):
+                try:
+                    if isinstance(step_result, BaseException):
+                        raise step_result
+                    clean_prompt, result, latency_ms, tokens_used = step_result
 
-                # Check for pause right after step completion before evaluation
-                if exec_state.get("pause_requested"):
-                    if persist and db_run_id:
-                        try:
-                            from ...evaluation import pause_execution_run
+                    outputs[step.output_id] = result
 
-                            await pause_execution_run(db_run_id)
-                        except Exception:
-                            pass
-                    yield f"event: done\ndata: {json.dumps({'status': 'paused', 'total_steps': len(kit.workflow), 'run_id': str(db_run_id) if db_run_id else None})}\n\n"
-                    _executions.pop(execution_id, None)
-                    return
+                    # Send step-complete event
+                    yield _sse(
+                        "step-complete",
+                        {
+                            "step": step_num,
+                            "output_id": step.output_id,
+                            "display_name": step.display_name,
+                            "prompt_preview": clean_prompt,
+                            "result": result,
+                            "latency_ms": latency_ms,
+                            "tokens_used": tokens_used,
+                        },
+                    )
+
+                    # Check for pause right after step completion before evaluation
+                    if pause_event.is_set():
+                        yield await pause_run()
+                        return
 
-                # Evaluation pause: wait for user score
-                if evaluate and eval_event:
-                    exec_state["eval_score"] = None
-                    eval_event.clear()
-                    yield f"event: step-await-eval\ndata: {json.dumps({'step': step_num})}\n\n"
-
-                    # Wait for user to submit score (timeout after 10 minutes)
-                    try:
-                        while not eval_event.is_set():
-                            # Check for pause requested while waiting for eval
-                            if exec_state.get("pause_requested"):
-                                if persist and db_run_id:
-                                    try:
-                                        from ...evaluation import pause_execution_run
-
-                                        await pause_execution_run(db_run_id)
-                                    except Exception:
-                                        pass
-                                yield f"event: done\ndata: {json.dumps({'status': 'paused', 'total_steps': len(kit.workflow), 'run_id': str(db_run_id) if db_run_id else None})}\n\n"
-                                _executions.pop(execution_id, None)
-                                return
-                            # Wait in small increments to allow checking pause flag
+                    # Evaluation pause: wait for user score
+                    if evaluate and eval_event:
+                        exec_state["eval_score"] = None
+                        eval_event.clear()
+                        yield _sse("step-await-eval", {"step": step_num})
+
+                        # Wait until the user submits a score or pauses the run
+                        waiter = asyncio.ensure_future(_wait_for_any(eval_event, pause_event))
+                        disconnect_watch = asyncio.create_task(
+                            _cancel_on_disconnect(request, waiter, _EVAL_DISCONNECT_POLL_INTERVAL)
+                        )
+                        try:
+                            await asyncio.wait({waiter})
+                        finally:
+                            disconnect_watch.cancel()
+                            waiter.cancel()
+
+                        # Nobody is left to score the step once the client is gone;
+                        # pause the run so it can be resumed
+                        if waiter.cancelled():
+                            await pause_run()
+                            return
+
+                        if pause_event.is_set():
+                            yield await pause_run()
+                            return
+
+                        # Persist the evaluation score
+                        score = exec_state.get("eval_score")
+                        if score is not None and persist and db_run_id:
+                            await flush_writes()
                             try:
-                                await asyncio.wait_for(eval_event.wait(), timeout=0.5)
-                            except asyncio.TimeoutError:
+                                await update_step_evaluation_in_db(
+                                    run_id=db_run_id,
+                                    step_number=step_num,
+                                    score=score,
+                                )
+                            except Exception:
                                 pass
 
-                            # Timeout checking happens in an outer wrapping try block in a real system,
-                            # but for now we'll rely on the client or let it wait indefinitely up to 10 mins
-                            # Not implemented here to keep it simple, but would usually maintain a start_time
-                    except asyncio.TimeoutError:
-                        yield f"event: done\ndata: {json.dumps({'status': 'failed', 'error': 'Evaluation timed out'})}\n\n"
-                        return
+                except Exception as e:
+                    yield _sse("step-error", {"step": step_num, "error": str(e)})
 
-                    # Persist the evaluation score
-                    score = exec_state.get("eval_score")
-                    if score is not None and persist and db_run_id:
+                    # Complete run as failed
+                    if persist and db_run_id:
+                        await flush_writes()
                         try:
-                            from ...evaluation import update_step_evaluation_in_db
-
-                            await update_step_evaluation_in_db(
-                                run_id=db_run_id,
-                                step_number=step_num,
-                                score=score,
-                            )
+                            await complete_execution_run(db_run_id, error=str(e))
                         except Exception:
                             pass
 
-            except Exception as e:
-                yield f"event: step-error\ndata: {json.dumps({'step': step_num, 'error': str(e)})}\n\n"
-
-                # Complete run as failed
-                if persist and db_run_id:
-                    try:
-                        await complete_execution_run(db_run_id, error=str(e))
-                    except Exception:
-                        pass
-
-                yield f"event: done\ndata: {json.dumps({'status': 'failed', 'error': str(e)})}\n\n"
-                # Clean up
-                _executions.pop(execution_id, None)
-                return
+                    yield _sse("done", {"status": "failed", "error": str(e)})
+                    return
 
         # Complete run successfully
         if persist and db_run_id:
+            await flush_writes()
             try:
                 await complete_execution_run(db_run_id, error=None)
             except Exception:
                 pass
 
-        yield f"event: done\ndata: {json.dumps({'status': 'completed', 'total_steps': len(kit.workflow), 'run_id': str(db_run_id) if db_run_id else None})}\n\n"
-        # Clean up
-        _executions.pop(execution_id, None)
-
-    return StreamingResponse(
-        execution_stream(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",
-        },
-    )
+        yield _sse(
+            "done",
+            {
+                "status": "completed",
+                "total_steps": len(kit.workflow),
+                "run_id": str(db_run_id) if db_run_id else None,
+            },
+        )
+
+    # Evaluation runs wait on the user after every step, so send those frames as-is
+    frames = _release_execution_on_close(execution_stream(), execution_id)
+    stream = frames if evaluate else _coalesce_sse(frames)
+
+    headers = {
+        "Cache-Control": "no-cache",
+        "Connection": "keep-alive",
+        "X-Accel-Buffering": "no",
+        "Vary": "Accept-Encoding",
+    }
+    if _accepts_gzip(request.headers.get("accept-encoding", "")):
+        stream = _gzip_sse(stream)
+        headers["Content-Encoding"] = "gzip"
+
+    return StreamingResponse(stream, media_type="text/event-stream", headers=headers)
 
 
 @router.post("/kits/{slug}/evaluate-step")
@@ -2017,7 +2084,7 @@ async def evaluate_step(
     Accepts JSON body: {"execution_id": str, "step": int, "score": int}
     """
     try:
-        body = await request.json()
+        body = await _read_json(request)
     except Exception:
         return {"ok": False, "error": "Invalid JSON body"}
 
@@ -2060,7 +2127,7 @@ async def pause_execution(
         return {"ok": False, "error": "Execution not found or already finished"}
 
     # Signal the SSE stream to break and pause the run
-    exec_state["pause_requested"] = True
+    exec_state["pause_event"].set()
 
     return {"ok": True}
 
@@ -2076,19 +2143,15 @@ async def delete_execution(
     if not user:
         return {"ok": False, "error": "Sign in required."}
 
-    from ...db.config import get_config
-
     config = get_config()
     if not config.is_database_configured:
         return {"ok": False, "error": "Database not configured."}
 
     try:
-        from ...db import ExecutionRepository, get_async_session
-        from ...evaluation import delete_execution_run
-
+        run_uuid = UUID(run_id)
         async with get_async_session() as session:
             repo = ExecutionRepository(session)
-            run = await repo.get_by_id(UUID(run_id))
+            run = await repo.get_by_id(run_uuid)
 
             if not run:
                 return {"ok": False, "error": "Execution not found."}
@@ -2096,7 +2159,7 @@ async def delete_execution(
             if str(run.user_id) != user["id"]:
                 return {"ok": False, "error": "Access denied."}
 
-        deleted = await delete_execution_run(UUID(run_id))
+            deleted = await repo.delete_run(run_uuid)
         return {"ok": deleted}
     except Exception as e:
         return {"ok": False, "error": str(e)}
@@ -2106,62 +2169,65 @@ async def delete_execution(
 # EXECUTION HISTORY & DOWNLOAD
 # =============================================================================
 
+_EXECUTIONS_PAGE_SIZE = 100
+_EXECUTIONS_MAX_PAGE_SIZE = 100
+
 
 @router.get("/kits/{slug}/executions")
 async def list_executions(
     request: Request,
     slug: str,
+    page: int = 1,
+    page_size: int = _EXECUTIONS_PAGE_SIZE,
     user: dict | None = Depends(get_optional_user),
 ):
-    """List past execution runs for a kit (per-user).
+    """List past execution runs for a kit (per-user), newest first.
+
+    Query params:
+        page: 1-based page number
+        page_size: Runs per page, at most 100
 
-    Returns JSON array of execution runs.
+    Returns JSON with one page of execution runs and the total run count.
     """
     if not user:
         return {"error": "Sign in to view execution history.", "runs": []}
 
-    from ...db.config import get_config
-
     config = get_config()
     if not config.is_database_configured:
         return {"runs": []}
 
-    try:
-        from ...db import (
-            ExecutionRepository,
-            ReasoningKitRepository,
-        )
-        from ...db import (
-            get_async_session as _get_session,
-        )
+    page = max(page, 1)
+    page_size = min(max(page_size, 1), _EXECUTIONS_MAX_PAGE_SIZE)
 
-        async with _get_session() as session:
-            kit_repo = ReasoningKitRepository(session)
-            db_kit = await kit_repo.get_by_slug(slug)
-            if not db_kit:
+    try:
+        async with get_async_session() as session:
+            kit_ref = await _get_kit_ref(ReasoningKitRepository(session), slug)
+            if not kit_ref:
                 return {"error": f"Kit '{slug}' not found.", "runs": []}
 
             exec_repo = ExecutionRepository(session)
+            user_id = UUID(user["id"])
             runs = await exec_repo.list_for_kit(
-                kit_id=db_kit.id,
-                user_id=UUID(user["id"]),
+                kit_id=kit_ref.id,
+                user_id=user_id,
+                limit=page_size,
+                offset=(page - 1) * page_size,
             )
+            if page == 1 and len(runs) < page_size:
+                total = len(runs)
+            else:
+                total = await exec_repo.count_for_kit(kit_id=kit_ref.id, user_id=user_id)
 
-            return {
-                "runs": [
-                    {
-                        "id": str(run.id),
-                        "status": run.status,
-                        "label": run.label,
-                        "started_at": run.started_at.isoformat() if run.started_at else None,
-                        "completed_at": run.completed_at.isoformat() if run.completed_at else None,
-                        "storage_mode": run.storage_mode,
-                        "total_steps": len(run.step_executions),
-                        "error_message": run.error_message,
-                    }
-                    for run in runs
-                ]
-            }
+            # Returned as a response so orjson encodes the UUIDs and datetimes
+            # itself, skipping FastAPI's Python-side jsonable_encoder pass
+            return ORJSONResponse(
+                {
+                    "runs": runs,
+                    "total": total,
+                    "page": page,
+                    "page_size": page_size,
+                }
+            )
     except Exception as e:
         return {"error": str(e), "runs": []}
 
@@ -2177,69 +2243,48 @@ async def get_execution(
     if not user:
         return {"error": "Sign in to view execution details."}
 
-    from ...db.config import get_config
-
     config = get_config()
     if not config.is_database_configured:
         return {"error": "Database not configured."}
 
     try:
-        from ...db import ExecutionRepository
-        from ...db import get_async_session as _get_session
-
-        async with _get_session() as session:
+        async with get_async_session() as session:
             repo = ExecutionRepository(session)
-            run = await repo.get_by_id(UUID(run_id))
+            # Only finds the run if it belongs to this user and kit
+            run = await repo.get_for_user(UUID(run_id), UUID(user["id"]), slug)
 
             if not run:
                 return {"error": "Execution not found."}
 
-            # Per-user access check
-            if str(run.user_id) != user["id"]:
-                return {"error": "Access denied."}
-
-            # Build step data with version step info for display names
-            step_display_names = {}
-            if run.version and run.version.workflow_steps:
-                for ws in run.version.workflow_steps:
-                    step_display_names[ws.step_number] = {
-                        "display_name": ws.display_name,
-                        "output_id": ws.output_id,
-                    }
-
-            steps = []
-            for step in sorted(run.step_executions, key=lambda s: s.step_number):
-                ws_info = step_display_names.get(step.step_number, {})
-                steps.append(
-                    {
-                        "step_number": step.step_number,
-                        "display_name": ws_info.get("display_name"),
-                        "output_id": ws_info.get("output_id", f"workflow_{step.step_number}"),
-                        "input_text": step.input_text,
-                        "output_text": step.output_text,
-                        "evaluation_score": step.evaluation_score,
-                        "model_used": step.model_used,
-                        "tokens_used": step.tokens_used,
-                        "latency_ms": step.latency_ms,
-                        "executed_at": step.executed_at.isoformat() if step.executed_at else None,
-                    }
-                )
-
-            kit_name = None
-            if run.version and run.version.kit:
-                kit_name = run.version.kit.name
+            steps = [
+                {
+                    "step_number": step.step_number,
+                    "display_name": display_name,
+                    "output_id": output_id,
+                    "input_text": step.input_text,
+                    "output_text": step.output_text,
+                    "evaluation_score": step.evaluation_score,
+                    "model_used": step.model_used,
+                    "tokens_used": step.tokens_used,
+                    "latency_ms": step.latency_ms,
+                    "executed_at": step.executed_at,
+                }
+                for step, display_name, output_id in _labeled_steps(run)
+            ]
 
-            return {
-                "id": str(run.id),
-                "kit_name": kit_name,
-                "status": run.status,
-                "label": run.label,
-                "storage_mode": run.storage_mode,
-                "started_at": run.started_at.isoformat() if run.started_at else None,
-                "completed_at": run.completed_at.isoformat() if run.completed_at else None,
-                "error_message": run.error_message,
-                "steps": steps,
-            }
+            return ORJSONResponse(
+                {
+                    "id": run.id,
+                    "kit_name": run.version.kit.name,
+                    "status": run.status,
+                    "label": run.label,
+                    "storage_mode": run.storage_mode,
+                    "started_at": run.started_at,
+                    "completed_at": run.completed_at,
+                    "error_message": run.error_message,
+                    "steps": steps,
+                }
+            )
     except Exception as e:
         return {"error": str(e)}
 
@@ -2260,48 +2305,31 @@ async def download_execution(
     if not user:
         return {"error": "Sign in to download results."}
 
-    from ...db.config import get_config
-
     config = get_config()
     if not config.is_database_configured:
         return {"error": "Database not configured."}
 
     try:
-        from ...db import ExecutionRepository
-        from ...db import get_async_session as _get_session
-
-        async with _get_session() as session:
+        async with get_async_session() as session:
             repo = ExecutionRepository(session)
-            run = await repo.get_by_id(UUID(run_id))
+            # Only finds the run if it belongs to this user and kit
+            run = await repo.get_for_user(UUID(run_id), UUID(user["id"]), slug)
 
             if not run:
                 return {"error": "Execution not found."}
 
-            if str(run.user_id) != user["id"]:
-                return {"error": "Access denied."}
-
-            # Get kit name
-            kit_name = slug
-            if run.version and run.version.kit:
-                kit_name = run.version.kit.name
-
-            # Build step display names
-            step_display_names = {}
-            if run.version and run.version.workflow_steps:
-                for ws in run.version.workflow_steps:
-                    step_display_names[ws.step_number] = {
-                        "display_name": ws.display_name,
-                        "output_id": ws.output_id,
-                    }
-
-            sorted_steps = sorted(run.step_executions, key=lambda s: s.step_number)
+            kit_name = run.version.kit.name
+            steps = _labeled_steps(run)
 
+            # Runs and steps are fully loaded, so the report can be streamed
+            # after the session closes
+            content: AsyncIterator[str] | AsyncIterator[bytes]
             if format == "json":
-                content = _build_json_download(run, kit_name, sorted_steps, step_display_names)
+                content = _iter_json_download(run, kit_name, steps)
                 media_type = "application/json"
                 ext = "json"
             else:
-                content = _build_markdown_download(run, kit_name, sorted_steps, step_display_names)
+                content = _iter_markdown_download(run, kit_name, steps)
                 media_type = "text/markdown"
                 ext = "md"
 
@@ -2312,10 +2340,8 @@ async def download_execution(
                 filename += f"_{label_slug}"
             filename += f".{ext}"
 
-            from starlette.responses import Response
-
-            return Response(
-                content=content,
+            return StreamingResponse(
+                content,
                 media_type=media_type,
                 headers={"Content-Disposition": f'attachment; filename="{filename}"'},
             )
@@ -2338,25 +2364,21 @@ async def update_execution_label(
         return {"ok": False, "error": "Sign in required."}
 
     try:
-        body = await request.json()
+        body = await _read_json(request)
     except Exception:
         return {"ok": False, "error": "Invalid JSON body."}
 
     label = body.get("label", "").strip() or None
 
-    from ...db.config import get_config
-
     config = get_config()
     if not config.is_database_configured:
         return {"ok": False, "error": "Database not configured."}
 
     try:
-        from ...db import ExecutionRepository
-        from ...db import get_async_session as _get_session
-
-        async with _get_session() as session:
+        run_uuid = UUID(run_id)
+        async with get_async_session() as session:
             repo = ExecutionRepository(session)
-            run = await repo.get_by_id(UUID(run_id))
+            run = await repo.get_by_id(run_uuid)
 
             if not run:
                 return {"ok": False, "error": "Execution not found."}
@@ -2364,14 +2386,29 @@ async def update_execution_label(
             if str(run.user_id) != user["id"]:
                 return {"ok": False, "error": "Access denied."}
 
-            await repo.update_label(UUID(run_id), label)
+            await repo.update_label(run_uuid, label)
             return {"ok": True, "label": label}
     except Exception as e:
         return {"ok": False, "error": str(e)}
 
 
-def _build_markdown_download(run, kit_name, sorted_steps, step_display_names):
-    """Build a Markdown report for an execution run."""
+def _labeled_steps(run) -> list[tuple[Any, str | None, str | None]]:
+    """Pair each executed step of a run, in order, with its display name and output id.
+
+    Steps the run's version no longer describes fall back to a generic output id.
+    """
+    labels = {
+        ws.step_number: (ws.display_name, ws.output_id)
+        for ws in (run.version.workflow_steps if run.version else ())
+    }
+    return [
+        (step, *labels.get(step.step_number, (None, f"workflow_{step.step_number}")))
+        for step in sorted(run.step_executions, key=lambda s: s.step_number)
+    ]
+
+
+async def _iter_markdown_download(run, kit_name, steps) -> AsyncIterator[str]:
+    """Yield a Markdown report for an execution run, one step at a time."""
     lines = [f"# {kit_name} — Execution Results"]
     if run.label:
         lines.append(f"\n**Label:** {run.label}")
@@ -2382,18 +2419,14 @@ def _build_markdown_download(run, kit_name, sorted_steps, step_display_names):
         lines.append(f"**Completed:** {run.completed_at.strftime('%Y-%m-%d %H:%M:%S UTC')}")
     lines.append(f"**Storage Mode:** {run.storage_mode}")
     lines.append("")
+    yield "\n".join(lines)
 
-    for step in sorted_steps:
-        ws_info = step_display_names.get(step.step_number, {})
-        display_name = ws_info.get("display_name")
-        output_id = ws_info.get("output_id", f"workflow_{step.step_number}")
-
+    for step, display_name, output_id in steps:
         header = f"## Step {step.step_number}"
         if display_name:
             header += f" — {display_name}"
         header += f" ({output_id})"
-        lines.append(header)
-        lines.append("")
+        lines = ["", header, ""]
 
         meta_parts = []
         if step.model_used:
@@ -2415,30 +2448,33 @@ def _build_markdown_download(run, kit_name, sorted_steps, step_display_names):
         lines.append("")
         lines.append("---")
         lines.append("")
+        yield "\n".join(lines)
 
-    return "\n".join(lines)
 
+async def _iter_json_download(run, kit_name, steps) -> AsyncIterator[bytes]:
+    """Yield a JSON report for an execution run, one step at a time.
 
-def _build_json_download(run, kit_name, sorted_steps, step_display_names):
-    """Build a JSON report for an execution run."""
+    The output is the same indented document as serializing the whole report
+    at once; each step is serialized on its own and indented into the list.
+    """
     data = {
         "kit_name": kit_name,
-        "run_id": str(run.id),
+        "run_id": run.id,
         "status": run.status,
         "label": run.label,
         "storage_mode": run.storage_mode,
-        "started_at": run.started_at.isoformat() if run.started_at else None,
-        "completed_at": run.completed_at.isoformat() if run.completed_at else None,
-        "steps": [],
+        "started_at": run.started_at,
+        "completed_at": run.completed_at,
     }
+    # Drop the closing "\n}" so the step list can follow
+    yield orjson.dumps(data, option=orjson.OPT_INDENT_2)[:-2] + b',\n  "steps": ['
 
-    for step in sorted_steps:
-        ws_info = step_display_names.get(step.step_number, {})
-        data["steps"].append(
+    for index, (step, display_name, output_id) in enumerate(steps):
+        step_json = orjson.dumps(
             {
                 "step_number": step.step_number,
-                "display_name": ws_info.get("display_name"),
-                "output_id": ws_info.get("output_id", f"workflow_{step.step_number}"),
+                "display_name": display_name,
+                "output_id": output_id,
                 "input_text": step.input_text,
                 "output_text": step.output_text,
                 "input_char_count": step.input_char_count,
@@ -2447,11 +2483,14 @@ def _build_json_download(run, kit_name, sorted_steps, step_display_names):
                 "model_used": step.model_used,
                 "tokens_used": step.tokens_used,
                 "latency_ms": step.latency_ms,
-                "executed_at": step.executed_at.isoformat() if step.executed_at else None,
-            }
+                "executed_at": step.executed_at,
+            },
+            option=orjson.OPT_INDENT_2,
         )
+        # Strings never contain raw newlines, so this only indents the structure
+        yield (b",\n    " if index else b"\n    ") + step_json.replace(b"\n", b"\n    ")
 
-    return json.dumps(data, indent=2, ensure_ascii=False)
+    yield b"\n  ]\n}" if steps else b"]\n}"
 
 
 # =============================================================================
@@ -2465,8 +2504,6 @@ async def get_current_user(
     user: dict | None = Depends(get_optional_user),
 ):
     """Return current user and config state for SPA auth."""
-    from ...db.config import get_config
-
     config = get_config()
     return {
         "user": user,
@@ -2474,55 +2511,92 @@ async def get_current_user(
     }
 
 
+# The public kit list is the same for everyone, so its summaries (without
+# bookmark state) are shared and dropped on every kit write. Bookmarks are
+# cached per user and dropped when the user toggles one.
+_KIT_LIST_TTL = 30.0
+_public_kit_list_cache: tuple[float, list[tuple[UUID, dict[str, Any]]]] | None = None
+_BOOKMARKS_TTL = 30.0
+_BOOKMARKS_MAXSIZE = 4096
+_bookmarks_cache: dict[str, tuple[float, frozenset[UUID]]] = {}
+
+
+def _invalidate_kit_list() -> None:
+    """Drop the cached public kit list after a kit has been created or modified."""
+    global _public_kit_list_cache
+    _public_kit_list_cache = None
+
+
+async def _get_public_kit_list(session) -> list[tuple[UUID, dict[str, Any]]]:
+    """Return (kit id, summary) pairs for all public kits, querying on a miss."""
+    global _public_kit_list_cache
+    now = time.monotonic()
+    if _public_kit_list_cache and _public_kit_list_cache[0] > now:
+        return _public_kit_list_cache[1]
+
+    db_kits = await ReasoningKitRepository(session).list_public()
+    kit_list = [(kit.id, _kit_summary(kit, False)) for kit in db_kits]
+    _public_kit_list_cache = (now + _KIT_LIST_TTL, kit_list)
+    return kit_list
+
+
+async def _get_bookmarked_ids(session, user_id: str) -> frozenset[UUID]:
+    """Return the ids of the kits a user has bookmarked, querying on a miss."""
+    now = time.monotonic()
+    cached = _bookmarks_cache.get(user_id)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    bookmarked = frozenset(await BookmarkRepository(session).get_bookmarked_kit_ids(UUID(user_id)))
+    _bookmarks_cache.pop(user_id, None)
+    if len(_bookmarks_cache) >= _BOOKMARKS_MAXSIZE:
+        _bookmarks_cache.pop(next(iter(_bookmarks_cache)))
+    _bookmarks_cache[user_id] = (now + _BOOKMARKS_TTL, bookmarked)
+    return bookmarked
+
+
+def _kit_summary(kit: Any, is_bookmarked: bool) -> dict[str, Any]:
+    """Serialize a kit row for the kit list and search responses."""
+    return {
+        "slug": kit.slug,
+        "name": kit.name,
+        "description": kit.description,
+        "is_public": kit.is_public,
+        "created_at": kit.created_at.isoformat() if kit.created_at else None,
+        "updated_at": kit.updated_at.isoformat() if kit.updated_at else None,
+        "owner_id": str(kit.owner_id) if kit.owner_id else None,
+        "is_bookmarked": is_bookmarked,
+    }
+
+
 @router.get("/kits")
 async def list_kits_json(
     request: Request,
     user: dict | None = Depends(get_optional_user),
 ):
     """List all kits as JSON for the React frontend."""
-    from ...db.config import get_config
-
     kits = []
     config = get_config()
 
     if config.is_database_configured:
         try:
-            from ...db import (
-                BookmarkRepository,
-                ReasoningKitRepository,
-                get_async_session,
-            )
-
             async with get_async_session() as session:
-                repo = ReasoningKitRepository(session)
-                db_kits = await repo.list_public()
+                kit_list = await _get_public_kit_list(session)
 
                 # Get bookmarked kit IDs for logged-in user
-                bookmarked_ids: set = set()
+                bookmarked_ids: frozenset[UUID] = frozenset()
                 if user:
-                    bm_repo = BookmarkRepository(session)
-                    bookmarked_ids = await bm_repo.get_bookmarked_kit_ids(UUID(user["id"]))
+                    bookmarked_ids = await _get_bookmarked_ids(session, user["id"])
 
-                for kit in db_kits:
-                    kits.append(
-                        {
-                            "slug": kit.slug,
-                            "name": kit.name,
-                            "description": kit.description,
-                            "is_public": kit.is_public,
-                            "created_at": kit.created_at.isoformat() if kit.created_at else None,
-                            "updated_at": kit.updated_at.isoformat() if kit.updated_at else None,
-                            "owner_id": str(kit.owner_id) if kit.owner_id else None,
-                            "is_bookmarked": kit.id in bookmarked_ids,
-                        }
-                    )
+                kits = [
+                    {**summary, "is_bookmarked": kit_id in bookmarked_ids}
+                    for kit_id, summary in kit_list
+                ]
         except Exception:
             pass
 
     if not kits:
         try:
-            from ...loader import list_reasoning_kits
-
             local_kits = list_reasoning_kits("reasoning_kits")
             for name in sorted(local_kits):
                 kits.append(
@@ -2540,13 +2614,17 @@ async def list_kits_json(
         except Exception:
             pass
 
-    # Cache public kit list for 30 seconds
-    headers = {
-        "Cache-Control": "public, max-age=30",
-        "CDN-Cache-Control": "public, max-age=60",
-        "Vercel-CDN-Cache-Control": "public, max-age=60",
-    }
-    return JSONResponse(content={"kits": kits}, headers=headers)
+    # Cache public kit list for 30 seconds; signed-in users get their own
+    # bookmark state, which must not be stored by shared caches
+    if user:
+        headers = {"Cache-Control": "private, no-cache"}
+    else:
+        headers = {
+            "Cache-Control": "public, max-age=30",
+            "CDN-Cache-Control": "public, max-age=60",
+            "Vercel-CDN-Cache-Control": "public, max-age=60",
+        }
+    return ORJSONResponse(content={"kits": kits}, headers=headers)
 
 
 @router.get("/kits/search")
@@ -2557,8 +2635,6 @@ async def search_kits_json(
     user: dict | None = Depends(get_optional_user),
 ):
     """Search kits and return JSON for the React frontend."""
-    from ...db.config import get_config
-
     kits = []
     config = get_config()
 
@@ -2566,94 +2642,26 @@ async def search_kits_json(
     if filter == "mine" and user:
         if config.is_database_configured:
             try:
-                from ...db import (
-                    BookmarkRepository,
-                    ReasoningKitRepository,
-                    get_async_session,
-                )
-
                 async with get_async_session() as session:
-                    repo = ReasoningKitRepository(session)
-                    bm_repo = BookmarkRepository(session)
-                    user_id = UUID(user["id"])
-
-                    bookmarked_ids = await bm_repo.get_bookmarked_kit_ids(user_id)
-
-                    if q.strip():
-                        db_kits = await repo.search(
-                            q.strip(), include_private=True, owner_id=user_id
-                        )
-                        # Keep only owned OR bookmarked kits
-                        db_kits = [
-                            k
-                            for k in db_kits
-                            if str(k.owner_id) == user["id"] or k.id in bookmarked_ids
-                        ]
-                    else:
-                        owned = await repo.list_by_owner(user_id)
-                        bookmarked = await bm_repo.list_bookmarked_kits(user_id)
-                        # Merge, avoiding duplicates (owned takes priority)
-                        seen_ids = set()
-                        db_kits = []
-                        for k in owned:
-                            db_kits.append(k)
-                            seen_ids.add(k.id)
-                        for k in bookmarked:
-                            if k.id not in seen_ids:
-                                db_kits.append(k)
-                        db_kits.sort(key=lambda k: k.name)
-
-                    for kit in db_kits:
-                        kits.append(
-                            {
-                                "slug": kit.slug,
-                                "name": kit.name,
-                                "description": kit.description,
-                                "is_public": kit.is_public,
-                                "created_at": kit.created_at.isoformat()
-                                if kit.created_at
-                                else None,
-                                "updated_at": kit.updated_at.isoformat()
-                                if kit.updated_at
-                                else None,
-                                "owner_id": str(kit.owner_id) if kit.owner_id else None,
-                                "is_bookmarked": kit.id in bookmarked_ids,
-                            }
-                        )
+                    rows = await ReasoningKitRepository(session).list_with_bookmarks(
+                        UUID(user["id"]), query=q.strip() or None, mine=True
+                    )
+                    kits = [_kit_summary(kit, is_bookmarked) for kit, is_bookmarked in rows]
             except Exception:
                 pass
         return {"kits": kits}
 
     if config.is_database_configured and q.strip():
         try:
-            from ...db import (
-                BookmarkRepository,
-                ReasoningKitRepository,
-                get_async_session,
-            )
-
             async with get_async_session() as session:
                 repo = ReasoningKitRepository(session)
-                db_kits = await repo.search(q.strip())
-
-                bookmarked_ids_search: set[Any] = set()
+                # The bookmark flag comes back with each kit for signed-in users
                 if user:
-                    bm_repo = BookmarkRepository(session)
-                    bookmarked_ids_search = await bm_repo.get_bookmarked_kit_ids(UUID(user["id"]))
+                    rows = await repo.list_with_bookmarks(UUID(user["id"]), query=q.strip())
+                else:
+                    rows = [(kit, False) for kit in await repo.search(q.strip())]
 
-                for kit in db_kits:
-                    kits.append(
-                        {
-                            "slug": kit.slug,
-                            "name": kit.name,
-                            "description": kit.description,
-                            "is_public": kit.is_public,
-                            "created_at": kit.created_at.isoformat() if kit.created_at else None,
-                            "updated_at": kit.updated_at.isoformat() if kit.updated_at else None,
-                            "owner_id": str(kit.owner_id) if kit.owner_id else None,
-                            "is_bookmarked": kit.id in bookmarked_ids_search,
-                        }
-                    )
+                kits = [_kit_summary(kit, is_bookmarked) for kit, is_bookmarked in rows]
         except Exception:
             pass
     elif not q.strip():
@@ -2674,24 +2682,20 @@ async def toggle_bookmark_json(
     if not user:
         return {"ok": False, "error": "Login required"}
 
-    from ...db.config import get_config
-
     config = get_config()
     if not config.is_database_configured:
         return {"ok": False, "error": "Database not configured"}
 
     try:
-        from ...db import BookmarkRepository, ReasoningKitRepository, get_async_session
-
         async with get_async_session() as session:
-            repo = ReasoningKitRepository(session)
-            kit = await repo.get_by_slug(slug)
-            if not kit:
+            kit_ref = await _get_kit_ref(ReasoningKitRepository(session), slug)
+            if not kit_ref:
                 return {"ok": False, "error": "Kit not found"}
 
             bm_repo = BookmarkRepository(session)
-            is_bookmarked, _ = await bm_repo.toggle(UUID(user["id"]), kit.id)
+            is_bookmarked, _ = await bm_repo.toggle(UUID(user["id"]), kit_ref.id)
             await session.commit()
+            _bookmarks_cache.pop(user["id"], None)
 
             return {"ok": True, "is_bookmarked": is_bookmarked}
     except Exception as e:
@@ -2703,11 +2707,20 @@ async def toggle_bookmark_json(
 # =============================================================================
 
 
+def _supabase_auth_call(method: str, *args: Any) -> Any:
+    """Create an anon Supabase client and call one of its auth methods.
+
+    Blocking; handlers run it through ``asyncio.to_thread``.
+    """
+    client = get_supabase_client()
+    return getattr(client.auth, method)(*args)
+
+
 @router.post("/auth/login")
 async def login_json(request: Request):
     """JSON login for SPA — accepts JSON body, returns JSON."""
     try:
-        body = await request.json()
+        body = await _read_json(request)
     except Exception:
         return {"ok": False, "error": "Invalid JSON body"}
 
@@ -2716,17 +2729,15 @@ async def login_json(request: Request):
     if not email or not password:
         return {"ok": False, "error": "Email and password are required."}
 
-    from ...db.config import get_config
-
     config = get_config()
     if not config.is_configured:
         return {"ok": False, "error": "Supabase is not configured."}
 
     try:
-        from ...db.config import get_supabase_client
-
-        client = get_supabase_client()
-        response = client.auth.sign_in_with_password({"email": email, "password": password})
+        # The Supabase client is synchronous; keep its HTTP round trip off the event loop
+        response = await asyncio.to_thread(
+            _supabase_auth_call, "sign_in_with_password", {"email": email, "password": password}
+        )
 
         if response.user:
             request.session["user"] = {
@@ -2754,7 +2765,7 @@ async def login_json(request: Request):
 async def signup_json(request: Request):
     """JSON signup for SPA — accepts JSON body, returns JSON."""
     try:
-        body = await request.json()
+        body = await _read_json(request)
     except Exception:
         return {"ok": False, "error": "Invalid JSON body"}
 
@@ -2763,17 +2774,14 @@ async def signup_json(request: Request):
     if not email or not password:
         return {"ok": False, "error": "Email and password are required."}
 
-    from ...db.config import get_config
-
     config = get_config()
     if not config.is_configured:
         return {"ok": False, "error": "Supabase is not configured."}
 
     try:
-        from ...db.config import get_supabase_client
-
-        client = get_supabase_client()
-        response = client.auth.sign_up({"email": email, "password": password})
+        response = await asyncio.to_thread(
+            _supabase_auth_call, "sign_up", {"email": email, "password": password}
+        )
 
         if response.user:
             identities = getattr(response.user, "identities", None)
@@ -2810,7 +2818,7 @@ async def logout_json(request: Request):
 async def reset_password_json(request: Request):
     """JSON password reset for SPA."""
     try:
-        body = await request.json()
+        body = await _read_json(request)
     except Exception:
         return {"ok": False, "error": "Invalid JSON body"}
 
@@ -2818,17 +2826,12 @@ async def reset_password_json(request: Request):
     if not email:
         return {"ok": False, "error": "Email is required."}
 
-    from ...db.config import get_config
-
     config = get_config()
     if not config.is_configured:
         return {"ok": False, "error": "Supabase is not configured."}
 
     try:
-        from ...db.config import get_supabase_client
-
-        client = get_supabase_client()
-        client.auth.reset_password_email(email)
+        await asyncio.to_thread(_supabase_auth_call, "reset_password_email", email)
     except Exception:
         pass
 
@@ -2851,8 +2854,6 @@ async def get_kit_detail_json(
     user: dict | None = Depends(get_optional_user),
 ):
     """Get full kit detail as JSON for the React frontend."""
-    from ...db.config import get_config
-
     config = get_config()
     kit_data = None
     resources = []
@@ -2863,8 +2864,6 @@ async def get_kit_detail_json(
 
     if config.is_database_configured:
         try:
-            from ...db import ReasoningKitRepository, get_async_session
-
             async with get_async_session() as session:
                 repo = ReasoningKitRepository(session)
                 db_kit = await repo.get_by_slug(slug)
@@ -2894,10 +2893,11 @@ async def get_kit_detail_json(
                                     "resource_id": r.resource_id,
                                     "filename": r.filename,
                                     "display_name": r.display_name,
-                                    "is_dynamic": getattr(r, "is_dynamic", False),
+                                    "is_dynamic": r.is_dynamic,
                                     "extracted_text": r.extracted_text,
                                     "file_size_bytes": r.file_size_bytes,
                                     "mime_type": r.mime_type,
+                                    "status": r.status,
                                 }
                             )
                         for s in sorted(version.workflow_steps, key=lambda x: x.step_number):
@@ -2909,8 +2909,6 @@ async def get_kit_detail_json(
                                     "display_name": s.display_name,
                                 }
                             )
-                        from ...tools import get_tool
-
                         for t in sorted(version.tools, key=lambda x: x.tool_number):
                             tool_def = get_tool(t.tool_name)
                             tools.append(
@@ -2920,9 +2918,7 @@ async def get_kit_detail_json(
                                     "tool_id": t.tool_id,
                                     "display_name": t.display_name,
                                     "configuration": t.configuration,
-                                    "source": getattr(tool_def, "source", "builtin")
-                                    if tool_def
-                                    else "unknown",
+                                    "source": tool_def.source if tool_def else "unknown",
                                 }
                             )
         except Exception:
@@ -2931,9 +2927,6 @@ async def get_kit_detail_json(
     if not kit_data:
         # Fall back to local filesystem
         try:
-            from ...cli import resolve_kit_path
-            from ...loader import load_reasoning_kit
-
             kit_path = resolve_kit_path(slug, "reasoning_kits")
             kit = load_reasoning_kit(kit_path)
             kit_data = {
@@ -2953,25 +2946,23 @@ async def get_kit_detail_json(
                         "number": int(key),
                         "resource_id": local_r.resource_id,
                         "filename": local_r.file,
-                        "display_name": getattr(local_r, "display_name", None),
-                        "is_dynamic": getattr(local_r, "is_dynamic", False),
+                        "display_name": local_r.display_name,
+                        "is_dynamic": local_r.is_dynamic,
                         "extracted_text": local_r.content,
                         "file_size_bytes": len(local_r.content.encode()) if local_r.content else 0,
                         "mime_type": "text/plain",
+                        "status": "ready",
                     }
                 )
-            for key in sorted(kit.workflow.keys(), key=int):
-                local_s = kit.workflow[key]
+            for key, local_s in kit.workflow.items():
                 steps.append(
                     {
                         "number": int(key),
                         "output_id": local_s.output_id,
                         "prompt_template": local_s.prompt,
-                        "display_name": getattr(local_s, "display_name", None),
+                        "display_name": local_s.display_name,
                     }
                 )
-            from ...tools import get_tool
-
             for key in sorted(kit.tools.keys(), key=int):
                 local_t = kit.tools[key]
                 tool_def = get_tool(local_t.tool_name)
@@ -2982,7 +2973,7 @@ async def get_kit_detail_json(
                         "tool_id": local_t.tool_id,
                         "display_name": local_t.display_name,
                         "configuration": local_t.configuration,
-                        "source": getattr(tool_def, "source", "builtin") if tool_def else "unknown",
+                        "source": tool_def.source if tool_def else "unknown",
                     }
                 )
         except Exception:
@@ -3009,7 +3000,7 @@ async def get_kit_detail_json(
             "Vercel-CDN-Cache-Control": "public, max-age=300",
         }
 
-    return JSONResponse(content=response_data, headers=headers)
+    return ORJSONResponse(content=response_data, headers=headers)
 
 
 # ---------------------------------------------------------------------------
@@ -3022,17 +3013,10 @@ async def get_kit_detail_json(
 @router.get("/mcp/config")
 async def get_mcp_configs(user: dict | None = Depends(get_optional_user)):
     """Get all user-specific MCP server configurations."""
-    from ...db.config import get_config
-
     if not get_config().is_database_configured:
-        return JSONResponse({"ok": False, "error": "Database not configured"}, status_code=500)
+        return ORJSONResponse({"ok": False, "error": "Database not configured"}, status_code=500)
 
     try:
-        from sqlalchemy import select
-
-        from ...db import get_async_session
-        from ...db.models import McpServerConfig
-
         async with get_async_session() as session:
             if not user or "id" not in user:
                 return {"ok": True, "configs": []}
@@ -3053,7 +3037,7 @@ async def get_mcp_configs(user: dict | None = Depends(get_optional_user)):
                 ],
             }
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             {"ok": False, "error": f"Error fetching MCP configs: {e}"}, status_code=500
         )
 
@@ -3063,23 +3047,16 @@ async def update_mcp_config(
     request: Request, server_name: str, user: dict | None = Depends(get_optional_user)
 ):
     """Update or create a user-specific MCP server configuration."""
-    from ...db.config import get_config
-
     if not get_config().is_database_configured:
-        return JSONResponse({"ok": False, "error": "Database not configured"}, status_code=500)
+        return ORJSONResponse({"ok": False, "error": "Database not configured"}, status_code=500)
 
     try:
-        data = await request.json()
+        data = await _read_json(request)
         env_vars = data.get("env_vars", {})
 
-        from sqlalchemy import select
-
-        from ...db import get_async_session
-        from ...db.models import McpServerConfig
-
         async with get_async_session() as session:
             if not user or "id" not in user:
-                return JSONResponse({"ok": False, "error": "Unauthorized"}, status_code=401)
+                return ORJSONResponse({"ok": False, "error": "Unauthorized"}, status_code=401)
 
             stmt = select(McpServerConfig).where(
                 McpServerConfig.user_id == user["id"],
@@ -3102,9 +3079,10 @@ async def update_mcp_config(
                 session.add(config)
 
             await session.commit()
+            _active_mcp_cache.pop(user["id"], None)
             return {"ok": True}
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             {"ok": False, "error": f"Error updating MCP config: {e}"}, status_code=500
         )
 
@@ -3112,20 +3090,13 @@ async def update_mcp_config(
 @router.delete("/mcp/config/{server_name}")
 async def delete_mcp_config(server_name: str, user: dict | None = Depends(get_optional_user)):
     """Delete a user-specific MCP server configuration."""
-    from ...db.config import get_config
-
     if not get_config().is_database_configured:
-        return JSONResponse({"ok": False, "error": "Database not configured"}, status_code=500)
+        return ORJSONResponse({"ok": False, "error": "Database not configured"}, status_code=500)
 
     try:
-        from sqlalchemy import select
-
-        from ...db import get_async_session
-        from ...db.models import McpServerConfig
-
         async with get_async_session() as session:
             if not user or "id" not in user:
-                return JSONResponse({"ok": False, "error": "Unauthorized"}, status_code=401)
+                return ORJSONResponse({"ok": False, "error": "Unauthorized"}, status_code=401)
 
             stmt = select(McpServerConfig).where(
                 McpServerConfig.user_id == user["id"],
@@ -3137,9 +3108,10 @@ async def delete_mcp_config(server_name: str, user: dict | None = Depends(get_op
             if config:
                 await session.delete(config)
                 await session.commit()
+                _active_mcp_cache.pop(user["id"], None)
             return {"ok": True}
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             {"ok": False, "error": f"Error deleting MCP config: {e}"}, status_code=500
         )
 
@@ -3152,17 +3124,10 @@ async def delete_mcp_config(server_name: str, user: dict | None = Depends(get_op
 @router.get("/llm/config")
 async def get_llm_configs(user: dict | None = Depends(get_optional_user)):
     """Get all user-specific LLM provider configurations."""
-    from ...db.config import get_config
-
     if not get_config().is_database_configured:
-        return JSONResponse({"ok": False, "error": "Database not configured"}, status_code=500)
+        return ORJSONResponse({"ok": False, "error": "Database not configured"}, status_code=500)
 
     try:
-        from sqlalchemy import select
-
-        from ...db import get_async_session
-        from ...db.models import LlmProviderConfig
-
         async with get_async_session() as session:
             if not user or "id" not in user:
                 return {"ok": True, "configs": []}
@@ -3184,7 +3149,7 @@ async def get_llm_configs(user: dict | None = Depends(get_optional_user)):
                 ],
             }
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             {"ok": False, "error": f"Error fetching LLM configs: {e}"}, status_code=500
         )
 
@@ -3194,25 +3159,18 @@ async def update_llm_config(
     request: Request, provider_name: str, user: dict | None = Depends(get_optional_user)
 ):
     """Update or create a user-specific LLM provider configuration."""
-    from ...db.config import get_config
-
     if not get_config().is_database_configured:
-        return JSONResponse({"ok": False, "error": "Database not configured"}, status_code=500)
+        return ORJSONResponse({"ok": False, "error": "Database not configured"}, status_code=500)
 
     try:
-        data = await request.json()
+        data = await _read_json(request)
         env_vars = data.get("env_vars", {})
         selected_model = data.get("selected_model")
         is_active = data.get("is_active", False)
 
-        from sqlalchemy import select, update
-
-        from ...db import get_async_session
-        from ...db.models import LlmProviderConfig
-
         async with get_async_session() as session:
             if not user or "id" not in user:
-                return JSONResponse({"ok": False, "error": "Unauthorized"}, status_code=401)
+                return ORJSONResponse({"ok": False, "error": "Unauthorized"}, status_code=401)
 
             # If setting this one to active, we might want to deactivate others
             # But we leave that to frontend or keep multiple active if supported (usually 1 active at a time)
@@ -3247,9 +3205,10 @@ async def update_llm_config(
                 session.add(config)
 
             await session.commit()
+            invalidate_provider_config(UUID(user["id"]))
             return {"ok": True}
     except Exception as e:
-        return JSONResponse(
+        return ORJSONResponse(
             {"ok": False, "error": f"Error updating LLM config: {e}"}, status_code=500
         )
 
@@ -3304,13 +3263,15 @@ async def get_doc(slug: str):
 
     if not file_path.exists() or not file_path.is_file():
         # Prevent directory traversal attacks
-        return JSONResponse({"ok": False, "error": "Document not found"}, status_code=404)
+        return ORJSONResponse({"ok": False, "error": "Document not found"}, status_code=404)
 
     try:
         content = file_path.read_text(encoding="utf-8")
         return {"content": content}
     except Exception as e:
-        return JSONResponse({"ok": False, "error": f"Error reading document: {e}"}, status_code=500)
+        return ORJSONResponse(
+            {"ok": False, "error": f"Error reading document: {e}"}, status_code=500
+        )
 
 
 @router.get("/openapi.json")